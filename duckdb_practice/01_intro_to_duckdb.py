@@ -1,18 +1,25 @@
 """
 Introduction to DuckDB with Python
 - How to connect, load data, and run a simple query
+- The HR tables live in a persistent database (data/hr.duckdb) built and refreshed
+  from MySQL by hr_duckdb.py; the path does not depend on the working directory
 """
-import duckdb
-import pandas as pd
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import DB_PATH, get_connection, query_df
 
 def main():
-    # Connect to DuckDB in-memory
-    con = duckdb.connect()
-    # Load CSV as table
-    con.execute("CREATE TABLE employees AS SELECT * FROM read_csv_auto('../data/employees.csv')")
-    # Simple SELECT
-    result = con.execute("SELECT * FROM employees LIMIT 5").fetchdf()
+    if not os.path.exists(DB_PATH):
+        print(f"{DB_PATH} not found: run `python duckdb_practice/hr_duckdb.py` first.")
+        return
+    # Connect to the persistent DuckDB database
+    con = get_connection(read_only=True)
+    # Simple SELECT, returned as an Arrow-backed DataFrame
+    result = query_df(con, "SELECT * FROM employees LIMIT 5")
     print(result)
+    # When the tables were last refreshed from MySQL
+    print(query_df(con, "SELECT * FROM _sync_state ORDER BY table_name"))
     con.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+"""
+Querying Tables with SELECT (DuckDB)
+- Same query functions as mysql_practice/02_select_queries.py, run on the local DuckDB copy
+- Every function returns an Arrow-backed pandas DataFrame
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import get_connection, query_df
+
+# Select all employees
+def select_all_employees(con):
+    return query_df(con, "SELECT * FROM employees")
+
+# Select employees by department
+def select_employees_by_department(con, department_id):
+    return query_df(con, "SELECT * FROM employees WHERE department_id = ?", [department_id])
+
+# Select employee by ID
+def select_employee_by_id(con, employee_id):
+    return query_df(con, "SELECT * FROM employees WHERE employee_id = ?", [employee_id])
+
+# Select employees by job title
+def select_employees_by_job_title(con, job_title):
+    return query_df(con,
+        "SELECT e.* FROM employees e JOIN jobs j ON e.job_id = j.job_id WHERE j.job_title LIKE ?",
+        [f"%{job_title}%"])
+
+# Select first N employees
+def select_first_n_employees(con, n=5):
+    return query_df(con, "SELECT * FROM employees LIMIT ?", [n])
+
+# Select employees with salary above a certain amount
+def select_employees_with_salary_above(con, amount):
+    return query_df(con, "SELECT * FROM employees WHERE salary > ?", [amount])
+
+# Select employee names (first and last)
+def select_employee_names(con):
+    return query_df(con, "SELECT first_name, last_name FROM employees")
+
+# Select high paid managers (salary > 10000)
+def select_high_paid_managers(con):
+    return query_df(con,
+        "SELECT e.* FROM employees e JOIN jobs j ON e.job_id = j.job_id "
+        "WHERE j.job_title LIKE ? AND e.salary > ?",
+        ['%Manager%', 10000])
+
+# Select employees ordered by salary descending
+def select_employees_ordered_by_salary(con):
+    return query_df(con, "SELECT * FROM employees ORDER BY salary DESC")
+
+# Select distinct job titles
+def select_distinct_job_titles(con):
+    return query_df(con, "SELECT DISTINCT j.job_title FROM jobs j JOIN employees e ON e.job_id = j.job_id")
+
+# Select employees with email domain
+def select_employees_with_email_domain(con, domain):
+    return query_df(con, "SELECT * FROM employees WHERE email LIKE ?", [f"%@{domain}"])
+
+# Select employee count by department
+def select_employee_count_by_department(con):
+    return query_df(con,
+        "SELECT department_id, COUNT(*) AS num_employees FROM employees GROUP BY department_id")
+
+# Select employees with limit and offset
+def select_employees_with_offset(con, limit, offset):
+    return query_df(con, "SELECT * FROM employees LIMIT ? OFFSET ?", [limit, offset])
+
+def print_example_results():
+    con = get_connection(read_only=True)
+    try:
+        examples = [
+            ("All employees:", select_all_employees(con)),
+            ("Employees in department 1:", select_employees_by_department(con, 1)),
+            ("Employee with ID 101:", select_employee_by_id(con, 101)),
+            ("Employees with job title 'Manager':", select_employees_by_job_title(con, 'Manager')),
+            ("First 5 employees:", select_first_n_employees(con, 5)),
+            ("Employees with salary > 5000:", select_employees_with_salary_above(con, 5000)),
+            ("Employee names:", select_employee_names(con)),
+            ("High paid managers (salary > 10000):", select_high_paid_managers(con)),
+            ("Employees ordered by salary descending:", select_employees_ordered_by_salary(con)),
+            ("Distinct job titles:", select_distinct_job_titles(con)),
+            ("Employees with email domain 'example.com':", select_employees_with_email_domain(con, 'example.com')),
+            ("Employee count by department:", select_employee_count_by_department(con)),
+            ("Employees with limit 5 and offset 5:", select_employees_with_offset(con, 5, 5)),
+        ]
+        for label, df in examples:
+            print(f"\n{label}")
+            print(df.to_string(index=False))
+    finally:
+        con.close()
+
+if __name__ == "__main__":
+    print_example_results()
@@ -0,0 +1,100 @@
+"""
+Joins (DuckDB)
+- Same join functions as mysql_practice/03_joins.py, run on the local DuckDB copy
+- DuckDB supports FULL OUTER JOIN natively, so no UNION simulation is needed
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import get_connection, query_df
+
+# INNER JOIN: Employees and their departments
+def inner_join_employees_departments(con):
+    return query_df(con, '''
+        SELECT e.first_name, e.last_name, d.department_name
+        FROM employees e
+        INNER JOIN departments d ON e.department_id = d.department_id
+        LIMIT 5''')
+
+# LEFT JOIN: All employees, with department names (NULL if no department)
+def left_join_employees_departments(con):
+    return query_df(con, '''
+        SELECT e.first_name, e.last_name, d.department_name
+        FROM employees e
+        LEFT JOIN departments d ON e.department_id = d.department_id
+        LIMIT 5''')
+
+# RIGHT JOIN: All departments, with employee names (NULL if no employee)
+def right_join_departments_employees(con):
+    return query_df(con, '''
+        SELECT d.department_name, e.first_name, e.last_name
+        FROM departments d
+        RIGHT JOIN employees e ON e.department_id = d.department_id
+        LIMIT 5''')
+
+# FULL OUTER JOIN (native in DuckDB)
+def full_outer_join_employees_departments(con):
+    return query_df(con, '''
+        SELECT e.first_name, e.last_name, d.department_name
+        FROM employees e
+        FULL OUTER JOIN departments d ON e.department_id = d.department_id
+        LIMIT 5''')
+
+# CROSS JOIN: All combinations of employees and departments (limit for demo)
+def cross_join_employees_departments(con):
+    return query_df(con, '''
+        SELECT e.first_name, d.department_name
+        FROM employees e
+        CROSS JOIN departments d
+        LIMIT 5''')
+
+# SELF JOIN: Employees and their managers
+def self_join_employees_managers(con):
+    return query_df(con, '''
+        SELECT e.first_name AS employee, m.first_name AS manager
+        FROM employees e
+        LEFT JOIN employees m ON e.manager_id = m.employee_id
+        LIMIT 5''')
+
+# RECURSIVE SELF JOIN: Full reporting chain (all managers up to the top)
+def recursive_reporting_chain(con, employee_id):
+    return query_df(con, '''
+        WITH RECURSIVE chain (employee_id, first_name, manager_id, level) AS (
+            SELECT employee_id, first_name, manager_id, 0 FROM employees WHERE employee_id = ?
+            UNION ALL
+            SELECT m.employee_id, m.first_name, m.manager_id, c.level + 1
+            FROM employees m JOIN chain c ON m.employee_id = c.manager_id
+        )
+        SELECT employee_id, first_name AS manager, level FROM chain WHERE level > 0 ORDER BY level''',
+        [employee_id])
+
+# Multi-table join: Employees, departments, and locations
+def multi_table_join(con):
+    return query_df(con, '''
+        SELECT e.first_name, d.department_name, l.city
+        FROM employees e
+        JOIN departments d ON e.department_id = d.department_id
+        JOIN locations l ON d.location_id = l.location_id
+        LIMIT 5''')
+
+def print_join_examples():
+    con = get_connection(read_only=True)
+    try:
+        examples = [
+            ("INNER JOIN:", inner_join_employees_departments(con)),
+            ("LEFT JOIN:", left_join_employees_departments(con)),
+            ("RIGHT JOIN:", right_join_departments_employees(con)),
+            ("FULL OUTER JOIN:", full_outer_join_employees_departments(con)),
+            ("CROSS JOIN:", cross_join_employees_departments(con)),
+            ("SELF JOIN (employee-manager):", self_join_employees_managers(con)),
+            ("Reporting chain of employee 107 (WITH RECURSIVE):", recursive_reporting_chain(con, 107)),
+            ("Multi-table join (employee, department, city):", multi_table_join(con)),
+        ]
+        for label, df in examples:
+            print(f"\n{label}")
+            print(df.to_string(index=False))
+    finally:
+        con.close()
+
+if __name__ == "__main__":
+    print_join_examples()
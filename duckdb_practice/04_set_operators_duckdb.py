@@ -0,0 +1,55 @@
+"""
+Set Operators (DuckDB)
+- Same functions as mysql_practice/04_set_operators.py, run on the local DuckDB copy
+- DuckDB has native INTERSECT/EXCEPT (and their ALL variants) on every version
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import get_connection, query_df
+
+# UNION: Unique values from both queries
+def union_employees_departments(con):
+    return query_df(con, '''
+        SELECT first_name AS name FROM employees
+        UNION
+        SELECT department_name AS name FROM departments''')
+
+# UNION ALL: All values from both queries (including duplicates)
+def union_all_employees_departments(con):
+    return query_df(con, '''
+        SELECT first_name AS name FROM employees
+        UNION ALL
+        SELECT department_name AS name FROM departments''')
+
+# INTERSECT: Values present in both tables
+def intersect_employees_departments(con):
+    return query_df(con, '''
+        SELECT first_name AS name FROM employees
+        INTERSECT
+        SELECT department_name AS name FROM departments''')
+
+# EXCEPT: Values in employees not in departments
+def except_employees_departments(con):
+    return query_df(con, '''
+        SELECT first_name AS name FROM employees
+        EXCEPT
+        SELECT department_name AS name FROM departments''')
+
+def print_set_operator_examples():
+    con = get_connection(read_only=True)
+    try:
+        examples = [
+            ("UNION (unique names from employees and departments):", union_employees_departments(con)),
+            ("UNION ALL (all names, including duplicates):", union_all_employees_departments(con)),
+            ("INTERSECT (names in both employees and departments):", intersect_employees_departments(con)),
+            ("EXCEPT (names in employees not in departments):", except_employees_departments(con)),
+        ]
+        for label, df in examples:
+            print(f"\n{label}")
+            print(df.to_string(index=False))
+    finally:
+        con.close()
+
+if __name__ == "__main__":
+    print_set_operator_examples()
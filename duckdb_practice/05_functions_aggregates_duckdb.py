@@ -0,0 +1,86 @@
+"""
+Functions and Aggregates (DuckDB)
+- The twelve queries of mysql_practice/05_functions_aggregates.py, run on the local DuckDB copy
+- Top-N per group uses QUALIFY instead of a derived table
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import get_connection, print_query
+
+QUERIES = {
+    # What: Count and average salary per department.
+    "1. Group by department_id: count, avg salary":
+        '''SELECT department_id, COUNT(*) AS num_employees, AVG(salary) AS avg_salary
+           FROM employees GROUP BY department_id ORDER BY department_id''',
+    # What: Total salary cost per department.
+    "2. Sum of salaries by department:":
+        '''SELECT department_id, SUM(salary) AS total_salary
+           FROM employees GROUP BY department_id ORDER BY department_id''',
+    # What: Salary range in each department.
+    "3. Min/Max salary by department:":
+        '''SELECT department_id, MIN(salary) AS min_salary, MAX(salary) AS max_salary
+           FROM employees GROUP BY department_id ORDER BY department_id''',
+    # What: Company-wide salary statistics.
+    "4. Overall stats:":
+        '''SELECT COUNT(*) AS num_employees, SUM(salary) AS total_salary, AVG(salary) AS avg_salary,
+                  MIN(salary) AS min_salary, MAX(salary) AS max_salary
+           FROM employees''',
+    # What: All key stats per department.
+    "5. Multiple aggregations:":
+        '''SELECT department_id, COUNT(*) AS num_employees, SUM(salary) AS total_salary,
+                  AVG(salary) AS avg_salary, MIN(salary) AS min_salary, MAX(salary) AS max_salary
+           FROM employees GROUP BY department_id ORDER BY department_id''',
+    # What: Departments with more than 5 employees (HAVING).
+    "6. Departments with more than 5 employees:":
+        '''SELECT department_id, COUNT(*) AS num_employees
+           FROM employees GROUP BY department_id HAVING COUNT(*) > 5''',
+    # What: Count employees by department and job.
+    "7. Count by department and job:":
+        '''SELECT department_id, job_id, COUNT(*) AS num_employees
+           FROM employees GROUP BY department_id, job_id ORDER BY department_id, job_id''',
+    # What: Each department's share of total salary.
+    # How: A window over the grouped result instead of a second scan in a scalar subquery
+    "8. Percent of total salary by department:":
+        '''SELECT department_id, SUM(salary) AS dept_salary,
+                  ROUND(100 * SUM(salary) / SUM(SUM(salary)) OVER (), 2) AS percent_of_total
+           FROM employees GROUP BY department_id ORDER BY department_id''',
+    # What: Top 2 earners in each department.
+    # How: QUALIFY filters on the window function without a derived table
+    "9. Top 2 salaries per department:":
+        '''SELECT *, ROW_NUMBER() OVER (PARTITION BY department_id ORDER BY salary DESC) AS rnk
+           FROM employees
+           QUALIFY rnk <= 2
+           ORDER BY department_id, rnk''',
+    # What: Range = max - min salary per department.
+    "10. Salary range per department:":
+        '''SELECT department_id, MAX(salary) - MIN(salary) AS salary_range
+           FROM employees GROUP BY department_id ORDER BY department_id''',
+    # What: Running payroll by hire_date, previous/next salary inside each department.
+    "11. Window functions (running payroll, lag/lead within department):":
+        '''SELECT employee_id, department_id, hire_date, salary,
+                  SUM(salary) OVER (ORDER BY hire_date, employee_id
+                                    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS running_payroll,
+                  LAG(salary) OVER (PARTITION BY department_id ORDER BY hire_date, employee_id) AS prev_salary,
+                  LEAD(salary) OVER (PARTITION BY department_id ORDER BY hire_date, employee_id) AS next_salary
+           FROM employees
+           ORDER BY hire_date, employee_id''',
+    # What: Average salary per hire year, smoothed over the last 3 cohorts.
+    "12. 3-cohort moving average salary (cohort = hire year):":
+        '''SELECT YEAR(hire_date) AS cohort, COUNT(*) AS hires, AVG(salary) AS avg_salary,
+                  AVG(AVG(salary)) OVER (ORDER BY YEAR(hire_date)
+                                         ROWS BETWEEN 2 PRECEDING AND CURRENT ROW) AS moving_avg_3
+           FROM employees
+           GROUP BY YEAR(hire_date)
+           ORDER BY cohort''',
+}
+
+if __name__ == "__main__":
+    con = get_connection(read_only=True)
+    try:
+        for label, query in QUERIES.items():
+            print_query(con, query, label=label)
+    finally:
+        con.close()
@@ -0,0 +1,54 @@
+"""
+Subqueries and APPLY (DuckDB)
+- The queries of mysql_practice/06_subqueries_apply.py, run on the local DuckDB copy
+- DuckDB decorrelates correlated subqueries itself, so queries 3 and 4 are written as in MySQL
+- Query 4 finds managers by job title: job_id is an integer, and DuckDB rejects LIKE on it
+- LATERAL is the APPLY equivalent
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import get_connection, print_query
+
+QUERIES = {
+    # What: Employees whose salary is above the company average (scalar subquery).
+    "1. Employees with salary > company average:":
+        '''SELECT * FROM employees WHERE salary > (SELECT AVG(salary) FROM employees)''',
+    # What: Employees in large departments (IN subquery).
+    "2. Employees in departments with >5 employees:":
+        '''SELECT * FROM employees WHERE department_id IN (
+               SELECT department_id FROM employees GROUP BY department_id HAVING COUNT(*) > 5
+           )''',
+    # What: Employees who earn more than their department's average (correlated subquery).
+    # How: The planner turns it into a grouped join, the rewrite 06 applies by hand on MySQL
+    "3. Employees earning more than department average:":
+        '''SELECT * FROM employees e1 WHERE salary > (
+               SELECT AVG(salary) FROM employees e2 WHERE e2.department_id = e1.department_id
+           )''',
+    # What: Employees in departments that have a manager (EXISTS subquery).
+    # How: job_id is an integer here, so the match is on the job title
+    "4. Employees in departments with a manager:":
+        '''SELECT * FROM employees e WHERE EXISTS (
+               SELECT 1 FROM employees m JOIN jobs j ON j.job_id = m.job_id
+               WHERE m.department_id = e.department_id AND j.job_title LIKE '%Manager%'
+           )''',
+    # What: Annotate each employee with their department's average salary (APPLY-like).
+    # How: LATERAL subquery, evaluated per row in SQL terms and decorrelated by DuckDB
+    "5. Employees with department average salary column:":
+        '''SELECT e.*, d.avg_salary AS dept_avg_salary
+           FROM employees e,
+                LATERAL (SELECT AVG(salary) AS avg_salary FROM employees x
+                         WHERE x.department_id = e.department_id) d
+           ORDER BY e.employee_id
+           LIMIT 10''',
+}
+
+if __name__ == "__main__":
+    con = get_connection(read_only=True)
+    try:
+        for label, query in QUERIES.items():
+            print_query(con, query, label=label)
+    finally:
+        con.close()
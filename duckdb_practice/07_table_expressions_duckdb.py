@@ -0,0 +1,54 @@
+"""
+Table Expressions (DuckDB)
+- The derived tables, CTEs and inline views of mysql_practice/07_table_expressions.py,
+  run on the local DuckDB copy
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import get_connection, print_query
+
+QUERIES = {
+    # What: High earners through a derived table.
+    "1. Employees with salary > 10000 (derived table):":
+        '''SELECT * FROM (SELECT * FROM employees WHERE salary > 10000) AS high_salary''',
+    # What: High earners counted by department through a CTE.
+    "2. High salary count by department (CTE):":
+        '''WITH high_salary AS (
+               SELECT * FROM employees WHERE salary > 10000
+           )
+           SELECT department_id, COUNT(*) AS num_high_earners FROM high_salary GROUP BY department_id''',
+    # What: Top 3 salaries per department through a ranked derived table.
+    "3. Top 3 earners per department (nested derived table):":
+        '''SELECT * FROM (
+               SELECT *, ROW_NUMBER() OVER (PARTITION BY department_id ORDER BY salary DESC) AS rnk
+               FROM employees
+           ) ranked WHERE rnk <= 3
+           ORDER BY department_id, rnk''',
+    # What: Well-paid employees in departments with more than 5 of them (multi-step CTE).
+    "4. Employees with salary > 5000 in large departments (multi-step CTE):":
+        '''WITH high_paid AS (
+               SELECT * FROM employees WHERE salary > 5000
+           ),
+           large_depts AS (
+               SELECT department_id FROM high_paid GROUP BY department_id HAVING COUNT(*) > 5
+           )
+           SELECT * FROM high_paid WHERE department_id IN (SELECT department_id FROM large_depts)''',
+    # What: High earners with their department name (inline view + join).
+    "5. High salary employees with department info (inline view):":
+        '''WITH high_salary AS (
+               SELECT * FROM employees WHERE salary > 10000
+           )
+           SELECT h.*, d.department_name FROM high_salary h
+           LEFT JOIN departments d ON h.department_id = d.department_id''',
+}
+
+if __name__ == "__main__":
+    con = get_connection(read_only=True)
+    try:
+        for label, query in QUERIES.items():
+            print_query(con, query, label=label)
+    finally:
+        con.close()
@@ -0,0 +1,59 @@
+"""
+Grouping Sets and Pivoting Data (DuckDB)
+- The queries of mysql_practice/08_grouping_pivot.py, run on the local DuckDB copy
+- DuckDB has ROLLUP, GROUPING SETS, CUBE and native PIVOT/UNPIVOT, so the
+  conditional-aggregation and UNION ALL simulations are not needed
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import get_connection, print_query
+
+QUERIES = {
+    # What: Employees for each department/job combination.
+    "1. Count employees by department and job:":
+        '''SELECT department_id, job_id, COUNT(*) AS num_employees
+           FROM employees
+           GROUP BY department_id, job_id
+           ORDER BY department_id, job_id''',
+    # What: Department subtotals and the grand total.
+    "2. ROLLUP (subtotals and grand total):":
+        '''SELECT department_id, job_id, COUNT(*) AS num_employees
+           FROM employees
+           GROUP BY ROLLUP (department_id, job_id)
+           ORDER BY department_id NULLS LAST, job_id NULLS LAST''',
+    # What: Custom subtotal/grouping combinations.
+    "3. GROUPING SETS:":
+        '''SELECT department_id, job_id, COUNT(*) AS num_employees
+           FROM employees
+           GROUP BY GROUPING SETS ((department_id, job_id), (department_id), ())
+           ORDER BY department_id NULLS LAST, job_id NULLS LAST''',
+    # What: Job counts per department as a matrix.
+    # How: Native PIVOT; the job columns come from the data instead of a hard-coded list
+    "4. Pivot (departments as rows, jobs as columns):":
+        '''PIVOT (SELECT department_id, job_id FROM employees)
+           ON job_id USING COUNT(*)
+           GROUP BY department_id
+           ORDER BY department_id''',
+    # What: The pivot table back in long format.
+    # How: UNPIVOT over every job column produced by the pivot
+    "5. Unpivot (wide to long):":
+        '''WITH pivoted AS (
+               PIVOT (SELECT department_id, job_id FROM employees)
+               ON job_id USING COUNT(*)
+               GROUP BY department_id
+           )
+           UNPIVOT pivoted ON COLUMNS(* EXCLUDE (department_id))
+           INTO NAME job_id VALUE num_employees
+           ORDER BY department_id, job_id''',
+}
+
+if __name__ == "__main__":
+    con = get_connection(read_only=True)
+    try:
+        for label, query in QUERIES.items():
+            print_query(con, query, label=label)
+    finally:
+        con.close()
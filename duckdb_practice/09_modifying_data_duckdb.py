@@ -0,0 +1,55 @@
+"""
+Modifying Data (DuckDB)
+- The INSERT/UPDATE/DELETE steps of mysql_practice/09_modifying_data.py, run on the local DuckDB copy
+- MySQL stays the system of record: the refresh in hr_duckdb.py only transfers rows that changed
+  in MySQL, so local edits would never be repaired. Every step therefore runs inside one
+  transaction that is rolled back at the end.
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import get_connection, query_df
+
+def print_departments(con, label=None):
+    if label:
+        print(f"\n{label}")
+    print(query_df(con, "SELECT * FROM departments ORDER BY department_id DESC LIMIT 5").to_string(index=False))
+
+if __name__ == "__main__":
+    con = get_connection()
+    try:
+        con.execute("BEGIN TRANSACTION")
+
+        # 1. INSERT: Add a new department
+        # What: Add a new department.
+        # How: hr_schema.sql ids are AUTO_INCREMENT in MySQL only, so the next id is computed here
+        con.execute('''INSERT INTO departments (department_id, department_name, location_id)
+                       SELECT COALESCE(MAX(department_id), 0) + 1, ?, ? FROM departments''',
+                    ['Test Dept', 1700])
+        print_departments(con, label="1. After INSERT (add row):")
+
+        # 2. UPDATE: Change department name
+        con.execute("UPDATE departments SET department_name = ? WHERE department_name = ?",
+                    ['Updated Dept', 'Test Dept'])
+        print_departments(con, label="2. After UPDATE (change name):")
+
+        # 3. DELETE: Remove the test department
+        con.execute("DELETE FROM departments WHERE department_name = ?", ['Updated Dept'])
+        print_departments(con, label="3. After DELETE (remove row):")
+
+        # 4. Bulk UPDATE: Set location_id = 9999 for departments with id > 200
+        con.execute("UPDATE departments SET location_id = 9999 WHERE department_id > 200")
+        print_departments(con, label="4. After bulk UPDATE (location_id):")
+
+        # 5. Revert changes
+        # What: Undo every step above.
+        # Why: Keep the analytics copy identical to MySQL.
+        con.execute("ROLLBACK")
+        print_departments(con, label="5. Final state (after ROLLBACK):")
+
+    except Exception as e:
+        print("Error during DML operations:", e)
+    finally:
+        con.close()
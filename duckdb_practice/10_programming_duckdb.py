@@ -0,0 +1,46 @@
+"""
+Programming with DuckDB
+- The examples of mysql_practice/10_tsql_programming.py, run on the local DuckDB copy
+- DuckDB has no stored procedures: scalar MACROs and table MACROs play that role,
+  and SET VARIABLE / getvariable() replace MySQL user variables
+- Macros are TEMP, so nothing is added to the persistent database
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from duckdb_practice.hr_duckdb import get_connection, query_df
+
+def print_result(label, result):
+    print(f"\n{label}")
+    print(result.to_string(index=False))
+
+if __name__ == "__main__":
+    con = get_connection(read_only=True)
+    try:
+        # 1. Variables and control flow
+        # What: Use a variable and IF/ELSE logic in SQL
+        con.execute("SET VARIABLE dept_id = 10")
+        print_result("1. Variables and control flow:",
+                     query_df(con, "SELECT CASE WHEN getvariable('dept_id') = 10 THEN 'Ten' ELSE 'Other' END AS dept_label"))
+
+        # 2. Table macro: count employees (stored procedure equivalent)
+        con.execute("CREATE OR REPLACE TEMP MACRO get_employee_count() AS TABLE "
+                    "SELECT COUNT(*) AS employee_count FROM employees")
+        print_result("2. Employee count (table macro):", query_df(con, "SELECT * FROM get_employee_count()"))
+
+        # 3. Parameterized table macro: employees in department
+        con.execute("CREATE OR REPLACE TEMP MACRO employees_in_department(dept_id) AS TABLE "
+                    "SELECT * FROM employees WHERE department_id = dept_id")
+        print_result("3. Employees in department 10 (parameterized macro):",
+                     query_df(con, "SELECT * FROM employees_in_department(?)", [10]))
+
+        # 4. Error handling (simple)
+        # What: A scalar macro that returns NULL instead of dividing by zero
+        con.execute("CREATE OR REPLACE TEMP MACRO safe_divide(a, b) AS "
+                    "CASE WHEN b = 0 THEN NULL ELSE ROUND(a / b, 2) END")
+        print_result("4. Error handling (safe divide, b=0):", query_df(con, "SELECT safe_divide(10, 0) AS result"))
+
+    except Exception as e:
+        print("Error during DuckDB programming examples:", e)
+    finally:
+        con.close()
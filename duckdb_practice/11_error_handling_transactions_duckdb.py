@@ -0,0 +1,65 @@
+"""
+Error Handling and Transactions (DuckDB)
+- The transaction examples of mysql_practice/11_error_handling_transactions.py, run on the local DuckDB copy
+- DuckDB has BEGIN/COMMIT/ROLLBACK but no SAVEPOINT
+- Changes are never committed: the copy must stay identical to MySQL (see 09_modifying_data_duckdb.py)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import duckdb
+from duckdb_practice.hr_duckdb import get_connection, query_df
+
+def print_salaries(con, label=None):
+    if label:
+        print(f"\n{label}")
+    print(query_df(con, "SELECT employee_id, salary FROM employees ORDER BY employee_id DESC LIMIT 5").to_string(index=False))
+
+if __name__ == "__main__":
+    con = None
+    try:
+        con = get_connection()
+
+        # 1. Basic transaction: rollback on error
+        # What: Try to update salaries, rollback on error.
+        # Why: Ensure data integrity.
+        print_salaries(con, label="Original salaries (last 5):")
+        con.execute("BEGIN TRANSACTION")
+        try:
+            con.execute("UPDATE employees SET salary = salary * 1.1 WHERE department_id = 10")
+            raise Exception("Simulated error: rolling back!")
+        except Exception as e:
+            print(f"\nError occurred: {e}. Rolling back.")
+            con.execute("ROLLBACK")
+        print_salaries(con, label="After simulated rollback (should match original):")
+
+        # 2. Changes are visible inside the transaction before it ends
+        con.execute("BEGIN TRANSACTION")
+        con.execute("UPDATE employees SET salary = salary * 1.1 WHERE department_id = 10")
+        print_salaries(con, label="Inside the transaction (salaries updated):")
+        con.execute("ROLLBACK")
+
+        # 3. SAVEPOINT for partial rollback
+        # What: Show that DuckDB rejects SAVEPOINT.
+        # Why: Partial rollback must be done by splitting work into separate transactions.
+        con.execute("BEGIN TRANSACTION")
+        try:
+            con.execute("UPDATE employees SET salary = salary * 1.05 WHERE department_id = 10")
+            con.execute("SAVEPOINT before_bonus")
+        except duckdb.Error as e:
+            print(f"\nSAVEPOINT not supported by DuckDB: {e}")
+        con.execute("ROLLBACK")
+        print_salaries(con, label="After ROLLBACK (should match original):")
+
+        # 4. Error handling in data processing
+        # What: Handle errors in SQL execution (unknown column).
+        try:
+            con.execute("SELECT salary, bonus FROM employees LIMIT 1")
+        except duckdb.BinderException as e:
+            print(f"\nHandled data processing error: {e}")
+
+    except Exception as e:
+        print(f"Fatal error: {e}")
+    finally:
+        if con is not None:
+            con.close()
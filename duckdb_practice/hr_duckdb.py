@@ -0,0 +1,196 @@
+"""
+Persistent DuckDB analytics backend for the HR tables
+- Keeps an on-disk DuckDB database (data/hr.duckdb) built once from MySQL
+- Refreshes incrementally: only new, changed or deleted rows are transferred
+- Hands query results to pandas through Arrow without copying
+
+What: A local analytical copy of hr_db that the duckdb_practice topic scripts query.
+Why: Heavy reporting queries (aggregates, windows, pivots) can run here instead of on the
+     MySQL OLTP server, and nothing is rebuilt from CSV on every run.
+How: - Tables are created from hr_schema.sql (types kept, MySQL-only clauses removed)
+     - MySQL computes one CRC32 per row; DuckDB keeps the last seen checksums, so a refresh
+       transfers (primary key, checksum) pairs plus only the rows whose checksum changed
+     - Results come back as Arrow tables and become ArrowDtype-backed DataFrames
+
+Run `python duckdb_practice/hr_duckdb.py` to build or refresh the database.
+"""
+import sys
+import os
+import re
+import time
+import duckdb
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DB_PATH = os.environ.get('HR_DUCKDB_PATH', os.path.join(ROOT, 'data', 'hr.duckdb'))
+SCHEMA_FILE = os.path.join(ROOT, 'hr_schema.sql')
+
+# Primary key of every HR table, in foreign-key order
+TABLES = {
+    'regions': 'region_id',
+    'countries': 'country_id',
+    'locations': 'location_id',
+    'jobs': 'job_id',
+    'departments': 'department_id',
+    'employees': 'employee_id',
+    'dependents': 'dependent_id',
+}
+
+
+def get_connection(path=DB_PATH, read_only=False):
+    """Connect to the persistent DuckDB database (the path does not depend on the cwd)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return duckdb.connect(path, read_only=read_only)
+
+
+def _arrow_table(result):
+    # DuckDB renamed fetch_arrow_table() to to_arrow_table(); support both
+    fetch = getattr(result, 'to_arrow_table', None) or result.fetch_arrow_table
+    return fetch()
+
+
+def query_arrow(con, sql, params=None):
+    """Run a query and return a pyarrow.Table."""
+    return _arrow_table(con.execute(sql, params or []))
+
+
+def query_df(con, sql, params=None):
+    """
+    Run a query and return a pandas DataFrame backed by the Arrow buffers (no copy):
+    columns use pd.ArrowDtype instead of being converted to NumPy/object arrays.
+    """
+    return query_arrow(con, sql, params).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def print_query(con, sql, params=None, label=None):
+    """Same role as print_query() in mysql_practice, printing the DataFrame result."""
+    if label:
+        print(f"\n{label}")
+    print(query_df(con, sql, params).to_string(index=False))
+
+
+def duckdb_schema_sql(schema_file=SCHEMA_FILE):
+    """hr_schema.sql translated to DuckDB DDL (no AUTO_INCREMENT, display widths or FKs)."""
+    with open(schema_file, 'r', encoding='utf-8') as file:
+        ddl = file.read()
+    ddl = re.sub(r'\bINT\s*\(\d+\)', 'INT', ddl)
+    ddl = re.sub(r'\bAUTO_INCREMENT\b', '', ddl)
+    # Foreign keys would make the incremental delete+insert order-dependent; the copy is read-mostly
+    ddl = re.sub(r',\s*FOREIGN KEY[^,\n]*', '', ddl)
+    ddl = re.sub(r'CREATE TABLE (\w+)', r'CREATE TABLE IF NOT EXISTS \1', ddl)
+    return [statement.strip() for statement in ddl.split(';') if statement.strip()]
+
+
+def create_schema(con):
+    for statement in duckdb_schema_sql():
+        con.execute(statement)
+    con.execute('''CREATE TABLE IF NOT EXISTS _sync_state (
+                       table_name VARCHAR PRIMARY KEY, rows_changed BIGINT, rows_deleted BIGINT,
+                       refreshed_at TIMESTAMP)''')
+    for table, pk in TABLES.items():
+        pk_type = con.execute(
+            "SELECT data_type FROM information_schema.columns WHERE table_name = ? AND column_name = ?",
+            [table, pk]).fetchone()[0]
+        con.execute(f"CREATE TABLE IF NOT EXISTS _checksums_{table} (pk {pk_type} PRIMARY KEY, crc BIGINT)")
+
+
+def _columns(con, table):
+    return [row[0] for row in con.execute(
+        "SELECT column_name FROM information_schema.columns WHERE table_name = ? ORDER BY ordinal_position",
+        [table]).fetchall()]
+
+
+def _source_checksums(mysql_cursor, table, pk, columns):
+    # One CRC32 per row, computed by MySQL; '\N' marks NULLs so (NULL, 'a') != ('a', NULL)
+    row_text = ', '.join(f"COALESCE({column}, '\\\\N')" for column in columns)
+    mysql_cursor.execute(f"SELECT {pk} AS pk, CRC32(CONCAT_WS('|', {row_text})) AS crc FROM {table}")
+    return pd.DataFrame(mysql_cursor.fetchall(), columns=['pk', 'crc'])
+
+
+def _fetch_rows(mysql_cursor, table, pk, columns, keys, batch_size):
+    frames = []
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start:start + batch_size]
+        placeholders = ', '.join(['%s'] * len(batch))
+        mysql_cursor.execute(f"SELECT {', '.join(columns)} FROM {table} WHERE {pk} IN ({placeholders})", batch)
+        frames.append(pd.DataFrame(mysql_cursor.fetchall(), columns=columns))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def refresh_table(con, mysql_cursor, table, batch_size=5000):
+    """
+    Bring one DuckDB table in line with MySQL, transferring only changed rows.
+    Returns (rows inserted or updated, rows deleted).
+    """
+    pk = TABLES[table]
+    columns = _columns(con, table)
+    source = _source_checksums(mysql_cursor, table, pk, columns)
+    con.register('source_checksums', source)
+    try:
+        changed = [row[0] for row in con.execute(f'''
+            SELECT s.pk FROM source_checksums s LEFT JOIN _checksums_{table} c ON c.pk = s.pk
+            WHERE c.crc IS DISTINCT FROM s.crc''').fetchall()]
+        deleted = [row[0] for row in con.execute(f'''
+            SELECT c.pk FROM _checksums_{table} c ANTI JOIN source_checksums s ON c.pk = s.pk''').fetchall()]
+        rows = _fetch_rows(mysql_cursor, table, pk, columns, changed, batch_size)
+
+        con.execute("BEGIN TRANSACTION")
+        try:
+            if changed or deleted:
+                con.register('stale_keys', pd.DataFrame({'pk': changed + deleted}))
+                con.execute(f"DELETE FROM {table} WHERE {pk} IN (SELECT pk FROM stale_keys)")
+                con.execute(f"DELETE FROM _checksums_{table} WHERE pk IN (SELECT pk FROM stale_keys)")
+                con.unregister('stale_keys')
+            if changed:
+                con.register('changed_rows', rows)
+                con.execute(f"INSERT INTO {table} ({', '.join(columns)}) "
+                            f"SELECT {', '.join(columns)} FROM changed_rows")
+                con.execute(f'''INSERT INTO _checksums_{table}
+                                SELECT s.pk, s.crc FROM source_checksums s
+                                WHERE s.pk IN (SELECT {pk} FROM changed_rows)''')
+                con.unregister('changed_rows')
+            con.execute("INSERT OR REPLACE INTO _sync_state VALUES (?, ?, ?, now())",
+                        [table, len(changed), len(deleted)])
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+    finally:
+        con.unregister('source_checksums')
+    return len(changed), len(deleted)
+
+
+def refresh(con=None, mysql_connection=None, tables=None):
+    """
+    Build (first run) or incrementally refresh the DuckDB copy from MySQL.
+    Returns a DataFrame with rows changed/deleted and seconds per table.
+    """
+    from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+    import mysql.connector
+
+    own_con = con is None
+    con = con or get_connection()
+    own_mysql = mysql_connection is None
+    mysql_connection = mysql_connection or mysql.connector.connect(
+        host=HOST, user=USER, password=PASSWORD, database=DATABASE)
+    report = []
+    try:
+        create_schema(con)
+        cursor = mysql_connection.cursor()
+        for table in tables or TABLES:
+            start = time.perf_counter()
+            changed, deleted = refresh_table(con, cursor, table)
+            report.append((table, changed, deleted, round(time.perf_counter() - start, 3)))
+        cursor.close()
+    finally:
+        if own_mysql:
+            mysql_connection.close()
+        if own_con:
+            con.close()
+    return pd.DataFrame(report, columns=['table', 'rows_changed', 'rows_deleted', 'seconds'])
+
+
+if __name__ == "__main__":
+    print(f"Refreshing {DB_PATH} from MySQL...")
+    print(refresh().to_string(index=False))
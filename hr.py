@@ -0,0 +1,142 @@
+"""
+hr: one command line for every script and practice module
+- python hr.py setup | connect | load | plot [...] | export | duckdb
+- python hr.py practice <mysql|pandas|duckdb> <topic>    e.g. practice pandas 05
+- python hr.py list
+- python hr.py --profile-import [command ...]            import-time report + budget check
+
+What: A single entry point instead of remembering which directory each script lives in.
+Why: Starting a script is mostly importing: pandas, mysql.connector or matplotlib cost far more
+     than the work done by `connect`. An entry point that imported them all up front would
+     make every command as slow as the slowest.
+How: This file imports only the standard library. A command is resolved to a script path and
+     run with runpy, so only the libraries that script imports are loaded, when it runs.
+     --profile-import re-runs the command under `python -X importtime` with HR_IMPORT_ONLY=1
+     (the target script's top-level imports are executed, the script itself is not), prints
+     the slowest imports and exits with status 1 when the total exceeds --budget-ms.
+"""
+import argparse
+import os
+import re
+import runpy
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BACKENDS = ('mysql', 'pandas', 'duckdb')
+IMPORT_BUDGET_MS = 1500  # default cold-start budget for --profile-import
+
+# command -> (script path relative to ROOT, help)
+COMMANDS = {
+    'setup': ('scripts/setup_database.py', 'create hr_db and load hr_schema.sql / hr_data.sql'),
+    'connect': ('scripts/mysql_connect.py', 'test the MySQL connection'),
+    'load': ('scripts/load_hr_data.py', 'load employees into a pandas DataFrame'),
+    'plot': ('scripts/plot_salary_distribution.py', 'salary histograms (options are passed through)'),
+    'export': ('scripts/export_parquet.py', 'incremental Parquet snapshot in data/parquet/'),
+    'duckdb': ('duckdb_practice/hr_duckdb.py', 'refresh data/hr.duckdb from MySQL'),
+}
+
+
+def practice_script(backend, topic):
+    """Path of the <topic> script in <backend>_practice/ (topic: '5', '05' or a name fragment)."""
+    directory = os.path.join(ROOT, f"{backend}_practice")
+    scripts = sorted(name for name in os.listdir(directory) if re.match(r'\d\d_.*\.py$', name))
+    if topic.isdigit():
+        matches = [name for name in scripts if name.startswith(f"{int(topic):02d}_")]
+    else:
+        matches = [name for name in scripts if topic.lower() in name.lower()]
+    if len(matches) != 1:
+        raise SystemExit(f"hr: topic {topic!r} matches {matches or 'no script'} in {backend}_practice/")
+    return os.path.join(directory, matches[0])
+
+
+def list_topics():
+    tables = {backend: sorted(name for name in os.listdir(os.path.join(ROOT, f"{backend}_practice"))
+                              if re.match(r'\d\d_.*\.py$', name)) for backend in BACKENDS}
+    for command, (_, help_text) in COMMANDS.items():
+        print(f"{command:<10} {help_text}")
+    print()
+    for names in zip(*tables.values()):
+        print(f"{names[0][:2]}  " + '  '.join(f"{name:<38}" for name in names).rstrip())
+
+
+def import_only(path):
+    """Execute only the top-level imports of path (what starting it costs, without running it)."""
+    import ast
+    with open(path, 'r', encoding='utf-8') as file:
+        tree = ast.parse(file.read(), path)
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    code = compile(ast.Module(body=imports, type_ignores=[]), path, 'exec')
+    exec(code, {'__name__': '__hr_import_only__', '__file__': path})
+
+
+def run_script(path, argv):
+    """Run path as __main__, as `python path argv...` would (its directory first on sys.path)."""
+    sys.argv = [path] + list(argv)
+    for directory in (ROOT, os.path.dirname(path)):
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+    if os.environ.get('HR_IMPORT_ONLY'):
+        import_only(path)
+        return
+    runpy.run_path(path, run_name='__main__')
+
+
+def parse_importtime(stderr):
+    """[(cumulative_us, module)] for top-level imports from `python -X importtime` output."""
+    imports = []
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)', line)
+        if match and not match.group(3):  # no indentation: imported directly, not by another module
+            imports.append((int(match.group(2)), match.group(4)))
+    return imports
+
+
+def profile_import(argv, budget_ms, top=15):
+    import subprocess
+    environment = dict(os.environ, HR_IMPORT_ONLY='1')
+    command = [sys.executable, '-X', 'importtime', os.path.abspath(__file__)] + list(argv)
+    completed = subprocess.run(command, env=environment, capture_output=True, text=True)
+    imports = parse_importtime(completed.stderr)
+    total_ms = sum(us for us, _ in imports) / 1000
+    print(f"Imports for `hr {' '.join(argv)}` (cumulative, top {top}):")
+    for us, module in sorted(imports, reverse=True)[:top]:
+        print(f"  {us / 1000:8.1f} ms  {module}")
+    verdict = 'OK' if total_ms <= budget_ms else 'OVER BUDGET'
+    print(f"Total: {total_ms:.1f} ms (budget {budget_ms} ms) {verdict}")
+    if completed.returncode != 0:
+        print(completed.stderr.splitlines()[-1] if completed.stderr else '', file=sys.stderr)
+        return completed.returncode
+    return 0 if total_ms <= budget_ms else 1
+
+
+def main(argv=None):
+    epilog = '\n'.join(f"  {command:<10} {help_text}" for command, (_, help_text) in COMMANDS.items())
+    epilog += "\n  practice   <mysql|pandas|duckdb> <topic> [args]\n  list       commands and practice topics"
+    parser = argparse.ArgumentParser(prog='hr', description='HR-MySQL-Project command line.',
+                                     epilog='commands:\n' + epilog,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profile-import', action='store_true',
+                        help='report import time of the command instead of running it')
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS,
+                        help='import-time budget for --profile-import (exit status 1 when exceeded)')
+    parser.add_argument('command', nargs='?', choices=list(COMMANDS) + ['practice', 'list'])
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='passed to the command')
+    args = parser.parse_args(argv)
+
+    if args.profile_import:
+        return profile_import([args.command or 'list'] + args.args, args.budget_ms)
+    if args.command in COMMANDS:
+        run_script(os.path.join(ROOT, COMMANDS[args.command][0]), args.args)
+    elif args.command == 'practice':
+        if len(args.args) < 2 or args.args[0] not in BACKENDS:
+            parser.error("usage: hr practice <mysql|pandas|duckdb> <topic> [args]")
+        run_script(practice_script(args.args[0], args.args[1]), args.args[2:])
+    elif args.command == 'list':
+        list_topics()
+    else:
+        parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,12 +4,18 @@ Best practices: all examples in functions, modular, only SELECT statements, clea
 """
 import sys
 import os
+import time
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE, SHARDS
 import mysql.connector
+from mysql_practice.pipeline import Pipeline
+from mysql_practice.result_sinks import print_rows
 
-# create a connection to the MySQL database
+# create a connection to the MySQL database (or to every shard when MYSQL_SHARDS is set)
 def get_connection():
+    if SHARDS:
+        from mysql_practice.sharding import sharded_connection
+        return sharded_connection()
     return mysql.connector.connect(
         host=HOST,
         user=USER,
@@ -98,47 +104,41 @@ def select_employees_with_offset(cursor, limit, offset):
     return cursor.fetchall()
 
 # Example usage and printing results
+# What: Run every example above and print the results.
+# Why: The queries are independent, so they need not wait for each other.
+# How: A Pipeline's deferred cursor queues each select_*() call; execute() sends them all in
+#      one round trip, then the results are printed in order.
 def print_example_results():
     with get_connection() as conn:
-        cursor = conn.cursor(dictionary=True)
-        print("All employees:")
-        for row in select_all_employees(cursor):
-            print(row)
-        print("\nEmployees in department 1:")
-        for row in select_employees_by_department(cursor, 1):
-            print(row)
-        print("\nEmployee with ID 101:")
-        print(select_employee_by_id(cursor, 101))
-        print("\nEmployees with job title 'Manager':")
-        for row in select_employees_by_job_title(cursor, 'Manager'):
-            print(row)
-        print("\nFirst 5 employees:")
-        for row in select_first_n_employees(cursor, 5):
-            print(row)
-        print("\nEmployees with salary > 5000:")
-        for row in select_employees_with_salary_above(cursor, 5000):
-            print(row)
-        print("\nEmployee names:")
-        for row in select_employee_names(cursor):
-            print(row)
-        print("\nHigh paid managers (salary > 10000):")
-        for row in select_high_paid_managers(cursor):
-            print(row)
-        print("\nEmployees ordered by salary descending:")
-        for row in select_employees_ordered_by_salary(cursor):
-            print(row)
-        print("\nDistinct job titles:")
-        for row in select_distinct_job_titles(cursor):
-            print(row)
-        print("\nEmployees with email domain 'example.com':")
-        for row in select_employees_with_email_domain(cursor, 'example.com'):
-            print(row)
-        print("\nEmployee count by department:")
-        for row in select_employee_count_by_department(cursor):
-            print(row)
-        print("\nEmployees with limit 5 and offset 5:")
-        for row in select_employees_with_offset(cursor, 5, 5):
-            print(row)
+        pipeline = Pipeline(conn, dictionary=True)
+        cursor = pipeline.cursor()
+        examples = [
+            ("All employees:", select_all_employees(cursor)),
+            ("Employees in department 1:", select_employees_by_department(cursor, 1)),
+            ("Employee with ID 101:", select_employee_by_id(cursor, 101)),
+            ("Employees with job title 'Manager':", select_employees_by_job_title(cursor, 'Manager')),
+            ("First 5 employees:", select_first_n_employees(cursor, 5)),
+            ("Employees with salary > 5000:", select_employees_with_salary_above(cursor, 5000)),
+            ("Employee names:", select_employee_names(cursor)),
+            ("High paid managers (salary > 10000):", select_high_paid_managers(cursor)),
+            ("Employees ordered by salary descending:", select_employees_ordered_by_salary(cursor)),
+            ("Distinct job titles:", select_distinct_job_titles(cursor)),
+            ("Employees with email domain 'example.com':", select_employees_with_email_domain(cursor, 'example.com')),
+            ("Employee count by department:", select_employee_count_by_department(cursor)),
+            ("Employees with limit 5 and offset 5:", select_employees_with_offset(cursor, 5, 5)),
+        ]
+        started = time.perf_counter()
+        pipeline.execute()
+        elapsed = time.perf_counter() - started
+        for i, (label, result) in enumerate(examples):
+            print(("\n" if i else "") + label)
+            if result.error is not None:
+                print(f"Error: {result.error}")
+            elif result.one:
+                print(result.value)
+            else:
+                print_rows(list(result))
+        print(f"\n{len(examples)} queries in {pipeline.round_trips} round trip(s), {elapsed * 1000:.1f} ms")
 
 if __name__ == "__main__":
     print_example_results()
\ No newline at end of file
@@ -1,12 +1,14 @@
 """
 Querying Multiple Tables with JOIN
 Comprehensive best-practice examples: INNER, LEFT, RIGHT, FULL OUTER (simulated), CROSS, SELF, multi-table joins
+Recursive self join (WITH RECURSIVE) for full reporting chains; see pandas_practice/org_hierarchy.py
 """
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
 import mysql.connector
+from mysql_practice.result_sinks import print_rows
 
 def get_connection():
     return mysql.connector.connect(
@@ -81,6 +83,19 @@ def self_join_employees_managers(cursor):
     ''')
     return cursor.fetchall()
 
+# RECURSIVE SELF JOIN: Full reporting chain (all managers up to the top), not just one level
+def recursive_reporting_chain(cursor, employee_id):
+    cursor.execute('''
+        WITH RECURSIVE chain (employee_id, first_name, manager_id, level) AS (
+            SELECT employee_id, first_name, manager_id, 0 FROM employees WHERE employee_id = %s
+            UNION ALL
+            SELECT m.employee_id, m.first_name, m.manager_id, c.level + 1
+            FROM employees m JOIN chain c ON m.employee_id = c.manager_id
+        )
+        SELECT employee_id, first_name AS manager, level FROM chain WHERE level > 0 ORDER BY level;
+    ''', (employee_id,))
+    return cursor.fetchall()
+
 # Multi-table join: Employees, departments, and locations
 def multi_table_join(cursor):
     cursor.execute('''
@@ -96,26 +111,21 @@ def print_join_examples():
     with get_connection() as conn:
         cursor = conn.cursor(dictionary=True)
         print("INNER JOIN (employees & departments):")
-        for row in inner_join_employees_departments(cursor):
-            print(row)
+        print_rows(inner_join_employees_departments(cursor))
         print("\nLEFT JOIN (all employees, departments):")
-        for row in left_join_employees_departments(cursor):
-            print(row)
+        print_rows(left_join_employees_departments(cursor))
         print("\nRIGHT JOIN (all departments, employees):")
-        for row in right_join_departments_employees(cursor):
-            print(row)
+        print_rows(right_join_departments_employees(cursor))
         print("\nFULL OUTER JOIN (simulated):")
-        for row in full_outer_join_employees_departments(cursor):
-            print(row)
+        print_rows(full_outer_join_employees_departments(cursor))
         print("\nCROSS JOIN (employees x departments):")
-        for row in cross_join_employees_departments(cursor):
-            print(row)
+        print_rows(cross_join_employees_departments(cursor))
         print("\nSELF JOIN (employees & managers):")
-        for row in self_join_employees_managers(cursor):
-            print(row)
+        print_rows(self_join_employees_managers(cursor))
+        print("\nRECURSIVE SELF JOIN (reporting chain of employee 206):")
+        print_rows(recursive_reporting_chain(cursor, 206))
         print("\nMULTI-TABLE JOIN (employees, departments, locations):")
-        for row in multi_table_join(cursor):
-            print(row)
+        print_rows(multi_table_join(cursor))
 
 if __name__ == "__main__":
     print_join_examples()
@@ -1,12 +1,15 @@
 """
 Using Set Operators (UNION, INTERSECT, EXCEPT)
-Best practices: UNION, UNION ALL, INTERSECT (simulated), EXCEPT (simulated)
+Best practices: UNION, UNION ALL, INTERSECT, EXCEPT
+(native on MySQL 8.0.31+, simulated with semi/anti-joins otherwise; see set_operator_strategies.py)
 """
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
 import mysql.connector
+from mysql_practice.result_sinks import print_rows
+from mysql_practice.set_operator_strategies import set_operation_sql
 
 def get_connection():
     return mysql.connector.connect(
@@ -35,37 +38,33 @@ def union_all_employees_departments(cursor):
     ''')
     return cursor.fetchall()
 
-# INTERSECT simulation: Values present in both tables
+# INTERSECT: Values present in both tables
+# How: Native INTERSECT when the server supports it, EXISTS semi-join otherwise
 def intersect_employees_departments(cursor):
-    cursor.execute('''
-        SELECT first_name AS name FROM employees
-        WHERE first_name IN (SELECT department_name FROM departments);
-    ''')
-    return cursor.fetchall()
+    return set_operation_sql(cursor,
+        "SELECT first_name FROM employees",
+        "SELECT department_name FROM departments",
+        ['name'], 'INTERSECT')
 
-# EXCEPT simulation: Values in employees not in departments
+# EXCEPT: Values in employees not in departments
+# How: Native EXCEPT when the server supports it, NOT EXISTS anti-join otherwise
 def except_employees_departments(cursor):
-    cursor.execute('''
-        SELECT first_name AS name FROM employees
-        WHERE first_name NOT IN (SELECT department_name FROM departments);
-    ''')
-    return cursor.fetchall()
+    return set_operation_sql(cursor,
+        "SELECT first_name FROM employees",
+        "SELECT department_name FROM departments",
+        ['name'], 'EXCEPT')
 
 def print_set_operator_examples():
     with get_connection() as conn:
         cursor = conn.cursor(dictionary=True)
         print("UNION (unique names from employees and departments):")
-        for row in union_employees_departments(cursor):
-            print(row)
+        print_rows(union_employees_departments(cursor))
         print("\nUNION ALL (all names, including duplicates):")
-        for row in union_all_employees_departments(cursor):
-            print(row)
+        print_rows(union_all_employees_departments(cursor))
         print("\nINTERSECT (names present in both employees and departments):")
-        for row in intersect_employees_departments(cursor):
-            print(row)
+        print_rows(intersect_employees_departments(cursor))
         print("\nEXCEPT (names in employees not in departments):")
-        for row in except_employees_departments(cursor):
-            print(row)
+        print_rows(except_employees_departments(cursor))
 
 if __name__ == "__main__":
     print_set_operator_examples()
@@ -1,31 +1,27 @@
 """
 Using Functions and Aggregating Data (MySQL)
 - COUNT, SUM, AVG, MIN, MAX, GROUP BY, HAVING, multi-column grouping, percent-of-total, top-N per group, custom aggregations
+- Window functions: running totals, LAG/LEAD, moving averages (OVER ... ROWS BETWEEN ...)
+- Approximate percentiles and distinct counts from mergeable sketches (scripts/sketches.py)
 
 Each block includes what, why, and how comments.
 """
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from scripts.db_config import HOST, USER, PASSWORD, DATABASE
-import mysql.connector
+from scripts.db_config import SHARDS
+from scripts.db_router import routed_connection
+from mysql_practice.result_sinks import print_query, print_rows
 
 def get_connection():
-    return mysql.connector.connect(
-        host=HOST,
-        user=USER,
-        password=PASSWORD,
-        database=DATABASE
-    )
+    # Read-only reporting queries: scattered over MYSQL_SHARDS when set (sharding.py),
+    # otherwise served by a replica when MYSQL_REPLICAS is set
+    if SHARDS:
+        from mysql_practice.sharding import sharded_connection
+        return sharded_connection()
+    return routed_connection()
 
 
-def print_query(cursor, query, params=None, label=None):
-    if label:
-        print(f"\n{label}")
-    cursor.execute(query, params or ())
-    for row in cursor.fetchall():
-        print(row)
-
 if __name__ == "__main__":
     with get_connection() as conn:
         cursor = conn.cursor(dictionary=True)
@@ -115,3 +111,45 @@ if __name__ == "__main__":
             '''SELECT department_id, MAX(salary) - MIN(salary) AS salary_range
                FROM employees GROUP BY department_id''',
             label="10. Salary range per department:")
+
+        # 11. Window functions: running payroll, lag/lead within department
+        # What: Running payroll by hire_date, previous/next salary inside each department.
+        # Why: Payroll growth over time and pay progression inside teams.
+        # How: SUM() OVER (ORDER BY ...) and LAG/LEAD() OVER (PARTITION BY ... ORDER BY ...)
+        print_query(cursor,
+            '''SELECT employee_id, department_id, hire_date, salary,
+                      SUM(salary) OVER (ORDER BY hire_date, employee_id
+                                        ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS running_payroll,
+                      LAG(salary) OVER (PARTITION BY department_id ORDER BY hire_date, employee_id) AS prev_salary,
+                      LEAD(salary) OVER (PARTITION BY department_id ORDER BY hire_date, employee_id) AS next_salary
+               FROM employees
+               ORDER BY hire_date, employee_id''',
+            label="11. Window functions (running payroll, lag/lead within department):")
+
+        # 12. Moving average over hiring cohorts
+        # What: Average salary per hire year, smoothed over the last 3 cohorts.
+        # Why: Spot pay trends without year-to-year noise.
+        # How: Window function over a grouped result (ROWS BETWEEN 2 PRECEDING AND CURRENT ROW)
+        print_query(cursor,
+            '''SELECT YEAR(hire_date) AS cohort, COUNT(*) AS hires, AVG(salary) AS avg_salary,
+                      AVG(AVG(salary)) OVER (ORDER BY YEAR(hire_date)
+                                             ROWS BETWEEN 2 PRECEDING AND CURRENT ROW) AS moving_avg_3
+               FROM employees
+               GROUP BY YEAR(hire_date)
+               ORDER BY cohort''',
+            label="12. 3-cohort moving average salary (cohort = hire year):")
+
+        # 13. Salary percentiles and distinct counts per department (sketches)
+        # What: Median, p90 and p99 salary and the number of distinct employees per department.
+        # Why: Exact percentiles need each department's salaries sorted; dashboards over long
+        #      histories need them from precomputed, mergeable summaries instead.
+        # How: One streamed pass builds a KLL quantile sketch + HyperLogLog per department; the
+        #      company-wide row is the merge of the department sketches, not a second scan.
+        #      Imported here: numpy/pandas would otherwise load for every block of this script.
+        from scripts.sketches import build_sketches, merge_sketches, summarize
+        sketch_cursor = conn.cursor()
+        sketches = build_sketches(sketch_cursor, group_by='department_id')
+        sketch_cursor.close()
+        sketches['*'] = merge_sketches([{'*': group} for group in sketches.values()])['*']
+        print_rows(summarize(sketches),
+                   label="13. Salary p50/p90/p99 and distinct employees per department (approximate, '*' = all):")
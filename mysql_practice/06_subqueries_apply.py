@@ -2,31 +2,22 @@
 Using Subqueries and APPLY (MySQL does not support APPLY, but supports subqueries)
 - Scalar, correlated, IN, and EXISTS subqueries
 - APPLY-like logic using subqueries or joins
+- Decorrelated rewrites of the correlated subqueries (see decorrelate.py)
 
 Each block includes what, why, and how comments.
 """
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from scripts.db_config import HOST, USER, PASSWORD, DATABASE
-import mysql.connector
+from scripts.db_router import routed_connection
+from mysql_practice.decorrelate import group_aggregate_comparison_sql, exists_in_group_sql, run_decorrelated
+from mysql_practice.result_sinks import print_query, print_rows
 
 def get_connection():
-    return mysql.connector.connect(
-        host=HOST,
-        user=USER,
-        password=PASSWORD,
-        database=DATABASE
-    )
+    # Read-only reporting queries: served by a replica when MYSQL_REPLICAS is set
+    return routed_connection()
 
 
-def print_query(cursor, query, params=None, label=None):
-    if label:
-        print(f"\n{label}")
-    cursor.execute(query, params or ())
-    for row in cursor.fetchall():
-        print(row)
-
 if __name__ == "__main__":
     with get_connection() as conn:
         cursor = conn.cursor(dictionary=True)
@@ -69,6 +60,18 @@ if __name__ == "__main__":
                )''',
             label="4. Employees in departments with a manager:")
 
+        # 4b. Decorrelated rewrites of queries 3 and 4
+        # What: Same results as 3 and 4 without evaluating a subquery per employee.
+        # Why: Correlated subqueries cost O(n x department size); the rewrites are O(n).
+        # How: One grouped derived table + join (3) and a semi-join on DISTINCT departments (4),
+        #      each checked with EXPLAIN for leftover DEPENDENT SUBQUERY steps before running.
+        sql, params = group_aggregate_comparison_sql('employees', 'salary', 'department_id')
+        print("\n4b. Employees earning more than department average (decorrelated):")
+        print_rows(run_decorrelated(cursor, sql, params))
+        sql, params = exists_in_group_sql('employees', 'department_id', 'job_id LIKE %s', ('%MAN%',))
+        print("\n4c. Employees in departments with a manager (semi-join):")
+        print_rows(run_decorrelated(cursor, sql, params))
+
         # 5. APPLY-like: Add department average salary as a column (using join)
         # What: Annotate each employee with their department's average salary.
         # Why: For comparison and analytics.
@@ -8,25 +8,14 @@ Each block includes what, why, and how comments.
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from scripts.db_config import HOST, USER, PASSWORD, DATABASE
-import mysql.connector
+from scripts.db_router import routed_connection
+from mysql_practice.result_sinks import print_query
 
 def get_connection():
-    return mysql.connector.connect(
-        host=HOST,
-        user=USER,
-        password=PASSWORD,
-        database=DATABASE
-    )
+    # Read-only reporting queries: served by a replica when MYSQL_REPLICAS is set
+    return routed_connection()
 
 
-def print_query(cursor, query, params=None, label=None):
-    if label:
-        print(f"\n{label}")
-    cursor.execute(query, params or ())
-    for row in cursor.fetchall():
-        print(row)
-
 if __name__ == "__main__":
     with get_connection() as conn:
         cursor = conn.cursor(dictionary=True)
@@ -9,6 +9,8 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
 import mysql.connector
+from mysql_practice.bulk_dml import chunked_update
+from mysql_practice.result_sinks import print_query
 
 def get_connection():
     return mysql.connector.connect(
@@ -20,11 +22,7 @@ def get_connection():
 
 
 def print_departments(cursor, label=None):
-    if label:
-        print(f"\n{label}")
-    cursor.execute("SELECT * FROM departments ORDER BY department_id DESC LIMIT 5;")
-    for row in cursor.fetchall():
-        print(row)
+    print_query(cursor, "SELECT * FROM departments ORDER BY department_id DESC LIMIT 5;", label=label)
 
 if __name__ == "__main__":
     try:
@@ -56,8 +54,11 @@ if __name__ == "__main__":
             # 4. Bulk UPDATE: Set all location_id=9999 for departments with id > 200
             # What: Bulk update location_id for certain departments.
             # Why: Simulate mass data change.
-            cursor.execute("UPDATE departments SET location_id=9999 WHERE department_id > 200;")
-            conn.commit()
+            # How: Primary-key range chunks, each committed on its own (bulk_dml.py), so a large
+            #      table is never locked by one long transaction
+            result = chunked_update(conn, 'departments', 'department_id', 'location_id = 9999',
+                                    where='department_id > %s', params=(200,), chunk_size=1000)
+            print(f"\nBulk UPDATE: {result['rows']} rows in {result['chunks']} chunks ({result['rows_per_sec']} rows/s)")
             print_departments(cursor, label="4. After bulk UPDATE (location_id):")
 
             # 5. Revert changes (reset to original)
@@ -1,6 +1,7 @@
 """
 Programming with Transact-SQL (T-SQL) in MySQL
 - Variables, control flow, stored procedures (MySQL style), parameterized procedures, error handling
+- Routines are deployed only when their definition changes; many CALLs share one round trip
 
 Each block includes what, why, and how comments.
 """
@@ -9,6 +10,8 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
 import mysql.connector
+from mysql_practice.routines import RoutineRegistry, call_many, OUT
+from mysql_practice.result_sinks import print_rows
 
 def get_connection():
     return mysql.connector.connect(
@@ -19,12 +22,33 @@ def get_connection():
     )
 
 
+# What: The procedures used below, registered once
+# Why: registry.deploy() re-creates a procedure only when this text changes
+#      (no DROP + CREATE on every run)
+registry = RoutineRegistry()
+registry.procedure('get_employee_count', '', """
+    BEGIN
+        SELECT COUNT(*) AS employee_count FROM employees;
+    END""")
+registry.procedure('employees_in_department', 'IN dept_id INT', """
+    BEGIN
+        SELECT * FROM employees WHERE department_id = dept_id;
+    END""")
+registry.procedure('safe_divide', 'IN a INT, IN b INT, OUT result DECIMAL(10,2)', """
+    BEGIN
+        IF b = 0 THEN
+            SET result = NULL;
+        ELSE
+            SET result = a / b;
+        END IF;
+    END""")
+
+
 def print_result(label, result):
-    print(f"\n{label}")
     if isinstance(result, list):
-        for row in result:
-            print(row)
+        print_rows(result, label=label)
     else:
+        print(f"\n{label}")
         print(result)
 
 if __name__ == "__main__":
@@ -43,13 +67,8 @@ if __name__ == "__main__":
             # 2. Stored procedure: count employees
             # What: Encapsulate logic for reuse
             # Why: Modularize business logic
-            cursor.execute("DROP PROCEDURE IF EXISTS get_employee_count;")
-            cursor.execute("""
-                CREATE PROCEDURE get_employee_count()
-                BEGIN
-                    SELECT COUNT(*) AS employee_count FROM employees;
-                END;
-            """)
+            # How: deploy() creates missing procedures and replaces changed ones only
+            print_result("Deploying procedures:", registry.deploy(conn))
             cursor.callproc('get_employee_count')
             for result in cursor.stored_results():
                 print_result("2. Employee count (stored procedure):", result.fetchall())
@@ -57,13 +76,6 @@ if __name__ == "__main__":
             # 3. Parameterized stored procedure: employees in department
             # What: Return employees in a given department
             # Why: Encapsulate logic with parameters
-            cursor.execute("DROP PROCEDURE IF EXISTS employees_in_department;")
-            cursor.execute("""
-                CREATE PROCEDURE employees_in_department(IN dept_id INT)
-                BEGIN
-                    SELECT * FROM employees WHERE department_id = dept_id;
-                END;
-            """)
             cursor.callproc('employees_in_department', [10])
             for result in cursor.stored_results():
                 print_result("3. Employees in department 10 (parameterized procedure):", result.fetchall())
@@ -71,21 +83,25 @@ if __name__ == "__main__":
             # 4. Error handling (simple)
             # What: Demonstrate error handling in stored procedure
             # Why: Robustness
-            cursor.execute("DROP PROCEDURE IF EXISTS safe_divide;")
-            cursor.execute("""
-                CREATE PROCEDURE safe_divide(IN a INT, IN b INT, OUT result DECIMAL(10,2))
-                BEGIN
-                    IF b = 0 THEN
-                        SET result = NULL;
-                    ELSE
-                        SET result = a / b;
-                    END IF;
-                END;
-            """)
             # Call safe_divide with b=0
             args = [10, 0, 0]
             result_args = cursor.callproc('safe_divide', args)
             print_result("4. Error handling (safe divide, b=0):", result_args)
 
+            # 5. Batched CALLs
+            # What: employees_in_department for every department, and several safe_divide calls
+            # Why: One round trip per CALL adds up; one multi-statement request does not
+            # How: call_many() splits the returned result sets per call; OUT values come back
+            #      from session variables
+            cursor.execute("SELECT department_id FROM departments ORDER BY department_id;")
+            department_ids = [row[0] for row in cursor.fetchall()]
+            calls = call_many(conn, 'employees_in_department', [[d] for d in department_ids])
+            print("\n5. Employees per department (one batched request):")
+            for department_id, call in zip(department_ids, calls):
+                print(department_id, len(call['result_sets'][0]) if call['result_sets'] else 0)
+            divisions = [[10, 0, OUT], [10, 4, OUT], [7, 2, OUT]]
+            for args, call in zip(divisions, call_many(conn, 'safe_divide', divisions)):
+                print(f"safe_divide({args[0]}, {args[1]}) = {call['out'][0]}")
+
     except Exception as e:
         print("Error during T-SQL programming examples:", e)
@@ -3,6 +3,7 @@ Error Handling and Transactions
 - Using try/except in Python
 - MySQL transaction control (COMMIT, ROLLBACK, SAVEPOINT)
 - Best practices for robust data operations
+- Retrying deadlocks (1213) and lock wait timeouts (1205)
 
 Each block includes what, why, and how comments.
 """
@@ -11,6 +12,8 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
 import mysql.connector
+from mysql_practice.tx_retry import transactional, RetryStats, contention_demo
+from mysql_practice.result_sinks import print_query
 
 def get_connection():
     return mysql.connector.connect(
@@ -22,11 +25,18 @@ def get_connection():
 
 
 def print_salaries(cursor, label=None):
-    if label:
-        print(f"\n{label}")
-    cursor.execute("SELECT employee_id, salary FROM employees ORDER BY employee_id DESC LIMIT 5;")
-    for row in cursor.fetchall():
-        print(row)
+    print_query(cursor, "SELECT employee_id, salary FROM employees ORDER BY employee_id DESC LIMIT 5;", label=label)
+
+retry_stats = RetryStats()
+
+
+@transactional(max_attempts=5, stats=retry_stats)
+def raise_with_bonus(tx, department_id):
+    # The body of example 3, safe to replay: it only touches the database through tx
+    tx.execute("UPDATE employees SET salary = salary * 1.05 WHERE department_id = %s;", (department_id,))
+    tx.savepoint("before_bonus")
+    tx.execute("UPDATE employees SET salary = salary + 1000 WHERE department_id = %s;", (department_id,))
+    tx.rollback_to("before_bonus")
 
 if __name__ == "__main__":
     conn = None
@@ -82,6 +92,20 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"\nHandled data processing error: {e}")
 
+        # 5. Retrying deadlocks and lock wait timeouts
+        # What: Replay the whole transaction when InnoDB aborts it under contention.
+        # Why: 1213/1205 mean "try again", not "the data is wrong".
+        # How: @transactional replays the body with jittered exponential backoff;
+        #      the contention demo compares committed transactions/sec without and with retry.
+        #      The SELECTs above left a transaction open (autocommit is off); ending it first makes
+        #      raise_with_bonus its own transaction instead of a savepoint inside that one.
+        conn.rollback()
+        raise_with_bonus(conn, 10)
+        print_salaries(cursor, label="After retry-safe raise (5% again, bonus rolled back):")
+        print(f"Retry counters: {retry_stats.snapshot()}")
+        print("\nContention demo (8 threads locking the same rows in random order):")
+        contention_demo(get_connection, threads=8, transactions=20)
+
     except Exception as e:
         print(f"Fatal error: {e}")
     finally:
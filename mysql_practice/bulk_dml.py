@@ -0,0 +1,240 @@
+"""
+Chunked, Throttled Bulk DML (MySQL)
+- Split one big UPDATE/DELETE into primary-key range chunks, each committed on its own
+- Adapt the chunk size to a target duration and sleep when replicas lag or sessions wait on locks
+- Checkpoint after every chunk so an interrupted run resumes where it stopped
+- Report progress and rows/sec
+
+What: chunked_update() / chunked_delete() behave like
+      UPDATE t SET ... WHERE <cond> / DELETE FROM t WHERE <cond>, run as many short transactions.
+Why: One statement over a large table holds its row locks until commit (minutes), builds a
+     huge undo log and arrives at replicas as one long event, so they fall behind.
+How: Chunk boundaries walk the primary key (keyset: WHERE pk >= lo ... LIMIT 1 OFFSET n),
+     so every chunk touches at most n index entries whatever <cond> matches:
+         UPDATE t SET ... WHERE pk >= lo AND pk < hi AND (<cond>); COMMIT
+     The upper bound is fixed at the start (MAX(pk)), so rows inserted meanwhile are not chased.
+     Note: the statement is applied per chunk, so it must give the same result when split
+     (SET col = expr of the row's own columns, not of other rows in the table).
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import json
+import time
+import hashlib
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+import mysql.connector
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+class Throttle:
+    """
+    Decides how long to pause between chunks.
+    - duty_cycle: fraction of wall time spent running chunks (0.5 -> sleep as long as the chunk took)
+    - replicas: connections to replicas; pause while Seconds_Behind_Source > max_lag
+    - max_lock_waits: pause while more InnoDB transactions than this wait on a lock
+    """
+
+    def __init__(self, connection, replicas=(), max_lag=1.0, max_lock_waits=0,
+                 duty_cycle=0.8, max_pause=30.0):
+        self.connection = connection
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.max_lock_waits = max_lock_waits
+        self.duty_cycle = duty_cycle
+        self.max_pause = max_pause
+
+    def replication_lag(self):
+        """Largest Seconds_Behind_Source over the replicas (None if replication is not running)."""
+        worst = 0.0
+        for replica in self.replicas:
+            cursor = replica.cursor(dictionary=True)
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except mysql.connector.Error:
+                cursor.execute("SHOW SLAVE STATUS")  # MySQL < 8.0.22
+            row = cursor.fetchone()
+            cursor.close()
+            if row is None:
+                continue
+            lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+            if lag is None:
+                return None
+            worst = max(worst, float(lag))
+        return worst
+
+    def lock_waits(self):
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM information_schema.INNODB_TRX WHERE trx_state = 'LOCK WAIT'")
+        waiting = cursor.fetchone()[0]
+        cursor.close()
+        return int(waiting)
+
+    def pause(self, chunk_seconds):
+        """Sleep after a chunk; returns the seconds slept."""
+        slept = chunk_seconds * (1 - self.duty_cycle) / self.duty_cycle
+        time.sleep(slept)
+        backoff = 0.1
+        # Keep waiting (exponential backoff) while the server is under pressure
+        while slept < self.max_pause:
+            lag = self.replication_lag() if self.replicas else 0.0
+            overloaded = lag is None or lag > self.max_lag or self.lock_waits() > self.max_lock_waits
+            if not overloaded:
+                break
+            time.sleep(backoff)
+            slept += backoff
+            backoff = min(backoff * 2, 5.0)
+        return slept
+
+
+class BulkDML:
+    """
+    One chunked UPDATE or DELETE job.
+
+    Example:
+        job = BulkDML(conn, 'employees', 'employee_id',
+                      "UPDATE employees SET salary = salary * 1.1", where="department_id = %s", params=(10,))
+        job.run()
+    """
+
+    def __init__(self, connection, table, pk, statement, where='1 = 1', params=(), chunk_size=1000,
+                 target_seconds=0.5, min_chunk=100, max_chunk=50_000, throttle=None,
+                 checkpoint_file=None, progress=print):
+        self.connection = connection
+        self.table = table
+        self.pk = pk
+        self.statement = statement
+        self.where = where
+        self.params = tuple(params)
+        self.chunk_size = chunk_size
+        self.target_seconds = target_seconds
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.throttle = throttle
+        self.checkpoint_file = checkpoint_file
+        self.progress = progress
+
+    # --- checkpoints --------------------------------------------------------
+
+    @property
+    def job_id(self):
+        text = json.dumps([self.table, self.pk, self.statement, self.where, [str(p) for p in self.params]])
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_file or not os.path.exists(self.checkpoint_file):
+            return None
+        with open(self.checkpoint_file, 'r', encoding='utf-8') as file:
+            return json.load(file).get(self.job_id)
+
+    def _save_checkpoint(self, state):
+        if not self.checkpoint_file:
+            return
+        jobs = {}
+        if os.path.exists(self.checkpoint_file):
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as file:
+                jobs = json.load(file)
+        if state is None:
+            jobs.pop(self.job_id, None)
+        else:
+            jobs[self.job_id] = state
+        with open(self.checkpoint_file + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(jobs, file, default=str)
+        os.replace(self.checkpoint_file + '.tmp', self.checkpoint_file)
+
+    # --- chunking -------------------------------------------------------------
+
+    def _fetch_one(self, cursor, sql, params=()):
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _next_bound(self, cursor, lo, size, last):
+        # The size-th key at or after lo, read from the primary key index only
+        return self._fetch_one(cursor,
+            f"SELECT {self.pk} FROM {self.table} WHERE {self.pk} >= %s AND {self.pk} <= %s "
+            f"ORDER BY {self.pk} LIMIT 1 OFFSET %s", (lo, last, size))
+
+    def run(self):
+        """Run (or resume) the job; returns a summary dict."""
+        cursor = self.connection.cursor()
+        state = self._load_checkpoint()
+        if state is None:
+            first = self._fetch_one(cursor, f"SELECT MIN({self.pk}) FROM {self.table}")
+            last = self._fetch_one(cursor, f"SELECT MAX({self.pk}) FROM {self.table}")
+            state = {'next': first, 'last': last, 'first': first, 'rows': 0, 'chunks': 0, 'seconds': 0.0}
+            self.connection.commit()  # end the snapshot used for the bounds
+        elif self.progress:
+            self.progress(f"Resuming {self.table} at {self.pk} >= {state['next']} ({state['rows']} rows done)")
+
+        size = self.chunk_size
+        started = time.perf_counter()
+        while state['next'] is not None and state['next'] <= state['last']:
+            lo = state['next']
+            hi = self._next_bound(cursor, lo, size, state['last'])
+            chunk_start = time.perf_counter()
+            if hi is None:
+                range_sql, range_params = f"{self.pk} >= %s AND {self.pk} <= %s", (lo, state['last'])
+            else:
+                range_sql, range_params = f"{self.pk} >= %s AND {self.pk} < %s", (lo, hi)
+            cursor.execute(f"{self.statement} WHERE {range_sql} AND ({self.where})", range_params + self.params)
+            affected = cursor.rowcount
+            self.connection.commit()
+            elapsed = time.perf_counter() - chunk_start
+
+            state['next'] = hi
+            state['rows'] += max(affected, 0)
+            state['chunks'] += 1
+            state['seconds'] += elapsed
+            self._save_checkpoint(state if hi is not None else None)
+            self._report(state, lo, hi, affected, elapsed, size)
+
+            # Aim every chunk at target_seconds: grow fast chunks, shrink slow ones (at most 2x per step)
+            factor = min(2.0, max(0.5, self.target_seconds / max(elapsed, 1e-6)))
+            size = int(min(self.max_chunk, max(self.min_chunk, size * factor)))
+            if self.throttle is not None and hi is not None:
+                self.throttle.pause(elapsed)
+        cursor.close()
+        wall = time.perf_counter() - started
+        return {'rows': state['rows'], 'chunks': state['chunks'], 'seconds': round(wall, 3),
+                'rows_per_sec': round(state['rows'] / wall, 1) if wall > 0 else None}
+
+    def _report(self, state, lo, hi, affected, elapsed, size):
+        if not self.progress:
+            return
+        done = ''
+        if isinstance(lo, int) and isinstance(state['last'], int) and state['last'] > state['first']:
+            fraction = 1.0 if hi is None else (hi - state['first']) / (state['last'] - state['first'] + 1)
+            done = f" {100 * fraction:5.1f}%"
+        rate = state['rows'] / state['seconds'] if state['seconds'] > 0 else 0.0
+        self.progress(f"chunk {state['chunks']}:{done} {self.pk} [{lo}, {'end' if hi is None else hi}) "
+                      f"rows={affected} size={size} {elapsed:.3f}s total={state['rows']} ({rate:,.0f} rows/s)")
+
+
+def chunked_update(connection, table, pk, set_sql, where='1 = 1', params=(), **options):
+    """UPDATE table SET <set_sql> WHERE <where>, in primary-key chunks. set_sql has no params."""
+    return BulkDML(connection, table, pk, f"UPDATE {table} SET {set_sql}", where, params, **options).run()
+
+
+def chunked_delete(connection, table, pk, where='1 = 1', params=(), **options):
+    """DELETE FROM table WHERE <where>, in primary-key chunks."""
+    return BulkDML(connection, table, pk, f"DELETE FROM {table}", where, params, **options).run()
+
+
+if __name__ == "__main__":
+    # Example: the bulk UPDATE of 09_modifying_data.py, in chunks of 5 departments
+    with get_connection() as conn:
+        print(chunked_update(conn, 'departments', 'department_id', 'location_id = 9999',
+                             where='department_id > %s', params=(200,), chunk_size=5,
+                             throttle=Throttle(conn),
+                             checkpoint_file=os.path.join(os.path.dirname(__file__), '.bulk_dml.json')))
@@ -0,0 +1,138 @@
+"""
+Decorrelating Correlated Subqueries (MySQL)
+- Rewrite "value compared to an aggregate of its own group" into one grouped derived table + join
+  (or a window function)
+- Rewrite "EXISTS a matching row in the same group" into a semi-join against a DISTINCT derived table
+- Check with EXPLAIN that no DEPENDENT SUBQUERY is left
+
+What: A correlated subquery can be evaluated once per outer row, costing O(n x group size).
+Why: The rewrites compute every group once, so the whole query is O(n).
+How: Builders return (sql, params) pairs for the two predicate shapes used in 06_subqueries_apply.py.
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+import mysql.connector
+
+COMPARISON_OPERATORS = ('>', '>=', '<', '<=', '=', '<>')
+AGGREGATES = ('AVG', 'SUM', 'MIN', 'MAX', 'COUNT')
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+def _check(value, allowed, what):
+    # Identifiers and operators are spliced into SQL, so only accept known ones.
+    if value not in allowed:
+        raise ValueError(f"Unsupported {what}: {value!r} (expected one of {allowed})")
+
+
+def group_aggregate_comparison_sql(table, value_col, group_col, aggregate='AVG', op='>', strategy='join'):
+    """
+    Rewrite of:
+        SELECT * FROM t o WHERE o.value op (SELECT agg(value) FROM t i WHERE i.grp = o.grp)
+    strategy='join':   one GROUP BY derived table joined back on the group key
+    strategy='window': agg(value) OVER (PARTITION BY grp), filtered in an outer query
+                       (the result also carries the group_value column)
+    Rows with a NULL group key see an empty group, as in the correlated form: AVG/SUM/MIN/MAX
+    are NULL there (the row never matches) and COUNT is 0, so COUNT keeps those rows via a
+    LEFT JOIN + COALESCE (join) or a CASE (window).
+    """
+    _check(aggregate.upper(), AGGREGATES, 'aggregate')
+    _check(op, COMPARISON_OPERATORS, 'operator')
+    aggregate = aggregate.upper()
+    if strategy == 'join':
+        if aggregate == 'COUNT':
+            join, group_value = 'LEFT JOIN', 'COALESCE(g.group_value, 0)'
+        else:
+            join, group_value = 'JOIN', 'g.group_value'
+        sql = (f"SELECT o.* FROM {table} o "
+               f"{join} (SELECT {group_col}, {aggregate}({value_col}) AS group_value "
+               f"FROM {table} GROUP BY {group_col}) g ON g.{group_col} = o.{group_col} "
+               f"WHERE o.{value_col} {op} {group_value};")
+    elif strategy == 'window':
+        if aggregate == 'COUNT':
+            # The NULL partition is a group of its own to a window function: count it as empty
+            group_value = (f"CASE WHEN o.{group_col} IS NULL THEN 0 "
+                           f"ELSE COUNT({value_col}) OVER (PARTITION BY {group_col}) END")
+            where = ''
+        else:
+            group_value = f"{aggregate}({value_col}) OVER (PARTITION BY {group_col})"
+            where = f" WHERE o.{group_col} IS NOT NULL"
+        sql = (f"SELECT w.* FROM ("
+               f"SELECT o.*, {group_value} AS group_value "
+               f"FROM {table} o{where}) w "
+               f"WHERE w.{value_col} {op} w.group_value;")
+    else:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    return sql, ()
+
+
+def exists_in_group_sql(table, group_col, predicate, params=()):
+    """
+    Rewrite of:
+        SELECT * FROM t o WHERE EXISTS (SELECT 1 FROM t i WHERE i.grp = o.grp AND <predicate on i>)
+    into a join against the DISTINCT groups that satisfy the predicate (a semi-join).
+    - predicate: SQL on the inner table's columns, with %s placeholders for params
+    """
+    sql = (f"SELECT o.* FROM {table} o "
+           f"JOIN (SELECT DISTINCT {group_col} FROM {table} WHERE {predicate}) g "
+           f"ON g.{group_col} = o.{group_col};")
+    return sql, tuple(params)
+
+
+def dependent_subqueries(cursor, query, params=()):
+    """
+    What: EXPLAIN the query and return the plan rows still evaluated per outer row.
+    Why: MySQL marks them with select_type DEPENDENT SUBQUERY / DEPENDENT UNION.
+    """
+    cursor.execute(f"EXPLAIN {query}", params)
+    plan = cursor.fetchall()
+    select_type = (lambda row: row['select_type']) if plan and isinstance(plan[0], dict) else (lambda row: row[1])
+    return [row for row in plan if 'DEPENDENT' in (select_type(row) or '').upper()]
+
+
+def run_decorrelated(cursor, query, params=()):
+    """Run a rewritten query after checking with EXPLAIN that it is no longer correlated."""
+    dependent = dependent_subqueries(cursor, query, params)
+    if dependent:
+        raise RuntimeError(f"Rewrite did not take, plan still has dependent subqueries: {dependent}")
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+
+if __name__ == "__main__":
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        # 1. Correlated form: EXPLAIN shows a DEPENDENT SUBQUERY (or the optimizer already rewrote it)
+        correlated = '''SELECT * FROM employees e1 WHERE salary > (
+                            SELECT AVG(salary) FROM employees e2 WHERE e2.department_id = e1.department_id)'''
+        print("1. Dependent subqueries in the correlated form:", len(dependent_subqueries(cursor, correlated)))
+
+        # 2. Grouped derived table + join
+        sql, params = group_aggregate_comparison_sql('employees', 'salary', 'department_id')
+        print("\n2. Employees earning more than department average (derived table + join):")
+        for row in run_decorrelated(cursor, sql, params):
+            print(row)
+
+        # 3. Window-function variant
+        sql, params = group_aggregate_comparison_sql('employees', 'salary', 'department_id', strategy='window')
+        print("\n3. Employees earning more than department average (window function):")
+        for row in run_decorrelated(cursor, sql, params):
+            print(row)
+
+        # 4. EXISTS rewritten as a semi-join
+        sql, params = exists_in_group_sql('employees', 'department_id', 'job_id LIKE %s', ('%MAN%',))
+        print("\n4. Employees in departments with a manager (semi-join):")
+        for row in run_decorrelated(cursor, sql, params):
+            print(row)
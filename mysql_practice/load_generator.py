@@ -0,0 +1,346 @@
+"""
+Concurrent Load Generator for hr_db (MySQL)
+- A weighted workload mix built from the practice queries: point lookups (02), joins (03),
+  aggregates (05) and DML (09)
+- Closed loop (each worker sends its next request when the previous one returns) or open loop
+  at a target QPS (requests are scheduled, whether or not earlier ones have finished)
+- Worker threads or processes; latency histograms corrected for coordinated omission
+- sweep(): throughput vs latency as concurrency rises, as a table and optionally a PNG
+
+What: Show how the HR schema behaves when many clients use it at once.
+Why: A single script run measures one request on an idle server. Under concurrency requests
+     queue for locks, the buffer pool and CPUs, and latency grows long before throughput stops
+     growing. Naive load testers also hide that queueing: a worker stuck on a slow request
+     does not send the requests it was due to send meanwhile, so the slow period is recorded
+     once instead of for every request that would have waited ("coordinated omission").
+How: - Every operation of WORKLOAD calls a practice function (or the practice SQL) with
+       random keys; weights set the mix, --mix overrides them
+     - Open loop: worker k of n owns the request slots k, k + n, ... of a global schedule at
+       the target QPS. Latency is measured from the slot's intended start, so time spent
+       waiting behind a slow request counts ('corrected'), next to the service time alone
+       ('service')
+     - Closed loop: there is no schedule; with --expected-interval-ms a response slower than
+       the interval also records the requests that would have been sent meanwhile
+       (value - interval, value - 2 * interval, ...), as HdrHistogram does
+     - LatencyHistogram is log-linear (each power of two split into 32 linear buckets, < 3%
+       relative error) and mergeable, so workers in other processes send back histograms,
+       not samples
+
+Usage:
+    python mysql_practice/load_generator.py --concurrency 1,2,4,8,16 --duration 10
+    python mysql_practice/load_generator.py --concurrency 8 --qps 500 --processes --plot curve.png
+
+Note: the DML operation inserts, renames and deletes a 'Load Test Dept' department in one
+      transaction (as 09 does), so the data is unchanged afterwards. Every other operation runs
+      in autocommit mode, one transaction per statement, as a web application's reads would.
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import time
+import math
+import random
+import argparse
+import importlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+import mysql.connector
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+class LatencyHistogram:
+    """Latencies in microseconds, log-linear buckets; histograms with equal sub_bits are mergeable."""
+
+    def __init__(self, sub_bits=5):
+        self.sub_bits = sub_bits
+        self.counts = {}
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def _bucket(self, value):
+        # Values below 2 ** (sub_bits + 1) are exact; above, the lowest bits are dropped
+        shift = max(value.bit_length() - self.sub_bits - 1, 0)
+        return shift, value >> shift
+
+    def record(self, value_us, count=1):
+        value = max(int(value_us), 0)
+        key = self._bucket(value)
+        self.counts[key] = self.counts.get(key, 0) + count
+        self.total += count
+        self.sum += value * count
+        self.max = max(self.max, value)
+
+    def record_corrected(self, value_us, expected_interval_us):
+        """record(), plus the requests a closed-loop client did not send while waiting."""
+        self.record(value_us)
+        if not expected_interval_us or expected_interval_us <= 0:
+            return
+        missing = value_us - expected_interval_us
+        while missing >= expected_interval_us:
+            self.record(missing)
+            missing -= expected_interval_us
+
+    def merge(self, other):
+        if other.sub_bits != self.sub_bits:
+            raise ValueError("Histograms with different precision cannot be merged")
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, p):
+        """Highest value in the bucket holding the p-th percentile (microseconds)."""
+        if not self.total:
+            return 0
+        rank = max(math.ceil(p / 100 * self.total), 1)
+        seen = 0
+        for shift, mantissa in sorted(self.counts, key=lambda key: key[1] << key[0]):
+            seen += self.counts[(shift, mantissa)]
+            if seen >= rank:
+                return min(((mantissa + 1) << shift) - 1, self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.sum / self.total if self.total else 0
+
+
+# --- workload ---------------------------------------------------------------------
+
+def _select():
+    return importlib.import_module('mysql_practice.02_select_queries')
+
+
+def _joins():
+    return importlib.import_module('mysql_practice.03_joins')
+
+
+def _aggregate(sql):
+    def operation(cursor, keys, rng):
+        cursor.execute(sql)
+        return cursor.fetchall()
+    return operation
+
+
+def _department_cycle(cursor, keys, rng):
+    # 09 steps 1-3 in one transaction: INSERT, UPDATE, DELETE of a scratch department
+    name = f"Load Test Dept {rng.randrange(10 ** 9)}"
+    cursor.execute("START TRANSACTION")  # the worker connection is in autocommit mode
+    cursor.execute("INSERT INTO departments (department_name, location_id) VALUES (%s, %s)", (name, 1700))
+    cursor.execute("UPDATE departments SET department_name = %s WHERE department_name = %s",
+                   (name + ' (updated)', name))
+    cursor.execute("DELETE FROM departments WHERE department_name = %s", (name + ' (updated)',))
+    cursor.execute("COMMIT")  # operations only get the cursor
+
+
+# name -> (source module, weight, operation(cursor, keys, rng)); keys: employee/department ids
+WORKLOAD = {
+    'employee_by_id': ('02', 30, lambda c, k, r: _select().select_employee_by_id(c, r.choice(k['employees']))),
+    'employees_by_department': ('02', 15, lambda c, k, r: _select().select_employees_by_department(c, r.choice(k['departments']))),
+    'employees_by_job_title': ('02', 5, lambda c, k, r: _select().select_employees_by_job_title(c, 'Manager')),
+    'join_departments': ('03', 8, lambda c, k, r: _joins().inner_join_employees_departments(c)),
+    'join_managers': ('03', 5, lambda c, k, r: _joins().self_join_employees_managers(c)),
+    'join_locations': ('03', 5, lambda c, k, r: _joins().multi_table_join(c)),
+    'reporting_chain': ('03', 5, lambda c, k, r: _joins().recursive_reporting_chain(c, r.choice(k['employees']))),
+    'agg_by_department': ('05', 7, _aggregate(
+        "SELECT department_id, COUNT(*) AS num_employees, AVG(salary) AS avg_salary "
+        "FROM employees GROUP BY department_id")),
+    'agg_totals': ('05', 5, _aggregate(
+        "SELECT COUNT(*), SUM(salary), AVG(salary), MIN(salary), MAX(salary) FROM employees")),
+    'agg_top2_per_department': ('05', 5, _aggregate(
+        "SELECT * FROM (SELECT employee_id, department_id, salary, ROW_NUMBER() OVER "
+        "(PARTITION BY department_id ORDER BY salary DESC) AS rnk FROM employees) t WHERE rnk <= 2")),
+    'dml_department_cycle': ('09', 10, _department_cycle),
+}
+
+
+def parse_mix(text):
+    """'employee_by_id=50,dml_department_cycle=50' -> {name: weight}; None = WORKLOAD weights."""
+    if not text:
+        return {name: weight for name, (_, weight, _) in WORKLOAD.items()}
+    mix = {}
+    for entry in text.split(','):
+        name, _, weight = entry.partition('=')
+        if name.strip() not in WORKLOAD:
+            raise ValueError(f"Unknown operation {name!r}; choose from {', '.join(WORKLOAD)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def _keys(cursor):
+    cursor.execute("SELECT employee_id FROM employees")
+    employees = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT department_id FROM departments")
+    departments = [row[0] for row in cursor.fetchall()]
+    return {'employees': employees, 'departments': departments}
+
+
+# --- workers ----------------------------------------------------------------------
+
+def run_worker(worker, workers, mix, duration, qps=None, warmup=0.0, start_at=None,
+               expected_interval_ms=None, seed=None):
+    """
+    One worker's share of the load (runs in a thread or a process).
+    Returns {'service': hist, 'corrected': hist, 'ops': {name: n}, 'errors': {name: n}}.
+    """
+    rng = random.Random(None if seed is None else seed + worker)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    service, corrected = LatencyHistogram(), LatencyHistogram()
+    ops, errors = {name: 0 for name in names}, {}
+    expected_us = expected_interval_ms * 1000 if expected_interval_ms else None
+
+    connection = get_connection()
+    # Autocommit: every read is its own transaction with a fresh snapshot. Without it the first
+    # SELECT opens a transaction that only the DML operation ends, so a read-only mix would
+    # measure one REPEATABLE READ snapshot held for the whole run (and hold back purge)
+    connection.autocommit = True
+    cursor = connection.cursor()
+    keys = _keys(cursor)
+    # start_at is wall-clock time shared by every worker; the loop uses the monotonic clock
+    start = time.perf_counter() + max((start_at or time.time()) - time.time(), 0)
+    measure_from = start + warmup
+    stop = measure_from + duration
+    interval = workers / qps if qps else None
+    slot = 0
+    try:
+        while True:
+            # Open loop: the next slot of this worker in the global schedule
+            intended = start + (worker / qps) + slot * interval if qps else time.perf_counter()
+            if intended >= stop:
+                break
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            slot += 1
+            name = rng.choices(names, weights)[0]
+            began = time.perf_counter()
+            try:
+                WORKLOAD[name][2](cursor, keys, rng)
+                failed = False
+            except mysql.connector.Error:
+                connection.rollback()
+                failed = True
+            ended = time.perf_counter()
+            if began < measure_from:
+                continue  # warm-up: caches, connection and statement setup
+            if failed:
+                errors[name] = errors.get(name, 0) + 1
+                continue
+            ops[name] += 1
+            service.record((ended - began) * 1e6)
+            if qps:
+                corrected.record((ended - intended) * 1e6)
+            else:
+                corrected.record_corrected((ended - began) * 1e6, expected_us)
+    finally:
+        cursor.close()
+        connection.close()
+    return {'service': service, 'corrected': corrected, 'ops': ops, 'errors': errors}
+
+
+def run_load(concurrency, mix=None, duration=10.0, qps=None, processes=False, warmup=1.0,
+             expected_interval_ms=None, seed=None):
+    """Run concurrency workers and merge their results; returns a summary dict."""
+    mix = mix or parse_mix(None)
+    start_at = time.time() + 0.5  # time for every worker to connect before the first slot
+    Executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with Executor(max_workers=concurrency) as pool:
+        futures = [pool.submit(run_worker, worker, concurrency, mix, duration, qps, warmup, start_at,
+                               expected_interval_ms, seed) for worker in range(concurrency)]
+        results = [future.result() for future in futures]
+
+    service, corrected = LatencyHistogram(), LatencyHistogram()
+    ops, errors = {}, {}
+    for result in results:
+        service.merge(result['service'])
+        corrected.merge(result['corrected'])
+        for name, count in result['ops'].items():
+            ops[name] = ops.get(name, 0) + count
+        for name, count in result['errors'].items():
+            errors[name] = errors.get(name, 0) + count
+    return {
+        'concurrency': concurrency,
+        'target_qps': qps,
+        'throughput': service.total / duration,
+        'service': service,
+        'corrected': corrected,
+        'ops': ops,
+        'errors': errors,
+    }
+
+
+def sweep(levels, **options):
+    """run_load() at each concurrency level: the throughput vs latency curve."""
+    return [run_load(level, **options) for level in levels]
+
+
+def print_curve(summaries):
+    # Latencies in ms; pNN/max are corrected, 'svc p99' is the service time alone
+    header = ' '.join(f"{'p' + format(p, 'g'):>8}" for p in PERCENTILES)
+    print(f"{'workers':>7} {'target':>7} {'ops/s':>9} {'errors':>6} {header} {'max':>8} {'svc p99':>8}")
+    for s in summaries:
+        values = ' '.join(f"{s['corrected'].percentile(p) / 1000:>8.2f}" for p in PERCENTILES)
+        target = f"{s['target_qps']:g}" if s['target_qps'] else 'closed'
+        print(f"{s['concurrency']:>7} {target:>7} {s['throughput']:>9.1f} {sum(s['errors'].values()):>6} "
+              f"{values} {s['corrected'].max / 1000:>8.2f} {s['service'].percentile(99) / 1000:>8.2f}")
+
+
+def plot_curve(summaries, path):
+    """Throughput (x) vs p50/p99 corrected latency (y), one point per concurrency level."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    throughput = [s['throughput'] for s in summaries]
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+    for p in (50, 99):
+        ax.plot(throughput, [s['corrected'].percentile(p) / 1000 for s in summaries], marker='o', label=f"p{p}")
+    for s in summaries:
+        ax.annotate(str(s['concurrency']), (s['throughput'], s['corrected'].percentile(99) / 1000),
+                    textcoords='offset points', xytext=(4, 4), fontsize=8)
+    ax.set_xlabel('throughput (ops/s)')
+    ax.set_ylabel('latency (ms, coordinated-omission corrected)')
+    ax.set_title('hr_db: throughput vs latency by concurrency')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Concurrent load against hr_db from the practice queries.')
+    parser.add_argument('--concurrency', default='1,2,4,8', help='comma-separated worker counts to sweep')
+    parser.add_argument('--duration', type=float, default=10.0, help='measured seconds per level')
+    parser.add_argument('--warmup', type=float, default=1.0, help='unmeasured seconds before each level')
+    parser.add_argument('--qps', type=float, help='open loop at this total rate (default: closed loop)')
+    parser.add_argument('--expected-interval-ms', type=float,
+                        help='closed loop: correct for requests not sent while waiting')
+    parser.add_argument('--processes', action='store_true', help='worker processes instead of threads')
+    parser.add_argument('--mix', help="weights, e.g. 'employee_by_id=70,dml_department_cycle=30'")
+    parser.add_argument('--seed', type=int, help='random seed for repeatable key/operation choices')
+    parser.add_argument('--plot', help='write the throughput/latency curve to this PNG file')
+    args = parser.parse_args()
+
+    summaries = sweep([int(level) for level in args.concurrency.split(',')],
+                      mix=parse_mix(args.mix), duration=args.duration, qps=args.qps,
+                      processes=args.processes, warmup=args.warmup,
+                      expected_interval_ms=args.expected_interval_ms, seed=args.seed)
+    print_curve(summaries)
+    if args.plot:
+        plot_curve(summaries, args.plot)
+        print(f"Curve written to {args.plot}")
@@ -0,0 +1,185 @@
+"""
+Partition Pruning Harness (MySQL)
+- Builds three copies of employees: unpartitioned, RANGE by hire year, HASH by department_id
+- Runs practice-style queries on each, checks EXPLAIN's `partitions` column for pruning
+- Reports the median latency of every layout next to the unpartitioned one
+
+What: Evidence, per query, that a partitioned layout (scripts/partitioning.py) is worth having.
+Why: Partitioning only helps the queries the optimizer can prune. A date range on hire_date
+     prunes the RANGE layout. YEAR(hire_date) = 1997 does not: the column is wrapped in a
+     function. department_id = 5 or IN (...) prunes the HASH layout, and a range on
+     department_id does not. EXPLAIN shows which partitions are read, so no guessing.
+How: - The copies are built next to employees (employees_flat, employees_by_year,
+       employees_by_dept) with --scale times the rows of hr_data.sql, so the timings compare
+       the same data and also mean something on a 40-row sample
+     - Each query is a template over {table}; EXPLAIN lists the partitions it reads and
+       information_schema.PARTITIONS says how many there are
+     - Every query runs --repeat times per layout; the median is reported
+
+Usage: python mysql_practice/partition_pruning.py [--scale 500] [--repeat 20] [--keep]
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import time
+import argparse
+import statistics
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from scripts.partitioning import employees_ddl
+import mysql.connector
+
+LAYOUTS = {
+    'flat': 'employees_flat',
+    'range': 'employees_by_year',
+    'hash': 'employees_by_dept',
+}
+
+# (label, query over {table}, layouts expected to prune it)
+QUERIES = [
+    ("Hires 1995-1996 (hire_date range)",
+     "SELECT COUNT(*), AVG(salary) FROM {table} WHERE hire_date >= '1995-01-01' AND hire_date < '1997-01-01'",
+     {'range'}),
+    ("Hires in 1997 via YEAR(hire_date)",
+     "SELECT COUNT(*), AVG(salary) FROM {table} WHERE YEAR(hire_date) = 1997",
+     set()),
+    ("Hired before 1990, top salaries",
+     "SELECT employee_id, salary FROM {table} WHERE hire_date < '1990-01-01' ORDER BY salary DESC LIMIT 5",
+     {'range'}),
+    ("Department 5 (02: select_employees_by_department)",
+     "SELECT * FROM {table} WHERE department_id = 5",
+     {'hash'}),
+    ("Departments 3 and 9 payroll",
+     "SELECT department_id, COUNT(*), SUM(salary) FROM {table} WHERE department_id IN (3, 9) GROUP BY department_id",
+     {'hash'}),
+    ("Department 8 hires since 1997",
+     "SELECT COUNT(*) FROM {table} WHERE department_id = 8 AND hire_date >= '1997-01-01'",
+     {'range', 'hash'}),
+    ("Per-department counts (05, no filter)",
+     "SELECT department_id, COUNT(*), AVG(salary) FROM {table} GROUP BY department_id",
+     set()),
+]
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+def build_layouts(cursor, scale=1):
+    """(Re)create the three copies of employees, each holding scale copies of its rows."""
+    # What: Same rows in every layout; copy k gets employee_id + k * id_span so keys stay unique.
+    cursor.execute("SELECT MAX(employee_id) + 1 FROM employees")
+    id_span = cursor.fetchone()[0] or 1
+    columns = ("first_name, last_name, email, phone_number, hire_date, job_id, salary, "
+               "manager_id, department_id")
+    for layout, table in LAYOUTS.items():
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        if layout == 'flat':
+            cursor.execute(f"CREATE TABLE {table} LIKE employees")  # same indexes, no foreign keys
+            # After setup_database.py --partition, LIKE copies the partitioning too
+            if partition_count(cursor, table) > 1:
+                cursor.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+        else:
+            cursor.execute(employees_ddl(layout, table=table))
+        for copy in range(scale):
+            cursor.execute(f"INSERT INTO {table} (employee_id, {columns}) "
+                           f"SELECT employee_id + %s, {columns} FROM employees", (copy * id_span,))
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+
+
+def drop_layouts(cursor):
+    for table in LAYOUTS.values():
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def partition_count(cursor, table):
+    cursor.execute("SELECT COUNT(*) FROM information_schema.PARTITIONS "
+                   "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,))
+    return cursor.fetchone()[0]  # 1 for an unpartitioned table (one row, PARTITION_NAME NULL)
+
+
+def explain_partitions(cursor, sql, table):
+    """Partition names EXPLAIN says sql reads from table (None: the table is not partitioned)."""
+    cursor.execute("EXPLAIN " + sql)
+    columns = cursor.column_names
+    used = set()
+    partitioned = False
+    for row in cursor.fetchall():
+        row = dict(zip(columns, row))
+        if row.get('table') != table:
+            continue
+        if row.get('partitions') is not None:
+            partitioned = True
+            used.update(row['partitions'].split(','))
+    return used if partitioned else None
+
+
+def median_ms(cursor, sql, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(sql)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_harness(connection, scale=1, repeat=10, keep=False):
+    """One dict per (query, layout): partitions read/total, pruned, expected, median ms."""
+    cursor = connection.cursor()
+    results = []
+    try:
+        build_layouts(cursor, scale)
+        connection.commit()
+        totals = {layout: partition_count(cursor, table) for layout, table in LAYOUTS.items()}
+        for label, template, expected in QUERIES:
+            flat_ms = None
+            for layout, table in LAYOUTS.items():
+                sql = template.format(table=table)
+                used = explain_partitions(cursor, sql, table)
+                read = totals[layout] if used is None else len(used)
+                ms = median_ms(cursor, sql, repeat)
+                flat_ms = ms if layout == 'flat' else flat_ms
+                results.append({
+                    'query': label, 'layout': layout,
+                    'partitions': sorted(used) if used is not None else None,
+                    'read': read, 'total': totals[layout],
+                    'pruned': read < totals[layout],
+                    'expected': layout in expected,
+                    'ms': ms, 'speedup': flat_ms / ms if ms else None,
+                })
+    finally:
+        if not keep:
+            drop_layouts(cursor)
+        cursor.close()
+    return results
+
+
+def print_report(results):
+    print(f"{'query':<50} {'layout':<6} {'partitions':>10} {'pruned':>7} {'median ms':>10} {'vs flat':>8}")
+    for r in results:
+        mark = 'yes' if r['pruned'] else 'no'
+        if r['pruned'] != r['expected']:
+            mark += ' (!)'  # the optimizer disagrees with the expectation in QUERIES
+        speedup = f"{r['speedup']:.2f}x" if r['speedup'] else '-'
+        print(f"{r['query'][:50]:<50} {r['layout']:<6} {r['read']:>4}/{r['total']:<5} {mark:>7} "
+              f"{r['ms']:>10.2f} {speedup:>8}")
+    surprises = [r for r in results if r['pruned'] != r['expected']]
+    print(f"\n{sum(r['pruned'] for r in results)} pruned scans, {len(surprises)} unexpected")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Check partition pruning and its latency effect.')
+    parser.add_argument('--scale', type=int, default=500, help='copies of the employees rows per layout')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per query and layout')
+    parser.add_argument('--keep', action='store_true', help='keep the layout tables afterwards')
+    args = parser.parse_args()
+    with get_connection() as conn:
+        print_report(run_harness(conn, args.scale, args.repeat, args.keep))
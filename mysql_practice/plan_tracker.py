@@ -0,0 +1,305 @@
+"""
+Query Plan Regression Tracker (MySQL)
+- catalogue(): every literal SELECT/WITH query of the mysql_practice scripts, with parameters
+- capture: EXPLAIN FORMAT=JSON of each query, summarized and fingerprinted, saved as baselines
+- check: the same again, compared with the baselines; regressions are reported (and can fail CI)
+
+What: Notice when MySQL starts running a practice query differently.
+Why: After a MySQL upgrade, new statistics or more rows, the optimizer can change a plan
+     without any error. The correlated subqueries of 06 or the ROW_NUMBER() rankings of
+     05/07 can quietly turn from index lookups into full scans with a filesort, and only
+     get slower.
+How: - The catalogue is read from the source with ast, without running the scripts:
+       cursor.execute('<literal SQL>', params) inside a function (parameter values come
+       from a call of that function with literal arguments, e.g. in print_example_results)
+       and print_query(cursor, '<literal SQL>', params, label=...) calls
+     - The plan JSON is walked for each table access (in join order): access_type, key,
+       rows_examined_per_scan. The walk also collects using_filesort, using_temporary_table,
+       dependent subqueries and the total query_cost
+     - The fingerprint hashes the plan's shape (join order, access types, keys, filesort,
+       temporary, dependent subqueries) and leaves out the estimates, so it changes only
+       when the plan does. Estimates are compared with tolerances (--rows-factor, --cost-factor)
+     - A regression is: a worse access type for a table (ALL is worse than range, which is
+       worse than ref...), a changed join order, a new filesort, temporary table or dependent
+       subquery, or rows/cost growing past the tolerance
+
+Usage:
+    python mysql_practice/plan_tracker.py capture            # write data/plan_baselines.json
+    python mysql_practice/plan_tracker.py check --fail       # exit status 1 on a regression
+In a test suite: assert_no_plan_regressions(cursor) raises AssertionError listing them.
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import re
+import ast
+import json
+import glob
+import hashlib
+import argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+import mysql.connector
+
+PRACTICE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(PRACTICE_DIR, '..', 'data', 'plan_baselines.json')
+# Best to worst, as in the MySQL manual's EXPLAIN join types
+ACCESS_TYPES = ['system', 'const', 'eq_ref', 'ref', 'fulltext', 'ref_or_null', 'index_merge',
+                'unique_subquery', 'index_subquery', 'range', 'index', 'ALL']
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+# --- catalogue ----------------------------------------------------------------------
+
+def _is_query(node):
+    return (isinstance(node, ast.Constant) and isinstance(node.value, str)
+            and re.match(r'\s*(SELECT|WITH)\b', node.value, re.IGNORECASE))
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')[:60]
+
+
+def _module_queries(path):
+    """[(query_id, sql, params)] for one practice script."""
+    prefix = os.path.basename(path)[:2]
+    with open(path, 'r', encoding='utf-8') as file:
+        tree = ast.parse(file.read(), path)
+
+    # Literal-argument calls of each function: values for the %s parameters inside it
+    call_args = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            try:
+                values = [ast.literal_eval(arg) for arg in node.args[1:]]
+            except ValueError:
+                continue
+            call_args.setdefault(node.func.id, values)
+
+    queries = []
+    for function in [n for n in tree.body if isinstance(n, ast.FunctionDef)]:
+        arg_names = [a.arg for a in function.args.args][1:]  # first argument is the cursor
+        try:
+            defaults = [ast.literal_eval(d) for d in function.args.defaults]
+        except ValueError:
+            defaults = []
+        # query = '<literal SQL>' followed by cursor.execute(query, ...)
+        local_sql = {n.targets[0].id: n.value for n in ast.walk(function)
+                     if isinstance(n, ast.Assign) and isinstance(n.targets[0], ast.Name) and _is_query(n.value)}
+        for node in ast.walk(function):
+            if not isinstance(node, ast.Call):
+                continue
+            if isinstance(node.func, ast.Attribute) and node.func.attr == 'execute' and node.args:
+                sql_arg = node.args[0]
+                params_arg = node.args[1] if len(node.args) > 1 else None
+            elif isinstance(node.func, ast.Name) and node.func.id == 'print_query' and len(node.args) > 1:
+                # print_query(cursor, '<literal SQL>', ...) inside a helper such as print_departments()
+                sql_arg = node.args[1]
+                params_arg = node.args[2] if len(node.args) > 2 else {k.arg: k.value for k in node.keywords}.get('params')
+            else:
+                continue
+            sql_node = local_sql.get(sql_arg.id) if isinstance(sql_arg, ast.Name) else sql_arg
+            if sql_node is None or not _is_query(sql_node):
+                continue
+            params = ()
+            if params_arg is not None:
+                values = call_args.get(function.name)
+                if values is None and len(defaults) == len(arg_names):
+                    values = defaults
+                if values is None:
+                    continue  # no literal call to take parameter values from
+                scope = dict(zip(arg_names, values))
+                try:
+                    params = tuple(eval(compile(ast.Expression(params_arg), path, 'eval'), {}, scope))
+                except NameError:
+                    continue  # parameters computed from something other than the arguments
+            queries.append((f"{prefix}:{function.name}", sql_node.value, params))
+
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id == 'print_query' and len(node.args) > 1 and _is_query(node.args[1])):
+            continue
+        keywords = {k.arg: k.value for k in node.keywords}
+        params_node = node.args[2] if len(node.args) > 2 else keywords.get('params')
+        label_node = node.args[3] if len(node.args) > 3 else keywords.get('label')
+        try:
+            params = tuple(ast.literal_eval(params_node)) if params_node is not None else ()
+            label = ast.literal_eval(label_node) if label_node is not None else f"line-{node.lineno}"
+        except ValueError:
+            continue
+        queries.append((f"{prefix}:{_slug(label)}", node.args[1].value, params))
+    return queries
+
+
+def catalogue(pattern=None):
+    """{query_id: (sql, params)} for the numbered mysql_practice scripts (ids matching pattern)."""
+    queries = {}
+    for path in sorted(glob.glob(os.path.join(PRACTICE_DIR, '[0-9][0-9]_*.py'))):
+        for query_id, sql, params in _module_queries(path):
+            if pattern and not re.search(pattern, query_id):
+                continue
+            queries.setdefault(query_id, (' '.join(sql.split()).rstrip(';'), params))
+    return queries
+
+
+# --- plans --------------------------------------------------------------------------
+
+def explain(cursor, sql, params=()):
+    cursor.execute("EXPLAIN FORMAT=JSON " + sql, tuple(params))
+    return json.loads(cursor.fetchone()[0])
+
+
+def summarize(plan):
+    """Shape and estimates of an EXPLAIN FORMAT=JSON document."""
+    tables, flags = [], {'filesort': False, 'temporary': False, 'dependent_subqueries': 0}
+
+    def walk(node):
+        if isinstance(node, dict):
+            if 'table_name' in node:
+                tables.append({
+                    'table': node['table_name'],
+                    'access_type': node.get('access_type'),
+                    'key': node.get('key'),
+                    'rows': float(node.get('rows_examined_per_scan', 0) or 0),
+                })
+            flags['filesort'] |= node.get('using_filesort') is True
+            flags['temporary'] |= node.get('using_temporary_table') is True
+            if node.get('dependent') is True:
+                flags['dependent_subqueries'] += 1
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(plan)
+    cost = plan.get('query_block', {}).get('cost_info', {}).get('query_cost')
+    shape = {
+        'join_order': [t['table'] for t in tables],
+        'access': [[t['table'], t['access_type'], t['key']] for t in tables],
+        **flags,
+    }
+    return {
+        'fingerprint': hashlib.sha256(json.dumps(shape, sort_keys=True).encode('utf-8')).hexdigest()[:16],
+        **shape,
+        'rows': sum(t['rows'] for t in tables),
+        'cost': float(cost) if cost is not None else None,
+    }
+
+
+def capture(cursor, queries):
+    """{query_id: summary} for every catalogued query; EXPLAIN errors are kept as {'error': ...}."""
+    summaries = {}
+    for query_id, (sql, params) in queries.items():
+        try:
+            summaries[query_id] = {'sql': sql, **summarize(explain(cursor, sql, params))}
+        except mysql.connector.Error as e:
+            summaries[query_id] = {'sql': sql, 'error': str(e)}
+    return summaries
+
+
+def compare(baseline, current, rows_factor=2.0, cost_factor=2.0):
+    """[(query_id, problem)] where current is worse than baseline."""
+    problems = []
+    for query_id, now in current.items():
+        before = baseline.get(query_id)
+        if before is None or 'error' in before:
+            continue  # new query: nothing to compare with
+        if 'error' in now:
+            problems.append((query_id, f"EXPLAIN failed: {now['error']}"))
+            continue
+        if now['fingerprint'] == before['fingerprint']:
+            shape_changes = []
+        else:
+            shape_changes = _shape_changes(before, now)
+        problems.extend((query_id, change) for change in shape_changes)
+        if before['rows'] and now['rows'] > before['rows'] * rows_factor:
+            problems.append((query_id, f"rows examined {before['rows']:g} -> {now['rows']:g}"))
+        if before['cost'] and now['cost'] and now['cost'] > before['cost'] * cost_factor:
+            problems.append((query_id, f"query cost {before['cost']:g} -> {now['cost']:g}"))
+    return problems
+
+
+def _shape_changes(before, now):
+    changes = []
+    if before['join_order'] != now['join_order']:
+        changes.append(f"join order {' > '.join(before['join_order'])} -> {' > '.join(now['join_order'])}")
+    old_access = {}
+    for table, access_type, key in before['access']:
+        old_access.setdefault(table, (access_type, key))
+    for table, access_type, key in now['access']:
+        if table not in old_access:
+            continue
+        old_type, old_key = old_access.pop(table)
+        if _rank(access_type) > _rank(old_type):
+            changes.append(f"{table}: access {old_type} ({old_key}) -> {access_type} ({key})")
+    for flag in ('filesort', 'temporary'):
+        if now[flag] and not before[flag]:
+            changes.append(f"now uses {flag}")
+    if now['dependent_subqueries'] > before['dependent_subqueries']:
+        changes.append(f"dependent subqueries {before['dependent_subqueries']} -> {now['dependent_subqueries']}")
+    return changes
+
+
+def _rank(access_type):
+    return ACCESS_TYPES.index(access_type) if access_type in ACCESS_TYPES else -1
+
+
+def load_baselines(path=BASELINE_FILE):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baselines(summaries, path=BASELINE_FILE):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(summaries, file, indent=2, sort_keys=True)
+
+
+def assert_no_plan_regressions(cursor, path=BASELINE_FILE, pattern=None, rows_factor=2.0, cost_factor=2.0):
+    """For a test suite: AssertionError listing every regression against the saved baselines."""
+    problems = compare(load_baselines(path), capture(cursor, catalogue(pattern)), rows_factor, cost_factor)
+    if problems:
+        raise AssertionError("Query plan regressions:\n" + '\n'.join(f"  {q}: {p}" for q, p in problems))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Capture or check EXPLAIN plans of the practice queries.')
+    parser.add_argument('action', choices=['capture', 'check', 'list'])
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON file')
+    parser.add_argument('--only', help='regex on query ids (e.g. "^06:")')
+    parser.add_argument('--rows-factor', type=float, default=2.0, help='allowed growth of rows examined')
+    parser.add_argument('--cost-factor', type=float, default=2.0, help='allowed growth of query cost')
+    parser.add_argument('--fail', action='store_true', help='exit with status 1 when a regression is found')
+    args = parser.parse_args()
+
+    queries = catalogue(args.only)
+    if args.action == 'list':
+        for query_id, (sql, params) in queries.items():
+            print(f"{query_id:<60} {sql[:60]} {params or ''}")
+        sys.exit(0)
+    with get_connection() as conn:
+        cursor = conn.cursor(buffered=True)
+        current = capture(cursor, queries)
+    if args.action == 'capture':
+        save_baselines(current, args.baseline)
+        print(f"{len(current)} plan baselines written to {args.baseline}")
+        sys.exit(0)
+    baseline = load_baselines(args.baseline)
+    problems = compare(baseline, current, args.rows_factor, args.cost_factor)
+    changed = [q for q in current if q in baseline and current[q].get('fingerprint') != baseline[q].get('fingerprint')]
+    new = [q for q in current if q not in baseline]
+    for query_id, problem in problems:
+        print(f"REGRESSION {query_id}: {problem}")
+    print(f"{len(current)} queries: {len(changed)} plans changed, {len(problems)} regressions, "
+          f"{len(new)} without baseline")
+    sys.exit(1 if problems and args.fail else 0)
@@ -0,0 +1,373 @@
+"""
+Result Sinks (MySQL)
+- TableSink: aligned text table, truncated to max_rows rows and max_width characters per cell
+- CsvSink / JsonLinesSink / ArrowSink: CSV, JSON Lines and Arrow IPC files
+- export(): streams a cursor into a sink with fetchmany() and reports rows/sec
+- print_query() / print_rows(): what the practice scripts use instead of `for row in ...: print(row)`
+
+What: One output layer for the practice scripts and for exporting large results.
+Why: `for row in cursor.fetchall(): print(row)` holds the whole result in memory, then makes one
+     print() call (and, on a terminal, one flush) per row. On a large table, the time goes to
+     stdout, not to MySQL.
+How: - export() reads chunk_size rows at a time with fetchmany(), so memory is bounded by the
+       chunk, not the result
+     - Every sink turns a whole chunk into one write() on a stream with a 1 MiB buffer
+       (BUFFER_SIZE); nothing is written per row. stdout gets that buffer too (a line-buffered
+       terminal would otherwise flush on every newline)
+     - TableSink keeps only the first max_rows rows for display and counts the rest
+     - ArrowSink writes one record batch per chunk; its column types come from the first chunk
+       unless a schema is given
+     - The sink is chosen by HR_RESULT_SINK (table, csv, jsonl, arrow). File sinks write one
+       file per labelled query into HR_RESULT_DIR (default results/), e.g.
+       HR_RESULT_SINK=csv python mysql_practice/05_functions_aggregates.py
+
+Usage: python mysql_practice/result_sinks.py "SELECT * FROM employees" --format csv --out employees.csv
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import re
+import io
+import csv
+import json
+import time
+import argparse
+import itertools
+from decimal import Decimal
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+import mysql.connector
+
+BUFFER_SIZE = 1 << 20
+CHUNK_SIZE = 10_000
+SINK = os.environ.get('HR_RESULT_SINK', 'table')
+RESULT_DIR = os.environ.get('HR_RESULT_DIR', 'results')
+MAX_ROWS = int(os.environ.get('HR_RESULT_MAX_ROWS', '50'))
+_unlabelled = itertools.count(1)
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+class ResultSink:
+    """
+    Base class: open(columns), write(rows) once per chunk, close().
+    target: None (stdout), a path (opened with a BUFFER_SIZE buffer) or an open stream.
+    """
+    binary = False
+    extension = ''
+
+    def __init__(self, target=None):
+        self.target = target
+        self.columns = []
+        self.rows = 0
+        self.seconds = 0.0
+        self._started = None
+        self._stream = None
+        self._owned = False
+        self._wrapped = False
+
+    def open(self, columns):
+        self.columns = list(columns)
+        self._started = time.perf_counter()
+        if self.target is None:
+            stdout = sys.stdout
+            if hasattr(stdout, 'buffer'):
+                # Our own BUFFER_SIZE buffer on top of stdout's: detached, not closed, at the end
+                stdout.flush()  # what print() wrote so far comes first
+                stream = io.BufferedWriter(stdout.buffer, buffer_size=BUFFER_SIZE)
+                if not self.binary:
+                    stream = io.TextIOWrapper(stream, encoding=stdout.encoding or 'utf-8', newline='')
+                self._stream = stream
+                self._wrapped = True
+            else:
+                self._stream = stdout  # an in-memory stream (redirect_stdout), nothing to flush
+        elif isinstance(self.target, str):
+            os.makedirs(os.path.dirname(os.path.abspath(self.target)), exist_ok=True)
+            if self.binary:
+                self._stream = open(self.target, 'wb', buffering=BUFFER_SIZE)
+            else:
+                self._stream = open(self.target, 'w', buffering=BUFFER_SIZE, encoding='utf-8', newline='')
+            self._owned = True
+        else:
+            self._stream = self.target
+        self.begin()
+        return self
+
+    def write(self, rows):
+        self.rows += len(rows)
+        self.write_rows(rows)
+
+    def close(self):
+        try:
+            self.end()
+            self._stream.flush()
+        finally:
+            if self._owned:
+                self._stream.close()
+            elif self._wrapped:
+                stream = self._stream.detach()  # TextIOWrapper -> BufferedWriter -> stdout.buffer
+                if not self.binary:
+                    stream = stream.detach()
+                stream.flush()
+            self.seconds = time.perf_counter() - self._started
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else float('inf')
+
+    def summary(self):
+        where = f"{self.target}: " if isinstance(self.target, str) else ''
+        size = f", {os.path.getsize(self.target) / 1e6:.1f} MB" if isinstance(self.target, str) else ''
+        return f"{where}{self.rows} row{'' if self.rows == 1 else 's'} in {self.seconds:.3f} s ({self.rows_per_sec:,.0f} rows/s{size})"
+
+    # --- what a sink implements ------------------------------------------------------
+
+    def begin(self):
+        pass
+
+    def write_rows(self, rows):
+        raise NotImplementedError
+
+    def end(self):
+        pass
+
+
+def _cell(value, max_width):
+    text = 'NULL' if value is None else str(value)
+    text = text.replace('\n', ' ')
+    return text if len(text) <= max_width else text[:max_width - 1] + '~'
+
+
+class TableSink(ResultSink):
+    """Aligned text table of the first max_rows rows; the remaining rows are counted, not kept."""
+    extension = '.txt'
+
+    def __init__(self, target=None, max_rows=MAX_ROWS, max_width=40):
+        super().__init__(target)
+        self.max_rows = max_rows
+        self.max_width = max_width
+        self._shown = []
+
+    def write_rows(self, rows):
+        room = self.max_rows - len(self._shown)
+        if room > 0:
+            self._shown.extend(rows[:room])
+
+    def end(self):
+        if not self.columns:
+            return
+        cells = [[_cell(value, self.max_width) for value in row] for row in self._shown]
+        header = [_cell(column, self.max_width) for column in self.columns]
+        widths = [max([len(header[i])] + [len(row[i]) for row in cells]) for i in range(len(header))]
+        # Numbers right-aligned, as MySQL's client prints them
+        numeric = [bool(self._shown) and all(isinstance(row[i], (int, float, Decimal)) or row[i] is None
+                                             for row in self._shown) for i in range(len(header))]
+        lines = [' | '.join(h.ljust(w) for h, w in zip(header, widths)),
+                 '-+-'.join('-' * w for w in widths)]
+        for row in cells:
+            lines.append(' | '.join(c.rjust(w) if n else c.ljust(w) for c, w, n in zip(row, widths, numeric)))
+        hidden = self.rows - len(self._shown)
+        lines.append(f"({self.rows} row{'' if self.rows == 1 else 's'}{f', {hidden} not shown' if hidden else ''})")
+        self._stream.write('\n'.join(line.rstrip() for line in lines) + '\n')
+
+
+class CsvSink(ResultSink):
+    """CSV with a header row; NULL is an empty field."""
+    extension = '.csv'
+
+    def begin(self):
+        # csv.writer calls write() once per row: it writes into a StringIO, flushed once per chunk
+        self._buffer = io.StringIO(newline='')
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(self.columns)
+        self._drain()
+
+    def write_rows(self, rows):
+        self._writer.writerows(rows)
+        self._drain()
+
+    def _drain(self):
+        self._stream.write(self._buffer.getvalue())
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+
+class JsonLinesSink(ResultSink):
+    """One JSON object per row; DECIMAL and dates as strings, NULL as null."""
+    extension = '.jsonl'
+
+    def begin(self):
+        self._encoder = json.JSONEncoder(default=str, ensure_ascii=False)
+
+    def write_rows(self, rows):
+        encode, columns = self._encoder.encode, self.columns
+        self._stream.write(''.join(encode(dict(zip(columns, row))) + '\n' for row in rows))
+
+
+class ArrowSink(ResultSink):
+    """
+    Arrow IPC file, one record batch per chunk; read it back with pyarrow.ipc.open_file(path).
+    schema: a pyarrow.Schema; by default the types come from the first chunk, with DECIMAL widened
+    to 38 digits; columns that were all NULL (or of mixed types) in the first chunk are stored as strings.
+    """
+    binary = True
+    extension = '.arrow'
+
+    def __init__(self, target=None, schema=None):
+        super().__init__(target)
+        self.schema = schema
+        self._writer = None
+
+    def _infer_schema(self, columns):
+        import pyarrow as pa
+        fields = []
+        for name, values in zip(self.columns, columns):
+            try:
+                arrow_type = pa.array(values).type
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                arrow_type = pa.string()  # mixed Python types (rows built in Python, not by MySQL)
+            if pa.types.is_decimal(arrow_type):
+                arrow_type = pa.decimal128(38, arrow_type.scale)
+            elif pa.types.is_null(arrow_type):
+                arrow_type = pa.string()
+            fields.append(pa.field(name, arrow_type))
+        return pa.schema(fields)
+
+    def write_rows(self, rows):
+        import pyarrow as pa
+        columns = list(zip(*rows))
+        if self._writer is None:
+            self.schema = self.schema or self._infer_schema(columns)
+            self._writer = pa.ipc.new_file(self._stream, self.schema)
+        arrays = []
+        for field, values in zip(self.schema, columns):
+            if pa.types.is_string(field.type):
+                values = [None if v is None else str(v) for v in values]
+            arrays.append(pa.array(values, type=field.type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def end(self):
+        import pyarrow as pa
+        if self._writer is None:  # no rows: a valid file with the column names
+            self.schema = self.schema or pa.schema([pa.field(name, pa.string()) for name in self.columns])
+            self._writer = pa.ipc.new_file(self._stream, self.schema)
+        self._writer.close()
+
+
+SINKS = {
+    'table': TableSink,
+    'csv': CsvSink,
+    'jsonl': JsonLinesSink,
+    'arrow': ArrowSink,
+}
+
+
+def column_names(cursor):
+    names = getattr(cursor, 'column_names', None)
+    if names is None:
+        names = [d[0] for d in cursor.description or ()]
+    return list(names)
+
+
+def export(cursor, sink, query=None, params=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream the cursor's result (after executing query, when given) into sink, chunk_size rows at a
+    time. Plain and dictionary cursors both work. Returns the closed sink (rows, seconds, summary()).
+    """
+    if query is not None:
+        cursor.execute(query, params or ())
+    columns = column_names(cursor)
+    sink.open(columns)
+    try:
+        while columns:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            if isinstance(rows[0], dict):
+                rows = [tuple(row[c] for c in columns) for row in rows]
+            sink.write(rows)
+    finally:
+        sink.close()
+    return sink
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')[:60] or 'result'
+
+
+def default_sink(label=None):
+    """The sink HR_RESULT_SINK selects; file sinks get HR_RESULT_DIR/<script>_<label><ext>."""
+    if SINK == 'table':
+        return TableSink()
+    sink_class = SINKS[SINK]
+    script = os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0]
+    name = f"{_slug(script)}_{_slug(label) if label else f'result_{next(_unlabelled)}'}{sink_class.extension}"
+    return sink_class(os.path.join(RESULT_DIR, name))
+
+
+def print_query(cursor, query, params=None, label=None, sink=None):
+    """Run query and write its result to sink (default_sink(label) when None)."""
+    if label:
+        print(f"\n{label}")
+    sink = export(cursor, sink or default_sink(label), query, params)
+    if isinstance(sink.target, str):
+        print(f"-> {sink.summary()}")
+    return sink
+
+
+class _RowList:
+    """Cursor-like view of rows that were already fetched, for export()."""
+
+    def __init__(self, rows, columns):
+        self._rows = rows
+        self._position = 0
+        self.column_names = columns
+
+    def fetchmany(self, size):
+        chunk = self._rows[self._position:self._position + size]
+        self._position += size
+        return chunk
+
+
+def print_rows(rows, label=None, columns=None, sink=None):
+    """print_query() for a list of rows already fetched (tuples or dicts)."""
+    rows = list(rows)
+    if columns is None:
+        if rows and isinstance(rows[0], dict):
+            columns = list(rows[0])
+        else:
+            columns = [str(i + 1) for i in range(len(rows[0]))] if rows else []
+    if label:
+        print(f"\n{label}")
+    sink = export(_RowList(rows, columns), sink or default_sink(label))
+    if isinstance(sink.target, str):
+        print(f"-> {sink.summary()}")
+    return sink
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export a query result without materializing it.')
+    parser.add_argument('query')
+    parser.add_argument('--format', choices=sorted(SINKS), default='table')
+    parser.add_argument('--out', help='output file (default: stdout)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--max-rows', type=int, default=MAX_ROWS, help='rows shown by --format table')
+    args = parser.parse_args()
+
+    with get_connection() as conn:
+        # Unbuffered cursor: rows arrive from the server as fetchmany() asks for them
+        cursor = conn.cursor()
+        if args.format == 'table':
+            sink = TableSink(args.out, max_rows=args.max_rows)
+        else:
+            sink = SINKS[args.format](args.out)
+        export(cursor, sink, args.query, chunk_size=args.chunk_size)
+        print(sink.summary(), file=sys.stderr)
@@ -0,0 +1,163 @@
+"""
+Stored Routine Registry and Batched CALLs (MySQL)
+- RoutineRegistry: deploy procedures/functions only when their definition changed
+- call_many(): many CALLs in one multi-statement round trip, result sets split per call
+
+What: 10_tsql_programming.py without DROP + CREATE on every run and one round trip per CALL.
+Why: DROP/CREATE PROCEDURE takes a metadata lock, invalidates every session's cached copy
+     of the routine (sp cache) and briefly leaves callers with "PROCEDURE does not exist".
+     Calling employees_in_department once per department costs one network round trip each.
+How: - The registry hashes each definition (whitespace-normalized) and stores the hash in the
+       routine's COMMENT; one information_schema.ROUTINES query tells which routines are
+       missing or stale, and only those are re-created (under GET_LOCK, so concurrent
+       deployers do not race)
+     - call_many() sends "CALL p(...); SELECT 'end'; CALL p(...); SELECT 'end'; ..." as one
+       request; the marker result set after each CALL says where its result sets stop
+     - OUT parameters are bound to session variables and read back by one final SELECT
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import re
+import hashlib
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+import mysql.connector
+from mysql_practice.pipeline import iter_results
+
+DEPLOY_LOCK = 'routine_registry_deploy'
+_MARKER = '__call_end'
+OUT = object()  # placeholder for an OUT parameter in call_many() arguments
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+class RoutineRegistry:
+    """
+    Example:
+        registry = RoutineRegistry()
+        registry.procedure('get_employee_count', '', "BEGIN SELECT COUNT(*) FROM employees; END")
+        registry.deploy(conn)   # {'get_employee_count': 'created'}, then 'unchanged' on later runs
+    """
+
+    def __init__(self):
+        self.routines = {}
+
+    def procedure(self, name, params, body):
+        """Register CREATE PROCEDURE name(params) body."""
+        self.routines[name] = ('PROCEDURE', f"{name}({params})", body)
+
+    def function(self, name, params, returns, body, characteristics='DETERMINISTIC'):
+        """Register CREATE FUNCTION name(params) RETURNS returns characteristics body."""
+        self.routines[name] = ('FUNCTION', f"{name}({params}) RETURNS {returns} {characteristics}", body)
+
+    @staticmethod
+    def version(kind, signature, body):
+        text = re.sub(r'\s+', ' ', f"{kind} {signature} {body}").strip()
+        return 'sha256:' + hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+    def create_sql(self, name):
+        kind, signature, body = self.routines[name]
+        # The COMMENT characteristic goes before the body; it is what deployed_versions() reads
+        return f"CREATE {kind} {signature} COMMENT '{self.version(kind, signature, body)}' {body}"
+
+    def deployed_versions(self, cursor):
+        cursor.execute(
+            "SELECT ROUTINE_NAME, ROUTINE_TYPE, ROUTINE_COMMENT FROM information_schema.ROUTINES "
+            "WHERE ROUTINE_SCHEMA = DATABASE()")
+        return {(name, kind): comment for name, kind, comment in cursor.fetchall()}
+
+    def plan(self, cursor):
+        """{name: 'created' | 'replaced' | 'unchanged'} without changing anything."""
+        deployed = self.deployed_versions(cursor)
+        plan = {}
+        for name, (kind, signature, body) in self.routines.items():
+            current = deployed.get((name, kind))
+            if current is None:
+                plan[name] = 'created'
+            elif current != self.version(kind, signature, body):
+                plan[name] = 'replaced'
+            else:
+                plan[name] = 'unchanged'
+        return plan
+
+    def deploy(self, connection, lock_timeout=10):
+        """Create missing routines and replace changed ones; unchanged routines are not touched."""
+        cursor = connection.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (DEPLOY_LOCK, lock_timeout))
+        if cursor.fetchone()[0] != 1:
+            cursor.close()
+            raise RuntimeError(f"Could not acquire {DEPLOY_LOCK} within {lock_timeout}s")
+        try:
+            plan = self.plan(cursor)  # re-read under the lock: another deployer may have finished
+            for name, action in plan.items():
+                if action == 'unchanged':
+                    continue
+                kind = self.routines[name][0]
+                if action == 'replaced':
+                    cursor.execute(f"DROP {kind} IF EXISTS {name}")
+                cursor.execute(self.create_sql(name))
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (DEPLOY_LOCK,))
+            cursor.fetchall()
+            cursor.close()
+        return plan
+
+
+def call_many(connection, procedure, args_list, batch_size=100):
+    """
+    CALL procedure(*args) for every args in args_list, batch_size CALLs per round trip.
+    Use OUT in args for OUT parameters.
+    Returns one dict per call: {'result_sets': [rows, ...], 'out': [values]}.
+    """
+    cursor = connection.cursor()
+    calls = []
+    try:
+        for start in range(0, len(args_list), batch_size):
+            batch = args_list[start:start + batch_size]
+            statements, params, out_vars = [], [], []
+            for i, args in enumerate(batch):
+                placeholders, names = [], []
+                for j, value in enumerate(args):
+                    if value is OUT:
+                        names.append(f"@_out_{i}_{j}")
+                        placeholders.append(names[-1])
+                    else:
+                        placeholders.append('%s')
+                        params.append(value)
+                statements.append(f"CALL {procedure}({', '.join(placeholders)})")
+                statements.append(f"SELECT {i} AS {_MARKER}")
+                out_vars.append(names)
+            all_out = [name for names in out_vars for name in names]
+            if all_out:
+                statements.append(f"SELECT {', '.join(all_out)}")
+
+            results = [{'result_sets': [], 'out': []} for _ in batch]
+            current = 0
+            out_row = None
+            for columns, rows, _ in iter_results(cursor, '; '.join(statements), params):
+                if columns is None:
+                    continue  # the status result that ends each CALL
+                if columns == (_MARKER,):
+                    current = rows[0][0] + 1
+                elif current < len(batch):
+                    results[current]['result_sets'].append(rows)
+                else:
+                    out_row = rows[0]
+            if out_row is not None:
+                position = 0
+                for result, names in zip(results, out_vars):
+                    result['out'] = list(out_row[position:position + len(names)])
+                    position += len(names)
+            calls.extend(results)
+    finally:
+        cursor.close()
+    return calls
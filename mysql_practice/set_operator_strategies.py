@@ -0,0 +1,164 @@
+"""
+Set Operators: native vs emulated strategies (MySQL)
+- MySQL 8.0.31+ supports INTERSECT and EXCEPT (with DISTINCT/ALL) natively
+- Older servers need semi-join (EXISTS) / anti-join (NOT EXISTS) rewrites
+  (the rewrites use CTEs and ROW_NUMBER(), so they need MySQL 8.0+)
+- A benchmark compares native SQL, emulated SQL and the pandas hash-based engine
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import re
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+import mysql.connector
+import pandas as pd
+from pandas_practice.set_engine import set_operation
+
+NATIVE_SET_OPERATORS_VERSION = (8, 0, 31)
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+def _fetch_rows(cursor):
+    rows = cursor.fetchall()
+    return [tuple(row.values()) if isinstance(row, dict) else tuple(row) for row in rows]
+
+
+def server_version(cursor):
+    """Return the server version as a tuple, e.g. (8, 0, 35); MariaDB returns (0,)."""
+    cursor.execute("SELECT VERSION() AS version;")
+    version = _fetch_rows(cursor)[0][0]
+    if 'mariadb' in version.lower():
+        return (0,)
+    match = re.match(r'(\d+)\.(\d+)\.(\d+)', version)
+    return tuple(int(part) for part in match.groups()) if match else (0,)
+
+
+def supports_native_set_operators(cursor):
+    # What: INTERSECT/EXCEPT arrived in MySQL 8.0.31.
+    # Why: Choose the native operator when available, the rewrite otherwise.
+    return server_version(cursor) >= NATIVE_SET_OPERATORS_VERSION
+
+
+def _with_inputs(left_query, right_query, columns):
+    # How: CTE column lists give both inputs the same column names (SQL matches by position).
+    column_list = ', '.join(columns)
+    return (f"WITH l ({column_list}) AS ({left_query.strip().rstrip(';')}), "
+            f"r ({column_list}) AS ({right_query.strip().rstrip(';')}) ")
+
+
+def native_set_sql(left_query, right_query, columns, op, all=False):
+    """Build a native UNION/INTERSECT/EXCEPT [ALL] statement."""
+    quantifier = 'ALL' if all else 'DISTINCT'
+    return (_with_inputs(left_query, right_query, columns)
+            + f"SELECT * FROM l {op.upper()} {quantifier} SELECT * FROM r;")
+
+
+def emulated_set_sql(left_query, right_query, columns, op, all=False):
+    """
+    Build the semi-join/anti-join rewrite of INTERSECT/EXCEPT [ALL].
+    - <=> (NULL-safe equality) keeps SQL set semantics, where NULL matches NULL;
+      NOT IN would return nothing as soon as the right side contains a NULL
+    - ALL variants number duplicates with ROW_NUMBER() so the n-th copy on the left
+      only matches the n-th copy on the right
+    """
+    op = op.upper()
+    if op == 'UNION':
+        return native_set_sql(left_query, right_query, columns, op, all)
+    if op not in ('INTERSECT', 'EXCEPT'):
+        raise ValueError(f"Unknown set operator: {op}")
+    column_list = ', '.join(columns)
+    condition = ' AND '.join(f"b.{col} <=> a.{col}" for col in columns)
+    exists = 'EXISTS' if op == 'INTERSECT' else 'NOT EXISTS'
+    sql = _with_inputs(left_query, right_query, columns)
+    if all:
+        numbered = f"SELECT {column_list}, ROW_NUMBER() OVER (PARTITION BY {column_list}) AS copy_no FROM"
+        return (sql + f"SELECT {', '.join('a.' + col for col in columns)} FROM ({numbered} l) a "
+                f"WHERE {exists} (SELECT 1 FROM ({numbered} r) b WHERE {condition} AND b.copy_no = a.copy_no);")
+    return (sql + f"SELECT DISTINCT {', '.join('a.' + col for col in columns)} FROM l a "
+            f"WHERE {exists} (SELECT 1 FROM r b WHERE {condition});")
+
+
+def set_operation_sql(cursor, left_query, right_query, columns, op, all=False, native=None):
+    """
+    Run a set operator on the server, natively when supported.
+    - native=None detects the server version; True/False forces a strategy
+    """
+    if native is None:
+        native = supports_native_set_operators(cursor)
+    build = native_set_sql if native else emulated_set_sql
+    cursor.execute(build(left_query, right_query, columns, op, all))
+    return cursor.fetchall()
+
+
+def pandas_set_operation(cursor, left_query, right_query, columns, op, all=False):
+    """Fetch both inputs and run the operator with the pandas hash-based engine."""
+    cursor.execute(left_query)
+    left = pd.DataFrame(_fetch_rows(cursor), columns=columns)
+    cursor.execute(right_query)
+    right = pd.DataFrame(_fetch_rows(cursor), columns=columns)
+    return set_operation(left, right, op, all=all)
+
+
+def benchmark_set_operators(cursor, left_query, right_query, columns, repeat=5):
+    """
+    What: Time native SQL, emulated SQL and pandas for every operator.
+    Why: Pick the fastest strategy for the data size and server at hand.
+    How: Best of `repeat` runs, in milliseconds; native is skipped on older servers.
+    """
+    has_native = supports_native_set_operators(cursor)
+    strategies = {
+        'emulated_sql': lambda op, all: set_operation_sql(cursor, left_query, right_query, columns, op, all, native=False),
+        'pandas_encoded': lambda op, all: pandas_set_operation(cursor, left_query, right_query, columns, op, all),
+    }
+    if has_native:
+        strategies['native_sql'] = lambda op, all: set_operation_sql(cursor, left_query, right_query, columns, op, all, native=True)
+    results = []
+    for op in ('UNION', 'INTERSECT', 'EXCEPT'):
+        for all in (False, True):
+            for name, run in strategies.items():
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    result = run(op, all)
+                    timings.append(time.perf_counter() - start)
+                results.append({
+                    'operator': f"{op} {'ALL' if all else 'DISTINCT'}",
+                    'strategy': name,
+                    'rows': len(result),
+                    'best_ms': round(1000 * min(timings), 3),
+                })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        left_query = "SELECT first_name FROM employees"
+        right_query = "SELECT department_name FROM departments"
+
+        # 1. Strategy detection
+        # What: Report whether native INTERSECT/EXCEPT can be used.
+        print("Native INTERSECT/EXCEPT supported:", supports_native_set_operators(cursor))
+
+        # 2. INTERSECT / EXCEPT through the best available strategy
+        print("\nINTERSECT (names present in both employees and departments):")
+        for row in set_operation_sql(cursor, left_query, right_query, ['name'], 'INTERSECT'):
+            print(row)
+        print("\nEXCEPT ALL (first 5 employee names not used as department names):")
+        for row in set_operation_sql(cursor, left_query, right_query, ['name'], 'EXCEPT', all=True)[:5]:
+            print(row)
+
+        # 3. Benchmark: native vs emulated vs pandas
+        print("\nBenchmark (best of 5, ms):")
+        print(benchmark_set_operators(cursor, left_query, right_query, ['name']).to_string(index=False))
@@ -0,0 +1,736 @@
+"""
+Scatter-Gather Queries over employees Sharded by department_id (MySQL)
+- ShardMap: department_id -> shard, by hash (department_id % shards) or by ranges
+- distribute(): copy hr_db onto the shards (employees/dependents split, other tables copied whole)
+- ShardedConnection / ShardedCursor: run a query on every shard in parallel and merge the results,
+  so the query functions of 02, 05 and 07 run unchanged (set MYSQL_SHARDS in .env)
+
+What: Serve the HR queries from several MySQL instances, each holding some departments.
+Why: One server no longer holds employees comfortably; every query still needs the whole answer.
+How: The query is analysed (not executed) once and gets one of these plans:
+     - single:  no sharded table, or WHERE department_id = <value> -> one shard
+     - local:   every GROUP BY and every PARTITION BY includes department_id, so each group or
+                window lives on exactly one shard; shards run the query as-is and the results
+                are concatenated, DISTINCT de-duplicated, ORDER BY k-way heap-merged (each shard
+                is already sorted) and LIMIT n OFFSET m pushed down as LIMIT n + m (top-k)
+     - partial: a global aggregate (no department_id in GROUP BY). Shards return partial
+                aggregates per group: COUNT and SUM are summed, MIN/MAX reduced, AVG(x) is sent
+                as SUM(x) + COUNT(x) and divided at the end (an average of averages is wrong)
+     - scalar subqueries over the sharded table, e.g. (SELECT SUM(salary) FROM employees),
+       are evaluated first across all shards and replaced by their value
+     - gather:  anything else (a running total over all employees, ...) pulls the referenced
+                tables from the shards into an in-memory DuckDB and runs the query there
+
+Note: analysis is text-based (no full SQL parser): it knows the clauses used in this project.
+      Joins and subqueries over the sharded tables stay on the shards only when they are
+      linked by department_id (or employees-dependents by employee_id); a self-join on
+      manager_id or a correlated subquery on another column uses the gather plan.
+      Correlated scalar subqueries are not pre-evaluated. Foreign keys across shards are not enforced.
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import re
+import heapq
+import functools
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import USER, PASSWORD, DATABASE, SHARDS
+import mysql.connector
+
+SHARD_KEY = 'department_id'
+SHARDED_TABLES = {'employees': SHARD_KEY, 'dependents': None}  # dependents follow their employee
+_AGGREGATES = ('COUNT', 'SUM', 'AVG', 'MIN', 'MAX', 'GROUP_CONCAT', 'STD', 'STDDEV', 'STDDEV_POP',
+               'STDDEV_SAMP', 'VARIANCE', 'VAR_POP', 'VAR_SAMP', 'BIT_AND', 'BIT_OR', 'BIT_XOR',
+               'JSON_ARRAYAGG', 'JSON_OBJECTAGG')
+_AGGREGATE_CALL = re.compile(r'\b(' + '|'.join(_AGGREGATES) + r')\s*\(', re.IGNORECASE)
+_SUBSELECT = re.compile(r'\(\s*(?:SELECT|WITH)\b', re.IGNORECASE)
+_KEY_ITEM = re.compile(r'^(?:\w+\.)?' + SHARD_KEY + r'$', re.IGNORECASE)
+
+
+class ShardMap:
+    """
+    department_id -> shard index.
+    strategy='hash': department_id % shards; strategy='range': bounds [b1, b2, ...] send
+    department_id < b1 to shard 0, < b2 to shard 1, ... and the rest to the last shard.
+    NULL department_id goes to shard 0.
+    """
+
+    def __init__(self, shards, strategy='hash', bounds=None):
+        if strategy == 'range' and (not bounds or len(bounds) != shards - 1):
+            raise ValueError("Range sharding needs shards - 1 bounds")
+        self.shards = shards
+        self.strategy = strategy
+        self.bounds = list(bounds or [])
+
+    def shard_for(self, key):
+        if key is None:
+            return 0
+        if self.strategy == 'hash':
+            return int(key) % self.shards
+        for shard, bound in enumerate(self.bounds):
+            if key < bound:
+                return shard
+        return self.shards - 1
+
+
+# --- text analysis ------------------------------------------------------------
+
+def _mask(sql):
+    """sql with string literal contents and comments blanked (same length, so offsets still match)."""
+    def blank(match):
+        text = match.group(0)
+        return text[0] + ' ' * (len(text) - 2) + text[-1] if text[0] in '\'"`' else ' ' * len(text)
+    return re.sub(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`|/\*.*?\*/|--[^\n]*",
+                  blank, sql, flags=re.DOTALL)
+
+
+def _close(text, start):
+    """Index of the parenthesis closing the one at text[start]."""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == '(':
+            depth += 1
+        elif text[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    raise ValueError("Unbalanced parentheses")
+
+
+def _subselects(masked, start=0, end=None):
+    """Spans (open, close) of the parenthesized subqueries directly inside masked[start:end]."""
+    end = len(masked) if end is None else end
+    spans, i = [], start
+    while True:
+        match = _SUBSELECT.search(masked, i, end)
+        if not match:
+            return spans
+        close = _close(masked, match.start())
+        spans.append((match.start(), close))
+        i = close + 1
+
+
+def _own_text(masked, start, end):
+    """masked[start:end] with nested subqueries blanked (keeps offsets relative to start)."""
+    text = list(masked[start:end])
+    for open_, close in _subselects(masked, start, end):
+        text[open_ - start:close - start + 1] = ' ' * (close - open_ + 1)
+    return ''.join(text)
+
+
+def _depth0(text, pattern):
+    """Matches of pattern in text that are not inside parentheses."""
+    depth, depths = 0, []
+    for char in text:
+        depths.append(depth)
+        depth += (char == '(') - (char == ')')
+    return [m for m in re.finditer(pattern, text, re.IGNORECASE) if depths[m.start()] == 0]
+
+
+def _split_items(text):
+    """Split a select/group/order list on top-level commas; returns (start, end) spans."""
+    spans, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        depth += (char == '(') - (char == ')')
+        if char == ',' and depth == 0:
+            spans.append((start, i))
+            start = i + 1
+    spans.append((start, len(text)))
+    return spans
+
+
+class _Block:
+    """Clauses of one SELECT (top level or a subquery), as offsets into the query text."""
+
+    CLAUSES = [('select', r'\bSELECT\b'), ('from', r'\bFROM\b'), ('where', r'\bWHERE\b'),
+               ('group', r'\bGROUP\s+BY\b'), ('having', r'\bHAVING\b'),
+               ('order', r'\bORDER\s+BY\b'), ('limit', r'\bLIMIT\b')]
+
+    def __init__(self, masked, start, end):
+        self.start, self.end = start, end
+        own = _own_text(masked, start, end)
+        self.own = own
+        self.union = bool(_depth0(own, r'\bUNION\b'))
+        marks = {}
+        for name, pattern in self.CLAUSES:
+            found = _depth0(own, pattern)
+            if found:
+                # the last SELECT at this level is the main one (after WITH ... AS (...))
+                match = found[-1] if name == 'select' else found[0]
+                marks[name] = (match.start(), match.end())
+        order = sorted(marks.items(), key=lambda item: item[1][0])
+        self.keywords = {name: start + kw_start for name, (kw_start, _) in order}  # where the keyword starts
+        self.clauses = {}  # name -> (start, end) of the clause body, after its keyword
+        for i, (name, (kw_start, kw_end)) in enumerate(order):
+            clause_end = order[i + 1][1][0] if i + 1 < len(order) else len(own)
+            self.clauses[name] = (start + kw_end, start + clause_end)
+        select = self.clause_text(masked, 'select') or ''
+        self.distinct = bool(re.match(r'\s*DISTINCT\b', select, re.IGNORECASE))
+        self.aggregates = [m for m in _AGGREGATE_CALL.finditer(own) if not self._is_window(own, m)]
+        self.windows = [own[m.end():_close(own, m.end() - 1)] for m in re.finditer(r'\bOVER\s*\(', own, re.IGNORECASE)]
+
+    @staticmethod
+    def _is_window(own, match):
+        close = _close(own, match.end() - 1)
+        return bool(re.match(r'\s*OVER\b', own[close + 1:], re.IGNORECASE))
+
+    def clause_text(self, text, name):
+        if name not in self.clauses:
+            return None
+        start, end = self.clauses[name]
+        return text[start:end]
+
+    def items(self, text, name):
+        clause = self.clause_text(text, name)
+        if clause is None:
+            return []
+        if name == 'select' and self.distinct:
+            clause = re.sub(r'^\s*DISTINCT\b', '', clause, flags=re.IGNORECASE)
+        return [clause[a:b].strip() for a, b in _split_items(clause)]
+
+    def grouped_by_key(self, masked):
+        return any(_KEY_ITEM.match(item) for item in self.items(masked, 'group'))
+
+    def local(self, masked, top=True):
+        """Each group / window partition of this block lives on one shard."""
+        if (self.aggregates or 'group' in self.clauses) and not self.grouped_by_key(masked):
+            return False
+        if not top and (self.distinct or 'limit' in self.clauses):
+            return False  # the coordinator only merges DISTINCT / LIMIT of the outer query
+        for window in self.windows:
+            partition = re.search(r'\bPARTITION\s+BY\b(.*?)(?:\bORDER\s+BY\b|\bROWS\b|\bRANGE\b|$)',
+                                  window, re.IGNORECASE | re.DOTALL)
+            if not partition or not any(_KEY_ITEM.match(p.strip()) for p in partition.group(1).split(',')):
+                return False
+        return not self.union
+
+
+def _blocks(masked):
+    blocks, pending = [_Block(masked, 0, len(masked))], [(0, len(masked))]
+    while pending:
+        start, end = pending.pop()
+        for open_, close in _subselects(masked, start, end):
+            blocks.append(_Block(masked, open_ + 1, close))
+            pending.append((open_ + 1, close))
+    return blocks
+
+
+_NOT_ALIAS = {'ON', 'USING', 'WHERE', 'JOIN', 'INNER', 'LEFT', 'RIGHT', 'CROSS', 'OUTER', 'NATURAL',
+              'STRAIGHT_JOIN', 'GROUP', 'ORDER', 'LIMIT', 'HAVING', 'UNION', 'WINDOW', 'AS', 'FROM'}
+
+
+def _table_refs(masked, start=0, end=None):
+    """(table, alias, offset) of every table named after FROM / JOIN / a comma in masked[start:end]."""
+    refs = []
+    pattern = r'(?:\bFROM|\bJOIN|,)\s+(\w+)\b(?!\s*[.(])(?:\s+(?:AS\s+)?(\w+))?'
+    for match in re.finditer(pattern, masked[start:end], re.IGNORECASE):
+        table, alias = match.group(1), match.group(2)
+        if alias is None or alias.upper() in _NOT_ALIAS:
+            alias = table
+        refs.append((table.lower(), alias.lower(), start + match.start(1)))
+    return refs
+
+
+def _colocated(masked):
+    """
+    True when every reference to a sharded table can be answered from one shard's own rows:
+    references are linked by a.department_id = b.department_id, employees-dependents by
+    employee_id (dependents live with their employee), or a subquery in department_id IN (...).
+    A self-join on manager_id (or a correlated subquery on job_id) is not: the matching row
+    may be on another shard.
+    """
+    refs = [(alias, offset) for table, alias, offset in _table_refs(masked) if table in SHARDED_TABLES]
+    if len(refs) < 2:
+        return True
+    tables = {alias: table for table, alias, _ in _table_refs(masked)}
+    parent = list(range(len(refs)))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    def link(a, b):
+        for i, (alias_i, _) in enumerate(refs):
+            for j, (alias_j, _) in enumerate(refs):
+                if alias_i == a and alias_j == b:
+                    parent[find(i)] = find(j)
+
+    for a, column_a, b, column_b in re.findall(r'\b(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)\b', masked):
+        a, b, column_a, column_b = a.lower(), b.lower(), column_a.lower(), column_b.lower()
+        if column_a != column_b or a == b:
+            continue
+        pair = {tables.get(a), tables.get(b)}
+        if column_a == SHARD_KEY or (column_a == 'employee_id' and pair == {'employees', 'dependents'}):
+            link(a, b)
+    # department_id IN (SELECT department_id ...): the outer row's department is on the same shard
+    for match in re.finditer(r'(?:\b\w+\.)?' + SHARD_KEY + r'\s+(?:NOT\s+)?IN\s*\(\s*SELECT\s+(?:DISTINCT\s+)?'
+                             r'(?:\w+\.)?' + SHARD_KEY + r'\b', masked, re.IGNORECASE):
+        open_ = masked.index('(', match.start())
+        close = _close(masked, open_)
+        inner = [i for i, (_, offset) in enumerate(refs) if open_ < offset < close]
+        outer = [i for i, (_, offset) in enumerate(refs) if not open_ < offset < close]
+        for i in inner:
+            for j in outer:
+                parent[find(i)] = find(j)
+    return len({find(i) for i in range(len(refs))}) == 1
+
+
+def _correlated(masked, start, end):
+    """True when masked[start:end] qualifies a column with an alias it does not define itself."""
+    bound = {alias for _, alias, _ in _table_refs(masked, start, end)}
+    bound |= {table for table, _, _ in _table_refs(masked, start, end)}
+    used = {q.lower() for q in re.findall(r'\b([A-Za-z_]\w*)\.\w', masked[start:end])}
+    return bool(used - bound)
+
+
+def _param_positions(masked):
+    return [m.start() for m in re.finditer(r'%s', masked)]
+
+
+def _literal(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (int, float)) or type(value).__name__ == 'Decimal':
+        return str(value)
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "''") + "'"
+
+
+# --- merging ------------------------------------------------------------------
+
+def _null_first(value):
+    # MySQL sorts NULL before every value in ascending order; the default collation ignores case
+    return (value is not None, value.casefold() if isinstance(value, str) else value)
+
+
+def _sort_key(positions, descending):
+    def compare(a, b):
+        for position, desc in zip(positions, descending):
+            x, y = _null_first(a[position]), _null_first(b[position])
+            if x != y:
+                return (1 if x > y else -1) * (-1 if desc else 1)
+        return 0
+    return functools.cmp_to_key(compare)
+
+
+def _order_spec(order_items, columns):
+    """(positions, descending) for ORDER BY items that name output columns, else None."""
+    positions, descending = [], []
+    names = [column.lower() for column in columns]
+    for item in order_items:
+        match = re.match(r'^(.*?)(?:\s+(ASC|DESC))?$', item.strip(), re.IGNORECASE | re.DOTALL)
+        expression, direction = match.group(1).strip(), (match.group(2) or 'ASC').upper()
+        if expression.isdigit():
+            position = int(expression) - 1
+        else:
+            name = expression.split('.')[-1].strip('`').lower()
+            if name not in names:
+                return None
+            position = names.index(name)
+        positions.append(position)
+        descending.append(direction == 'DESC')
+    return positions, descending
+
+
+def _combine(kind, values):
+    values = [v for v in values if v is not None]
+    if kind in ('COUNT', 'SUM'):
+        return sum(values) if values or kind == 'COUNT' else None
+    if kind == 'MIN':
+        return min(values) if values else None
+    return max(values) if values else None
+
+
+# --- cluster --------------------------------------------------------------------
+
+class ShardedConnection:
+    """One connection per shard plus a thread pool to query them in parallel."""
+
+    supports_multi_statements = False  # Pipeline sends statements one at a time
+
+    def __init__(self, shard_configs, shard_map=None):
+        self.configs = list(shard_configs)
+        self.shard_map = shard_map or ShardMap(len(self.configs))
+        self.connections = [mysql.connector.connect(**config) for config in self.configs]
+        self.pool = ThreadPoolExecutor(max_workers=len(self.connections))
+        self.plans = []  # (plan, sql) of every executed query, for inspection
+
+    def run(self, shards, sql, params=()):
+        """[(column_names, rows)] from each shard in shards, in parallel."""
+        def query(shard):
+            cursor = self.connections[shard].cursor()
+            cursor.execute(sql, tuple(params))
+            rows = cursor.fetchall() if cursor.with_rows else []
+            columns = cursor.column_names if cursor.with_rows else ()
+            cursor.close()
+            return columns, rows
+        return list(self.pool.map(query, shards))
+
+    def cursor(self, dictionary=False, **_):
+        return ShardedCursor(self, dictionary)
+
+    def commit(self):
+        for connection in self.connections:
+            connection.commit()
+
+    def rollback(self):
+        for connection in self.connections:
+            connection.rollback()
+
+    def close(self):
+        self.pool.shutdown()
+        for connection in self.connections:
+            connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+
+class ShardedCursor:
+    """Cursor API over a ShardedConnection: execute() plans, scatters and merges."""
+
+    def __init__(self, connection, dictionary=False):
+        self.connection = connection
+        self.dictionary = dictionary
+        self.column_names = ()
+        self._rows = []
+        self.rowcount = -1
+        self.plan = None
+
+    # --- planning ---------------------------------------------------------------
+
+    def execute(self, sql, params=None):
+        params = tuple(params or ())
+        sql = sql.strip().rstrip(';')
+        self.plan, columns, rows = self._execute(sql, params)
+        self.connection.plans.append((self.plan, sql))
+        self.column_names = tuple(columns)
+        self._rows = [dict(zip(columns, row)) for row in rows] if self.dictionary else [tuple(r) for r in rows]
+        self.rowcount = len(self._rows)
+
+    def _execute(self, sql, params):
+        masked = _mask(sql)
+        all_shards = range(len(self.connection.connections))
+        tables = {t.lower() for t in re.findall(r'\b(?:FROM|JOIN)\s+(\w+)', masked, re.IGNORECASE)}
+        if not tables & set(SHARDED_TABLES):
+            return ('single', *self._single(0, sql, params))
+        if not re.match(r'\s*(?:SELECT|WITH|\()', masked, re.IGNORECASE):
+            raise NotImplementedError("Only queries are supported on the sharded cluster")
+
+        blocks = _blocks(masked)
+        top = blocks[0]
+        colocated = _colocated(masked)
+        if colocated and all(block.local(masked, block is top) for block in blocks):
+            shard = self._pinned_shard(masked, top, params, len(blocks))
+            if shard is not None:
+                return ('single', *self._single(shard, sql, params))
+            return ('local', *self._local(sql, masked, params, top, all_shards))
+
+        substituted = self._substitute_scalars(sql, masked, params, top)
+        if substituted is not None:
+            plan, columns, rows = self._execute(*substituted)
+            return ('scalar+' + plan, columns, rows)
+
+        if colocated and not top.local(masked) and all(block.local(masked, False) for block in blocks[1:]):
+            result = self._partial(sql, masked, params, top, all_shards)
+            if result is not None:
+                return ('partial', *result)
+        return ('gather', *self._gather(sql, params, tables))
+
+    def _single(self, shard, sql, params):
+        (columns, rows), = self.connection.run([shard], sql, params)
+        return columns, rows
+
+    def _pinned_shard(self, masked, top, params, block_count):
+        # WHERE department_id = <value> in a query without subqueries or OR: one shard has it all
+        where = top.clause_text(masked, 'where')
+        if block_count > 1 or where is None or re.search(r'\bOR\b', where, re.IGNORECASE):
+            return None
+        match = re.search(r'(?:\b\w+\.)?' + SHARD_KEY + r'\s*=\s*(%s|\d+)', where, re.IGNORECASE)
+        if not match:
+            return None
+        if match.group(1) == '%s':
+            offset = top.clauses['where'][0] + match.start(1)
+            value = params[_param_positions(masked).index(offset)]
+        else:
+            value = int(match.group(1))
+        return self.connection.shard_map.shard_for(value)
+
+    def _limit(self, masked, top, params):
+        """(sql offsets of the LIMIT clause, count, offset, params without the LIMIT ones) or None."""
+        clause = top.clause_text(masked, 'limit')
+        if clause is None:
+            return None
+        start, end = top.clauses['limit']
+        tokens = re.findall(r'%s|\d+', clause)
+        positions = [p for p in _param_positions(masked) if start <= p < end]
+        first_param = _param_positions(masked).index(positions[0]) if positions else len(params)
+        limit_params = list(params[first_param:first_param + len(positions)])
+        values = [limit_params.pop(0) if token == '%s' else int(token) for token in tokens]
+        if re.search(r'\bOFFSET\b', clause, re.IGNORECASE):
+            count, offset = values
+        elif len(values) == 2:
+            offset, count = values  # LIMIT offset, count
+        else:
+            count, offset = values[0], 0
+        rest = params[:first_param] + params[first_param + len(positions):]
+        return (start, end), int(count), int(offset), rest
+
+    def _local(self, sql, masked, params, top, shards):
+        limit = self._limit(masked, top, params)
+        shard_sql, shard_params = sql, params
+        if limit is not None:
+            (_, end), count, offset, shard_params = limit
+            # Top-k: every shard returns its first offset + count rows. With DISTINCT a shard's rows
+            # may be duplicates of another shard's, so the shards return everything instead.
+            pushed = '' if top.distinct else f" LIMIT {offset + count}"
+            shard_sql = sql[:top.keywords['limit']] + pushed + sql[end:]
+        results = self.connection.run(shards, shard_sql, shard_params)
+        columns = next((c for c, _ in results if c), ())
+        order = _order_spec(top.items(masked, 'order'), columns) if 'order' in top.clauses else None
+        if 'order' in top.clauses and order is None:
+            raise NotImplementedError("ORDER BY must name output columns on the sharded cluster")
+        if order:
+            rows = list(heapq.merge(*(rows for _, rows in results), key=_sort_key(*order)))
+        else:
+            rows = [row for _, shard_rows in results for row in shard_rows]
+        if top.distinct:
+            rows = list(dict.fromkeys(tuple(row) for row in rows))
+        if limit is not None:
+            rows = rows[offset:offset + count]
+        return columns, rows
+
+    def _substitute_scalars(self, sql, masked, params, top):
+        """Evaluate non-local scalar subqueries of the top SELECT first; returns (sql, params) or None."""
+        positions = _param_positions(masked)
+        pieces, new_params, cursor, changed = [], [], 0, False
+        blocks = _blocks(masked)
+        for open_, close in _subselects(masked, top.start, top.end):
+            inner = _Block(masked, open_ + 1, close)
+            nested = [b for b in blocks if open_ + 1 < b.start and b.end < close]
+            # a scalar: aggregates without GROUP BY over the sharded table, nested queries shard-local
+            if inner.local(masked) or 'group' in inner.clauses or not inner.aggregates:
+                continue
+            if not all(b.local(masked, False) for b in nested):
+                continue
+            if _correlated(masked, open_ + 1, close):
+                continue  # refers to the outer row: only the gather plan can run it
+            inner_params = [params[i] for i, p in enumerate(positions) if open_ < p < close]
+            try:
+                _, columns, rows = self._execute(sql[open_ + 1:close].strip(), tuple(inner_params))
+            except Exception:
+                continue  # correlated through an unqualified column: left to the gather plan
+            if len(columns) != 1 or len(rows) != 1:
+                continue
+            pieces.append(sql[cursor:open_])
+            pieces.append(_literal(rows[0][0]))
+            new_params.extend(params[i] for i, p in enumerate(positions) if cursor <= p < open_)
+            cursor = close + 1
+            changed = True
+        if not changed:
+            return None
+        pieces.append(sql[cursor:])
+        new_params.extend(params[i] for i, p in enumerate(positions) if p >= cursor)
+        return ''.join(pieces), tuple(new_params)
+
+    def _partial(self, sql, masked, params, top, shards):
+        """Global aggregate: shards return partial aggregates per group, merged here."""
+        if top.windows or top.distinct or 'having' in top.clauses:
+            return None
+        group_items = top.items(sql, 'group')
+        outputs = []   # (column name, ('group', i) | (kind, [partial columns]))
+        partials = []  # shard-side expressions
+        for item, masked_item in zip(top.items(sql, 'select'), top.items(masked, 'select')):
+            alias = re.search(r'\s+(?:AS\s+)?(\w+)$', masked_item, re.IGNORECASE)
+            expression = item[:alias.start()].strip() if alias else item
+            name = alias.group(1) if alias else item
+            call = re.match(r'^(COUNT|SUM|AVG|MIN|MAX)\s*\((.*)\)$', expression, re.IGNORECASE | re.DOTALL)
+            if call and _close(expression, expression.index('(')) == len(expression) - 1:
+                kind, argument = call.group(1).upper(), call.group(2).strip()
+                if re.match(r'DISTINCT\b', argument, re.IGNORECASE):
+                    return None  # COUNT(DISTINCT x) is not decomposable
+                if kind == 'AVG':
+                    outputs.append((name, ('AVG', [len(partials), len(partials) + 1])))
+                    partials += [f"SUM({argument})", f"COUNT({argument})"]
+                else:
+                    outputs.append((name, (kind, [len(partials)])))
+                    partials.append(f"{kind}({argument})")
+            elif expression in group_items:
+                outputs.append((name, ('group', group_items.index(expression))))
+            else:
+                return None  # expressions over aggregates: use the gather plan
+        keys = [f"{g} AS _k{i}" for i, g in enumerate(group_items)]
+        select_start, select_end = top.clauses['select']
+        from_start = top.keywords['from']
+        tail_end = min([top.keywords[c] for c in ('order', 'limit') if c in top.keywords] + [top.end])
+        shard_sql = (sql[:select_start] + ' ' + ', '.join(keys + [f"{p} AS _p{i}" for i, p in enumerate(partials)])
+                     + ' ' + sql[from_start:tail_end])
+        positions = _param_positions(masked)
+        shard_params = tuple(params[i] for i, p in enumerate(positions) if p < tail_end)
+
+        merged = {}
+        for _, rows in self.connection.run(shards, shard_sql, shard_params):
+            for row in rows:
+                merged.setdefault(tuple(row[:len(keys)]), []).append(row[len(keys):])
+        if not group_items and not merged:
+            merged[()] = []
+        rows = []
+        for key, shard_partials in merged.items():
+            row = []
+            for _, (kind, columns) in outputs:
+                if kind == 'group':
+                    row.append(key[columns])
+                elif kind == 'AVG':
+                    total = _combine('SUM', [p[columns[0]] for p in shard_partials])
+                    count = _combine('COUNT', [p[columns[1]] for p in shard_partials])
+                    row.append(total / count if count else None)
+                else:
+                    row.append(_combine(kind, [p[columns[0]] for p in shard_partials]))
+            rows.append(tuple(row))
+        columns = [name for name, _ in outputs]
+        if 'order' in top.clauses:
+            order = _order_spec(top.items(masked, 'order'), columns)
+            if order is None:
+                return None
+            rows.sort(key=_sort_key(*order))
+        limit = self._limit(masked, top, params)
+        if limit is not None:
+            _, count, offset, _ = limit
+            rows = rows[offset:offset + count]
+        return columns, rows
+
+    def _gather(self, sql, params, tables):
+        """Fallback: copy the referenced tables into an in-memory DuckDB and run the query there."""
+        import duckdb
+        import pandas as pd
+        known = set(SHARDED_TABLES) | {'regions', 'countries', 'locations', 'departments', 'jobs'}
+        con = duckdb.connect()
+        for table in sorted(tables & known):
+            shards = range(len(self.connection.connections)) if table in SHARDED_TABLES else [0]
+            results = self.connection.run(shards, f"SELECT * FROM {table}")
+            frame = pd.DataFrame([row for _, rows in results for row in rows], columns=list(results[0][0]))
+            con.register(table, frame)
+        result = con.execute(re.sub(r'%s', '?', sql), list(params))
+        columns = [d[0] for d in result.description]
+        rows = result.fetchall()
+        con.close()
+        return columns, rows
+
+    # --- cursor API ------------------------------------------------------------------
+
+    @property
+    def with_rows(self):
+        return bool(self.column_names)
+
+    @property
+    def description(self):
+        return [(name, None, None, None, None, None, True) for name in self.column_names]
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size=1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def nextset(self):
+        return None
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._rows = []
+
+
+def _shard_configs(entries=SHARDS):
+    configs = []
+    for entry in entries:
+        host, _, port = entry.partition(':')
+        configs.append({'host': host, 'port': int(port or 3306), 'user': USER, 'password': PASSWORD,
+                        'database': DATABASE})
+    return configs
+
+
+def sharded_connection(strategy='hash', bounds=None):
+    """ShardedConnection to the MYSQL_SHARDS instances."""
+    configs = _shard_configs()
+    return ShardedConnection(configs, ShardMap(len(configs), strategy, bounds))
+
+
+def distribute(source, shard_configs=None, shard_map=None):
+    """
+    Copy hr_db from the source connection onto the shards: employees split by department_id,
+    dependents next to their employee, every other table copied whole (joins stay local).
+    Returns {table: [rows per shard]}.
+    """
+    from scripts.setup_database import execute_sql_file, SCHEMA_FILE
+    shard_configs = shard_configs or _shard_configs()
+    shard_map = shard_map or ShardMap(len(shard_configs))
+    cursor = source.cursor()
+    tables = ['regions', 'countries', 'locations', 'jobs', 'departments', 'employees', 'dependents']
+    data = {}
+    for table in tables:
+        cursor.execute(f"SELECT * FROM {table}")
+        data[table] = (cursor.column_names, cursor.fetchall())
+    cursor.close()
+
+    employee_columns, employee_rows = data['employees']
+    key = employee_columns.index(SHARD_KEY)
+    shard_of_employee = {row[0]: shard_map.shard_for(row[key]) for row in employee_rows}
+    dependent_columns = data['dependents'][0]
+    employee_ref = dependent_columns.index('employee_id')
+
+    counts = {table: [0] * len(shard_configs) for table in tables}
+    for shard, config in enumerate(shard_configs):
+        server = {k: v for k, v in config.items() if k != 'database'}
+        connection = mysql.connector.connect(**server)
+        cursor = connection.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {config['database']}")
+        cursor.execute(f"USE {config['database']}")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")  # managers may live on another shard
+        for table in reversed(tables):
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        execute_sql_file(cursor, SCHEMA_FILE)
+        for table in tables:
+            columns, rows = data[table]
+            if table == 'employees':
+                rows = [row for row in rows if shard_map.shard_for(row[key]) == shard]
+            elif table == 'dependents':
+                rows = [row for row in rows if shard_of_employee.get(row[employee_ref]) == shard]
+            if rows:
+                cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) "
+                                   f"VALUES ({', '.join(['%s'] * len(columns))})", rows)
+            counts[table][shard] = len(rows)
+        connection.commit()
+        cursor.close()
+        connection.close()
+    return counts
+
+
+if __name__ == "__main__":
+    # Load the shards from MYSQL_HOST, then run one query of each plan
+    from scripts.db_config import HOST
+    with mysql.connector.connect(host=HOST, user=USER, password=PASSWORD, database=DATABASE) as source:
+        print(f"Rows per shard: {distribute(source)}")
+    with sharded_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        for query in ["SELECT * FROM employees WHERE department_id = 9",
+                      "SELECT department_id, COUNT(*) AS n FROM employees GROUP BY department_id ORDER BY n DESC",
+                      "SELECT * FROM employees ORDER BY salary DESC LIMIT 5",
+                      "SELECT COUNT(*) AS n, AVG(salary) AS avg_salary FROM employees",
+                      "SELECT job_id, MAX(salary) AS top FROM employees GROUP BY job_id ORDER BY top DESC LIMIT 3"]:
+            cursor.execute(query)
+            print(f"\n[{cursor.plan}] {query}")
+            for row in cursor.fetchall():
+                print(row)
@@ -0,0 +1,208 @@
+"""
+Indexed Substring and Suffix Search (MySQL)
+- install(): indexed generated column REVERSE(email) and FULLTEXT ngram indexes
+- capabilities(): what the server has (B-tree, reversed columns, ngram FULLTEXT, ngram size)
+- like_predicate(): the fastest WHERE clause for a LIKE pattern, chosen by the pattern's shape
+- employees_by_job_title() / employees_with_email_domain(): 02's searches, accelerated
+
+What: Run 02's `job_title LIKE '%Manager%'` and `email LIKE '%@domain'` without full scans.
+Why: A B-tree index orders values by their first characters. It serves 'abc%' (a range
+     scan), but a pattern starting with % can match anywhere, so MySQL reads every row.
+How: - Suffix ('%@domain'): email_reversed = REVERSE(email) is a virtual generated column
+       with a B-tree index. '%@domain' on email is 'niamod@%' on email_reversed, which is
+       a prefix again and a range scan
+     - Infix ('%Manager%'): a FULLTEXT index WITH PARSER ngram stores every n-character
+       substring (ngram_token_size, 2 by default). MATCH ... AGAINST ('"manager"' IN BOOLEAN
+       MODE) finds rows containing those n-grams in sequence, and the original LIKE rechecks
+       them, so the result is exactly LIKE's
+     - Exact and prefix patterns keep their B-tree index; everything else (wildcards in the
+       middle, terms shorter than the n-gram size, no suitable index) stays a LIKE scan
+
+Note: the ngram index is created with innodb_ft_enable_stopword = OFF. With stopwords, the
+      ngram parser drops every n-gram containing a stopword ('a', 'i', ...), and
+      '%Manager%' would miss.
+      In this schema job_id is an integer, so 06's `job_id LIKE '%MAN%'` matches nothing; the
+      job title search is employees_by_job_title().
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import re
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+import mysql.connector
+
+# (table, column) -> reversed generated column, for suffix searches
+REVERSED_COLUMNS = {('employees', 'email'): 'email_reversed'}
+# (table, column) -> FULLTEXT ngram index, for infix searches
+NGRAM_INDEXES = {
+    ('jobs', 'job_title'): 'ft_job_title_ngram',
+    ('employees', 'first_name'): 'ft_first_name_ngram',
+    ('employees', 'last_name'): 'ft_last_name_ngram',
+}
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+def install(cursor):
+    """Add the reversed columns and ngram indexes that are missing; returns what was added."""
+    added = []
+    cursor.execute("SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()")
+    columns = {(table, column) for table, column in cursor.fetchall()}
+    cursor.execute("SELECT DISTINCT TABLE_NAME, INDEX_NAME FROM information_schema.STATISTICS "
+                   "WHERE TABLE_SCHEMA = DATABASE()")
+    indexes = {(table, index) for table, index in cursor.fetchall()}
+
+    for (table, column), reversed_column in REVERSED_COLUMNS.items():
+        if (table, reversed_column) not in columns:
+            # VIRTUAL: computed on read, only the index stores the reversed values;
+            # INVISIBLE (MySQL 8.0.23+): SELECT * keeps returning the columns of hr_schema.sql
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {reversed_column} VARCHAR(255) "
+                           f"GENERATED ALWAYS AS (REVERSE({column})) VIRTUAL INVISIBLE, "
+                           f"ADD INDEX idx_{reversed_column} ({reversed_column})")
+            added.append(f"{table}.{reversed_column}")
+
+    cursor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+    for (table, column), index in NGRAM_INDEXES.items():
+        if (table, index) in indexes:
+            continue
+        try:
+            cursor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {index} ({column}) WITH PARSER ngram")
+            added.append(f"{table}.{index}")
+        except mysql.connector.Error as e:
+            # Servers without the ngram parser (or non-InnoDB tables) keep the LIKE scan
+            print(f"FULLTEXT ngram index on {table}.{column} not created: {e}")
+    return added
+
+
+def capabilities(cursor):
+    """Indexes usable for searches: {'btree', 'reversed', 'ngram', 'ngram_token_size'}."""
+    cursor.execute("SELECT TABLE_NAME, COLUMN_NAME, INDEX_TYPE, INDEX_NAME FROM information_schema.STATISTICS "
+                   "WHERE TABLE_SCHEMA = DATABASE() AND SEQ_IN_INDEX = 1")
+    btree, fulltext = set(), {}
+    for table, column, index_type, index in cursor.fetchall():
+        if index_type == 'FULLTEXT':
+            fulltext[(table, column)] = index
+        else:
+            btree.add((table, column))
+    cursor.execute("SELECT TABLE_NAME, COLUMN_NAME, GENERATION_EXPRESSION FROM information_schema.COLUMNS "
+                   "WHERE TABLE_SCHEMA = DATABASE() AND GENERATION_EXPRESSION LIKE %s", ('%reverse(%',))
+    reversed_columns = {}
+    for table, column, expression in cursor.fetchall():
+        match = re.match(r'reverse\(`?(\w+)`?\)$', expression.strip(), re.IGNORECASE)
+        if match and (table, column) in btree:
+            reversed_columns[(table, match.group(1))] = column
+    try:
+        cursor.execute("SELECT @@ngram_token_size")
+        ngram_token_size = int(cursor.fetchone()[0])
+    except mysql.connector.Error:
+        ngram_token_size = None
+    return {
+        'btree': btree,
+        'reversed': reversed_columns,
+        'ngram': fulltext if ngram_token_size else {},
+        'ngram_token_size': ngram_token_size,
+    }
+
+
+def pattern_shape(pattern):
+    """('exact' | 'prefix' | 'suffix' | 'infix' | 'other', literal text) of a LIKE pattern."""
+    tokens = re.findall(r'\\.|[%_]|[^%_\\]+', pattern)
+    literal = ''.join(t[1:] if t.startswith('\\') else t for t in tokens if t not in ('%', '_'))
+    wildcards = ''.join('L' if t not in ('%', '_') else t for t in tokens)
+    wildcards = re.sub('L+', 'L', wildcards)
+    shape = {'L': 'exact', 'L%': 'prefix', '%L': 'suffix', '%L%': 'infix'}.get(wildcards, 'other')
+    return shape, literal
+
+
+def _escape_like(text):
+    return re.sub(r'([%_\\])', r'\\\1', text)
+
+
+def like_predicate(caps, table, column, pattern, alias=None):
+    """(sql, params, strategy) equivalent to `column LIKE pattern`, using the best available index."""
+    qualified = f"{alias or table}.{column}"
+    shape, literal = pattern_shape(pattern)
+    if shape == 'exact':
+        strategy = 'btree' if (table, column) in caps['btree'] else 'scan'
+        return f"{qualified} = %s", (literal,), strategy
+    if shape == 'prefix' and (table, column) in caps['btree']:
+        return f"{qualified} LIKE %s", (pattern,), 'btree-prefix'
+    if shape == 'suffix' and (table, column) in caps['reversed']:
+        reversed_column = f"{alias or table}.{caps['reversed'][(table, column)]}"
+        return f"{reversed_column} LIKE %s", (_escape_like(literal[::-1]) + '%',), 'reversed'
+    if (shape == 'infix' and (table, column) in caps['ngram'] and '"' not in literal
+            and len(literal) >= caps['ngram_token_size']):
+        # The FULLTEXT index finds candidates, LIKE keeps LIKE's exact semantics
+        return (f"MATCH({qualified}) AGAINST (%s IN BOOLEAN MODE) AND {qualified} LIKE %s",
+                (f'"{literal}"', pattern), 'ngram')
+    return f"{qualified} LIKE %s", (pattern,), 'scan'
+
+
+def employees_by_job_title(cursor, caps, job_title):
+    """02's select_employees_by_job_title(), with the job title search on the ngram index."""
+    predicate, params, strategy = like_predicate(caps, 'jobs', 'job_title', f"%{_escape_like(job_title)}%", alias='j')
+    cursor.execute(f"SELECT e.* FROM employees e JOIN jobs j ON e.job_id = j.job_id WHERE {predicate}", params)
+    return cursor.fetchall(), strategy
+
+
+def employees_with_email_domain(cursor, caps, domain):
+    """02's select_employees_with_email_domain(), as a range scan on email_reversed."""
+    predicate, params, strategy = like_predicate(caps, 'employees', 'email', f"%@{_escape_like(domain)}")
+    cursor.execute(f"SELECT * FROM employees WHERE {predicate}", params)
+    return cursor.fetchall(), strategy
+
+
+def explain_access(cursor, sql, params=()):
+    """[(table, type, key)] from EXPLAIN."""
+    cursor.execute("EXPLAIN " + sql, params)
+    columns = cursor.column_names
+    return [(row['table'], row['type'], row['key']) for row in (dict(zip(columns, r)) for r in cursor.fetchall())]
+
+
+if __name__ == "__main__":
+    with get_connection() as conn:
+        cursor = conn.cursor(buffered=True)
+
+        # 1. Install the search indexes (once; later runs find them)
+        # What: REVERSE(email) generated column + index, FULLTEXT ngram indexes.
+        # Why: They turn suffix and infix LIKE patterns into index lookups.
+        print("Added:", install(cursor) or 'nothing (already installed)')
+        caps = capabilities(cursor)
+        print(f"ngram_token_size: {caps['ngram_token_size']}, reversed: {caps['reversed']}, ngram: {caps['ngram']}")
+
+        # 2. Strategy per pattern shape, with EXPLAIN of the plain LIKE vs the chosen predicate
+        # How: like_predicate() reads the pattern, then picks the index that serves it.
+        for table, column, pattern in [('employees', 'email', '%@sqltutorial.org'),
+                                       ('jobs', 'job_title', '%Manager%'),
+                                       ('employees', 'last_name', 'K%'),
+                                       ('employees', 'last_name', '%an%'),
+                                       ('jobs', 'job_title', '%M_n%')]:
+            predicate, params, strategy = like_predicate(caps, table, column, pattern)
+            plain = f"SELECT * FROM {table} WHERE {table}.{column} LIKE %s"
+            fast = f"SELECT * FROM {table} WHERE {predicate}"
+            timings = []
+            for sql, sql_params in ((plain, (pattern,)), (fast, params)):
+                started = time.perf_counter()
+                for _ in range(20):
+                    cursor.execute(sql, sql_params)
+                    rows = cursor.fetchall()
+                timings.append((time.perf_counter() - started) / 20 * 1000)
+            print(f"\n{table}.{column} LIKE {pattern!r}: {strategy}, {len(rows)} rows")
+            print(f"  LIKE scan: {explain_access(cursor, plain, (pattern,))} {timings[0]:.2f} ms")
+            print(f"  {strategy}: {explain_access(cursor, fast, params)} {timings[1]:.2f} ms")
+
+        # 3. 02's searches through the accelerated predicates
+        rows, strategy = employees_by_job_title(cursor, caps, 'Manager')
+        print(f"\nEmployees with job title 'Manager' ({strategy}): {len(rows)} rows")
+        rows, strategy = employees_with_email_domain(cursor, caps, 'sqltutorial.org')
+        print(f"Employees with email domain 'sqltutorial.org' ({strategy}): {len(rows)} rows")
@@ -0,0 +1,251 @@
+"""
+Deadlock- and Lock-Timeout-Aware Transactions (MySQL)
+- run_transaction(connection, body): START TRANSACTION, body(tx), COMMIT; replayed on 1213/1205
+- @transactional(...): the same as a decorator
+- RetryStats: commits, retries per error, aborts (thread-safe, shared by many workers)
+- contention_demo(): threads updating the same rows in random order, with and without retry
+
+What: Make the manual START TRANSACTION / ROLLBACK of 11_error_handling_transactions.py
+      survive concurrent writers.
+Why: Under contention InnoDB picks a deadlock victim (1213 ER_LOCK_DEADLOCK) or a statement
+     gives up waiting (1205 ER_LOCK_WAIT_TIMEOUT). Both are expected and safe to retry:
+     the transaction did not commit. Letting them kill the job throws away the work.
+How: - Only errors in RETRYABLE are retried; anything else rolls back and propagates
+     - The whole body is replayed from START TRANSACTION: a deadlock rolls back the entire
+       transaction (savepoints included), so there is nothing to resume from
+     - Sleep between attempts is "full jitter" exponential backoff:
+           uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+       so the transactions that collided do not collide again in lockstep
+     - Give up (abort) after max_attempts or budget_seconds, re-raising the last error
+     - Called inside a transaction that is already open (uncommitted DML, or an outer
+       run_transaction / @transactional), body runs once under a SAVEPOINT of that transaction:
+       nothing is committed, a failure rolls back to the savepoint and propagates, and the
+       outermost call decides whether the whole transaction is replayed
+
+Note: the body must only touch the database through tx (no side effects outside it), because
+      it can run more than once.
+
+Each block includes what, why, and how comments.
+"""
+import sys
+import os
+import time
+import random
+import threading
+import functools
+import itertools
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+import mysql.connector
+
+# errno -> counter name
+RETRYABLE = {
+    1213: 'deadlock',           # ER_LOCK_DEADLOCK: chosen as victim, transaction rolled back
+    1205: 'lock_wait_timeout',  # ER_LOCK_WAIT_TIMEOUT: innodb_lock_wait_timeout exceeded
+}
+
+_savepoint_ids = itertools.count(1)
+
+
+def get_connection():
+    return mysql.connector.connect(
+        host=HOST,
+        user=USER,
+        password=PASSWORD,
+        database=DATABASE
+    )
+
+
+def retryable(error, errors=RETRYABLE):
+    """Counter name if error is a retryable MySQL error, else None."""
+    return errors.get(getattr(error, 'errno', None))
+
+
+class RetryStats:
+    """Counters shared by every run_transaction() call given the same instance."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {'attempts': 0, 'commits': 0, 'retries': 0, 'aborts': 0, 'failures': 0}
+        self.counters.update(dict.fromkeys(RETRYABLE.values(), 0))
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counters)
+
+
+class Transaction:
+    """What the body receives: a cursor plus savepoints scoped to this attempt."""
+
+    def __init__(self, connection, attempt):
+        self.connection = connection
+        self.cursor = connection.cursor()
+        self.attempt = attempt  # 1 on the first try
+        self._savepoints = []
+
+    def execute(self, sql, params=()):
+        self.cursor.execute(sql, params)
+        return self.cursor
+
+    def savepoint(self, name):
+        self.cursor.execute(f"SAVEPOINT {name}")
+        self._savepoints.append(name)
+
+    def rollback_to(self, name):
+        # Like MySQL: later savepoints are released, this one stays
+        self.cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+        del self._savepoints[self._savepoints.index(name) + 1:]
+
+    def release(self, name):
+        self.cursor.execute(f"RELEASE SAVEPOINT {name}")
+        self._savepoints.remove(name)
+
+
+def _run_nested(connection, body):
+    """
+    What: body(tx) as part of the transaction the caller already has open.
+    Why: Committing first would commit the caller's work outside its rollback and retry scope.
+         Retrying here is not possible either: a deadlock rolls back the caller's whole
+         transaction, so only the outermost run_transaction can replay it.
+    How: SAVEPOINT before body, RELEASE after it; on an error ROLLBACK TO SAVEPOINT and re-raise.
+    """
+    name = f"run_transaction_{next(_savepoint_ids)}"
+    tx = Transaction(connection, 1)
+    try:
+        tx.savepoint(name)
+        result = body(tx)
+        tx.release(name)
+        return result
+    except Exception:
+        try:
+            tx.cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+        except mysql.connector.Error:
+            pass  # a deadlock already rolled back the whole transaction, savepoint included
+        raise
+    finally:
+        tx.cursor.close()
+
+
+def run_transaction(connection, body, max_attempts=5, base_delay=0.05, max_delay=2.0,
+                    budget_seconds=30.0, stats=None, errors=RETRYABLE):
+    """
+    Run body(tx) in a transaction and commit; replay it on retryable errors.
+    Returns body's return value. Raises the last error when retries are exhausted.
+    If connection is already in a transaction, body joins it under a savepoint instead
+    (no commit, no retry, no stats: the outermost call does those).
+    """
+    if connection.in_transaction:
+        return _run_nested(connection, body)
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        if stats:
+            stats.incr('attempts')
+        connection.start_transaction()
+        tx = Transaction(connection, attempt)
+        try:
+            result = body(tx)
+            connection.commit()
+        except mysql.connector.Error as e:
+            connection.rollback()
+            reason = retryable(e, errors)
+            if reason is None:
+                if stats:
+                    stats.incr('failures')
+                raise
+            if stats:
+                stats.incr(reason)
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+            if attempt >= max_attempts or time.monotonic() - started + delay > budget_seconds:
+                if stats:
+                    stats.incr('aborts')
+                raise
+            if stats:
+                stats.incr('retries')
+            time.sleep(delay)
+            continue
+        except Exception:
+            connection.rollback()
+            if stats:
+                stats.incr('failures')
+            raise
+        finally:
+            tx.cursor.close()
+        if stats:
+            stats.incr('commits')
+        return result
+
+
+def transactional(**options):
+    """
+    Decorator form of run_transaction: the function gets tx first, the caller passes the connection.
+
+    Example:
+        @transactional(max_attempts=8, stats=stats)
+        def give_raise(tx, department_id, pct):
+            tx.execute("UPDATE employees SET salary = salary * %s WHERE department_id = %s",
+                       (1 + pct / 100, department_id))
+
+        give_raise(conn, 10, 5)
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(connection, *args, **kwargs):
+            return run_transaction(connection, lambda tx: function(tx, *args, **kwargs), **options)
+        return wrapper
+    return decorate
+
+
+def contention_demo(connect=get_connection, threads=8, transactions=30, rows=(100, 101, 102),
+                    hold_seconds=0.005, lock_wait_timeout=2):
+    """
+    What: Threads that each lock the same few employees rows in a random order.
+    Why: Opposite lock orders are the textbook deadlock; the rows are only re-written
+         (salary = salary), so the data does not change.
+    How: Runs the workload twice - once failing on the first error, once with retries - and
+         prints committed transactions/sec and the counters for both.
+    """
+    def body(tx):
+        order = random.sample(rows, len(rows))
+        for employee_id in order:
+            tx.execute("UPDATE employees SET salary = salary WHERE employee_id = %s", (employee_id,))
+            time.sleep(hold_seconds)  # widen the window in which locks overlap
+
+    results = {}
+    for label, max_attempts in (('no retry', 1), ('retry', 10)):
+        stats = RetryStats()
+
+        def worker():
+            connection = connect()
+            cursor = connection.cursor()
+            cursor.execute("SET SESSION innodb_lock_wait_timeout = %s", (lock_wait_timeout,))
+            cursor.close()
+            for _ in range(transactions):
+                try:
+                    run_transaction(connection, body, max_attempts=max_attempts, base_delay=0.01,
+                                    stats=stats)
+                except mysql.connector.Error:
+                    pass  # counted as an abort
+            connection.close()
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        counters = stats.snapshot()
+        counters['commits_per_sec'] = round(counters['commits'] / elapsed, 1)
+        results[label] = counters
+        print(f"{label:>8}: {counters}")
+    return results
+
+
+if __name__ == "__main__":
+    contention_demo()
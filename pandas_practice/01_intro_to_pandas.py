@@ -2,6 +2,7 @@
 Introduction to pandas with MySQL data
 - How to load data from MySQL into pandas
 - Basic DataFrame exploration
+- Compact dtypes (compact.py) and how much memory they save
 """
 import sys
 import os
@@ -9,6 +10,7 @@ import pandas as pd
 import mysql.connector
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from pandas_practice.compact import parse_schema, compact_tables, memory_report, memory_summary
 
 def get_connection():
     return mysql.connector.connect(
@@ -23,7 +25,22 @@ def load_employees_df():
         df = pd.read_sql('SELECT * FROM employees', conn)
     return df
 
+def load_all_tables():
+    with get_connection() as conn:
+        return {table: pd.read_sql(f'SELECT * FROM {table}', conn) for table in parse_schema()}
+
 if __name__ == "__main__":
     df = load_employees_df()
     print(df.head())
     print(df.info())
+
+    # Compact representation
+    # What: Same tables with schema-driven dtypes (small ints, float salary, categoricals, Arrow strings).
+    # Why: read_sql keeps strings, Decimals and dates as Python objects.
+    tables = load_all_tables()
+    compact = compact_tables(tables)
+    report = memory_report(tables, compact)
+    print("\nMemory per column (employees), bytes:")
+    print(report[report['table'] == 'employees'].to_string(index=False))
+    print("\nMemory per table, bytes:")
+    print(memory_summary(report))
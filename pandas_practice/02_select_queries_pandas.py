@@ -8,6 +8,7 @@ import pandas as pd
 import mysql.connector
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from pandas_practice.text_index import TextCatalog
 
 def get_connection():
     return mysql.connector.connect(
@@ -31,6 +32,11 @@ def select_examples():
     print(df[['first_name', 'last_name']])
     print("\nEmployees in department 1:")
     print(df[df['department_id'] == 1])
+    # What: email LIKE '%@sqltutorial.org' without scanning the column on every search.
+    # How: TextCatalog keeps a sorted index of the reversed emails (text_index.py).
+    catalog = TextCatalog({'employees': df})
+    print("\nEmployees with email domain 'sqltutorial.org':")
+    print(catalog.search('employees', 'email', '%@sqltutorial.org')[['first_name', 'last_name', 'email']])
 
 if __name__ == "__main__":
     select_examples()
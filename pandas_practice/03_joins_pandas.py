@@ -1,6 +1,7 @@
 """
 JOIN operations using pandas
 - Merge DataFrames to simulate SQL joins
+- Reuse pre-built key indexes and join indexers across joins (see join_engine.py)
 """
 import sys
 import os
@@ -8,6 +9,8 @@ import pandas as pd
 import mysql.connector
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from pandas_practice.join_engine import JoinCatalog
+from pandas_practice.org_hierarchy import OrgHierarchy
 
 def get_connection():
     return mysql.connector.connect(
@@ -22,22 +25,58 @@ def load_df(table):
         return pd.read_sql(f'SELECT * FROM {table}', conn)
 
 def join_examples():
-    employees = load_df('employees')
-    departments = load_df('departments')
-    jobs = load_df('jobs')
+    tables = ['employees', 'departments', 'jobs', 'locations', 'countries', 'regions']
+    # What: Register every table once; key indexes are built lazily and cached.
+    # Why: The four joins below all use employees.department_id -> departments.department_id,
+    #      so the key is hashed once instead of once per pd.merge call.
+    catalog = JoinCatalog({table: load_df(table) for table in tables})
     # INNER JOIN
     print("INNER JOIN (employees & departments):")
-    print(pd.merge(employees, departments, on='department_id', how='inner').head())
+    print(catalog.join('employees', 'departments', on='department_id', how='inner').head())
     # LEFT JOIN
     print("\nLEFT JOIN (all employees, departments):")
-    print(pd.merge(employees, departments, on='department_id', how='left').head())
+    print(catalog.join('employees', 'departments', on='department_id', how='left').head())
     # RIGHT JOIN
     print("\nRIGHT JOIN (all departments, employees):")
-    print(pd.merge(employees, departments, on='department_id', how='right').head())
+    print(catalog.join('employees', 'departments', on='department_id', how='right').head())
     # MULTI-TABLE JOIN
+    # What: Only the columns printed are gathered; no intermediate emp_dept frame with every column.
     print("\nMULTI-TABLE JOIN (employees, departments, jobs):")
-    emp_dept = pd.merge(employees, departments, on='department_id', how='inner')
-    print(pd.merge(emp_dept, jobs, on='job_id', how='inner').head())
+    print(catalog.star_join('employees', [
+        ('employees', 'department_id', 'departments', 'department_id'),
+        ('employees', 'job_id', 'jobs', 'job_id'),
+    ], columns={
+        'employees': ['employee_id', 'first_name', 'last_name'],
+        'departments': ['department_name'],
+        'jobs': ['job_title'],
+    }, how='inner').head())
+    # STAR JOIN: employees -> departments -> locations -> countries -> regions
+    # Why: Each hop follows a primary key, so the cached indexers are plain lookup arrays
+    #      and the whole chain is a sequence of array gathers.
+    print("\nSTAR JOIN (employees, departments, locations, countries, regions):")
+    print(catalog.star_join('employees', [
+        ('employees', 'department_id', 'departments', 'department_id'),
+        ('departments', 'location_id', 'locations', 'location_id'),
+        ('locations', 'country_id', 'countries', 'country_id'),
+        ('countries', 'region_id', 'regions', 'region_id'),
+    ], columns={
+        'employees': ['employee_id', 'first_name', 'last_name'],
+        'departments': ['department_name'],
+        'locations': ['city'],
+        'countries': ['country_name'],
+        'regions': ['region_name'],
+    }).head())
+    # RECURSIVE SELF JOIN: whole reporting structure from employees.manager_id
+    # What: Depth, direct reports, total reports and subtree payroll per manager.
+    # Why: A self join only reaches one level up; the hierarchy index answers every level.
+    employees = catalog.tables['employees']
+    hierarchy = OrgHierarchy.from_frame(employees)
+    print("\nRECURSIVE SELF JOIN (managers: depth, reports, subtree payroll):")
+    summary = pd.concat([
+        hierarchy.depths(), hierarchy.span_of_control(), hierarchy.subtree_size(),
+        hierarchy.subtree_sum(employees['salary']).rename('subtree_payroll'),
+    ], axis=1)
+    print(summary[summary['direct_reports'] > 0].head())
 
 if __name__ == "__main__":
     join_examples()
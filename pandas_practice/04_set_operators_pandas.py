@@ -1,6 +1,7 @@
 """
 Set operations using pandas
 - union, intersection, difference
+- Inputs are encoded into one shared dictionary of integer codes (see set_engine.py)
 """
 import sys
 import os
@@ -8,6 +9,7 @@ import pandas as pd
 import mysql.connector
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from pandas_practice.set_engine import union, intersect, except_
 
 def get_connection():
     return mysql.connector.connect(
@@ -25,22 +27,19 @@ def load_employees_departments():
 
 def set_operator_examples():
     employees, departments = load_employees_departments()
+    names = employees.rename(columns={'first_name': 'name'})
     # UNION
-    union = pd.concat([employees.rename(columns={'first_name': 'name'}), departments.rename(columns={'department_name': 'name'})]).drop_duplicates().reset_index(drop=True)
     print("UNION:")
-    print(union.head())
+    print(union(names, departments).head())
     # UNION ALL
-    union_all = pd.concat([employees.rename(columns={'first_name': 'name'}), departments.rename(columns={'department_name': 'name'})]).reset_index(drop=True)
     print("\nUNION ALL:")
-    print(union_all.head())
+    print(union(names, departments, all=True).head())
     # INTERSECT
-    intersect = pd.merge(employees.rename(columns={'first_name': 'name'}), departments.rename(columns={'department_name': 'name'}), on='name')
     print("\nINTERSECT:")
-    print(intersect.head())
+    print(intersect(names, departments).head())
     # EXCEPT
-    except_df = employees[~employees['first_name'].isin(departments['department_name'])]
     print("\nEXCEPT:")
-    print(except_df.head())
+    print(except_(names, departments).head())
 
 if __name__ == "__main__":
     set_operator_examples()
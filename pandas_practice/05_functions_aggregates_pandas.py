@@ -1,6 +1,7 @@
 """
 Using Functions and Aggregating Data with pandas
 - COUNT, SUM, AVG, MIN, MAX, GROUP BY equivalents
+- Window functions (running totals, lag/lead, moving averages) via window_engine.py
 """
 import sys
 import os
@@ -8,6 +9,8 @@ import pandas as pd
 import mysql.connector
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from pandas_practice.window_engine import WindowEngine
+from pandas_practice.parallel_groupby import ParallelGroupBy
 
 def get_connection():
     return mysql.connector.connect(
@@ -56,13 +59,17 @@ def aggregate_examples():
     # 5. Multiple aggregations at once
     # What: All key stats per department.
     # Why: Dashboard-style summary.
+    # How: ParallelGroupBy has the same agg() API and spreads big frames over all cores
+    #      (small frames like this one are aggregated in-process).
     print("\n5. Multiple aggregations:")
-    print(df.groupby('department_id').agg(
+    print(ParallelGroupBy(df, 'department_id').agg(
         num_employees=('employee_id', 'count'),
         total_salary=('salary', 'sum'),
         avg_salary=('salary', 'mean'),
         min_salary=('salary', 'min'),
-        max_salary=('salary', 'max')
+        max_salary=('salary', 'max'),
+        salary_std=('salary', 'std'),
+        top_3_salaries=('salary', 'top_k'),
     ))
 
     # 6. Aggregation with filtering (HAVING equivalent)
@@ -100,5 +107,30 @@ def aggregate_examples():
     print("\n10. Salary range per department:")
     print(df.groupby('department_id')['salary'].agg(salary_range=lambda x: x.max() - x.min()))
 
+    # 11. Window functions: running payroll, lag/lead, moving averages
+    # What: SUM() OVER (ORDER BY hire_date), LAG/LEAD(salary) within department,
+    #       AVG() OVER (ROWS BETWEEN 2 PRECEDING AND CURRENT ROW) over hiring cohorts.
+    # Why: Payroll growth over time, pay progression inside teams, smoothed cohort trends.
+    # How: WindowEngine sorts once per OVER clause; lag and lead share the department sort.
+    print("\n11. Window functions (running payroll, lag/lead within department):")
+    engine = WindowEngine(df)
+    by_hire = engine.over(order_by=['hire_date', 'employee_id'])
+    by_dept = engine.over(partition_by='department_id', order_by=['hire_date', 'employee_id'])
+    windowed = df[['employee_id', 'department_id', 'hire_date', 'salary']].assign(
+        running_payroll=by_hire.sum('salary', rows=(None, 0)),
+        prev_salary=by_dept.lag('salary'),
+        next_salary=by_dept.lead('salary'),
+    )
+    print(windowed.sort_values(['hire_date', 'employee_id']))
+
+    print("\n11b. 3-cohort moving average salary (cohort = hire year):")
+    cohorts = (df.assign(cohort=pd.to_datetime(df['hire_date']).dt.year, salary=df['salary'].astype(float))
+                 .groupby('cohort', as_index=False)
+                 .agg(hires=('employee_id', 'count'), avg_salary=('salary', 'mean')))
+    by_cohort = WindowEngine(cohorts).over(order_by='cohort')
+    cohorts['moving_avg_3'] = by_cohort.mean('avg_salary', rows=(-2, 0))
+    cohorts['moving_hires_3'] = by_cohort.sum('hires', rows=(-2, 0))
+    print(cohorts)
+
 if __name__ == "__main__":
     aggregate_examples()
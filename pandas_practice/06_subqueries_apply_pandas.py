@@ -2,6 +2,7 @@
 Using Subqueries and APPLY with pandas
 - Scalar, correlated, and IN subquery equivalents
 - MySQL does not support APPLY, but pandas can simulate similar logic
+- Correlated subqueries as vectorized group comparisons and semi-joins (see semi_join.py)
 """
 import sys
 import os
@@ -9,6 +10,7 @@ import pandas as pd
 import mysql.connector
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from pandas_practice.semi_join import compare_to_group_aggregate, semi_join
 
 def get_connection():
     return mysql.connector.connect(
@@ -46,21 +48,19 @@ def subquery_examples():
     # 3. Correlated subquery: Employees earning more than department average
     # What: Find employees who earn more than their department's average.
     # Why: Spot top earners per department.
-    dept_avg = employees.groupby('department_id')['salary'].transform('mean')
+    # How: Aggregate each department once, then compare every row in one vectorized step
     print("\n3. Employees earning more than department average:")
-    print(employees[employees['salary'] > dept_avg])
+    print(compare_to_group_aggregate(employees, 'salary', 'department_id', agg='mean', op='>'))
 
     # 4. EXISTS subquery: Employees in departments with at least one manager
     # What: Find employees in departments that have a manager.
     # Why: Filter for managed teams.
-    # How: Simulate EXISTS with merge
-    departments = load_df('departments')
+    # How: Simulate EXISTS with a semi-join (no duplicated rows, NULL departments never match)
     # Ensure job_id is string before using .str.contains
     job_id_str = employees['job_id'].astype(str)
     managers = employees[job_id_str.str.contains('MAN', na=False)]
-    managed_depts = managers['department_id'].unique()
     print("\n4. Employees in departments with a manager:")
-    print(employees[employees['department_id'].isin(managed_depts)])
+    print(semi_join(employees, managers, on='department_id'))
 
     # 5. APPLY-like: Add department average salary as a column (window function style)
     # What: Annotate each employee with their department's average salary.
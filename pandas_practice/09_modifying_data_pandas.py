@@ -2,6 +2,7 @@
 Modifying Data in pandas (INSERT, UPDATE, DELETE equivalents)
 - Best practices for DataFrame mutation
 - Note: pandas changes are in-memory unless written back to a database or file
+- write_back.py persists them: only the changed rows are sent to MySQL
 """
 import sys
 import os
@@ -9,6 +10,7 @@ import pandas as pd
 import mysql.connector
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from pandas_practice.write_back import diff_frames, write_back
 
 def get_connection():
     return mysql.connector.connect(
@@ -28,6 +30,7 @@ def modifying_data_examples():
     Each block includes what, why, and how comments.
     """
     departments = load_df('departments')
+    original = departments.copy()
     print("Original departments:")
     print(departments.tail())
 
@@ -49,6 +52,20 @@ def modifying_data_examples():
     print("\n2. After UPDATE (change name):")
     print(departments.tail())
 
+    # 2b. Write-back: what would have to change in MySQL
+    # What: Minimal INSERT/UPDATE/DELETE sets between the loaded and the modified frame.
+    # Why: Persist in-memory changes without rewriting the table.
+    # How: Vectorized key alignment + column-wise comparison, then batched
+    #      UPDATE ... JOIN (changed rows) / INSERT / DELETE ... IN (...) in one transaction.
+    #      commit=False + rollback keeps the demo from changing the database.
+    #      Only the table's own columns are compared (manager_id above is not a departments column).
+    modified = departments[original.columns]
+    print("\n2b. Changes to write back:", diff_frames(original, modified, 'department_id').summary())
+    with get_connection() as conn:
+        changes = write_back(conn, 'departments', original, modified, 'department_id', commit=False)
+        conn.rollback()
+    print("Written (then rolled back):", changes.summary())
+
     # 3. DELETE equivalent: Remove the test department
     # What: Delete the row with department_name 'Updated Dept'.
     # Why: Simulate data cleanup.
@@ -3,6 +3,7 @@ Error Handling and Transactions in pandas
 - Using try/except in Python
 - Simulate transaction-like logic (in-memory)
 - pandas does not support DB transactions, but you can use context managers and error handling
+- TransactionalFrame: BEGIN / SAVEPOINT / ROLLBACK TO / COMMIT with an undo log instead of copies
 """
 import sys
 import os
@@ -10,6 +11,7 @@ import pandas as pd
 import mysql.connector
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+from pandas_practice.transactional import TransactionalFrame
 
 def get_connection():
     return mysql.connector.connect(
@@ -32,31 +34,51 @@ def error_handling_transaction_examples():
     print("Original salaries (last 5):")
     print(employees[['employee_id', 'salary']].tail())
 
-    # 1. Simulate transaction: try/except with in-memory copy
+    # 1. Simulate transaction: try/except with rollback
     # What: Try to update salaries, revert on error.
     # Why: Mimic DB transaction rollback.
-    employees_copy = employees.copy()
+    # How: The with block commits on success and rolls back on an exception; only the
+    #      updated cells are logged (no employees.copy() before or after).
+    tx = TransactionalFrame(employees)
     try:
-        employees_copy.loc[employees_copy['department_id'] == 10, 'salary'] *= 1.1
-        raise Exception("Simulated error: rolling back!")
+        with tx:
+            changed = tx.update(tx.df['department_id'] == 10, 'salary', lambda s: s * 1.1)
+            print(f"\nUpdated {changed} salaries; undo log holds {tx.log_size()} cells")
+            raise Exception("Simulated error: rolling back!")
     except Exception as e:
-        print(f"\nError occurred: {e}. Rolling back changes.")
-        employees_copy = employees.copy()  # Revert to original
+        print(f"\nError occurred: {e}. Rolled back changes.")
     print("\nAfter simulated rollback (should match original):")
-    print(employees_copy[['employee_id', 'salary']].tail())
+    print(tx.df[['employee_id', 'salary']].tail())
 
     # 2. Commit: Only apply changes if no error
     # What: Only update if all is well.
     # Why: Mimic DB commit.
-    employees_copy = employees.copy()
     try:
-        employees_copy.loc[employees_copy['department_id'] == 10, 'salary'] *= 1.1
-        # No error, so "commit"
+        with tx:
+            tx.update(tx.df['department_id'] == 10, 'salary', lambda s: s * 1.1)
+        # No error, so committed
         print("\nAfter commit (salaries updated):")
-        print(employees_copy[['employee_id', 'salary']].tail())
+        print(tx.df[['employee_id', 'salary']].tail())
     except Exception as e:
         print(f"Error: {e}")
 
+    # 2b. Savepoints (same steps as the SAVEPOINT example in 11_error_handling_transactions.py)
+    # What: Undo part of a transaction and keep the rest.
+    # Why: A failed step should not discard the work done before it.
+    # How: A savepoint is a position in the undo log; rollback_to() undoes entries after it.
+    department_10 = tx.df['department_id'] == 10
+    tx.begin()
+    tx.update(department_10, 'salary', lambda s: s * 1.05)
+    tx.savepoint('before_bonus')
+    tx.update(department_10, 'salary', lambda s: s + 1000)
+    tx.insert(tx.df.tail(1).assign(employee_id=tx.df['employee_id'].max() + 1).set_axis([tx.df.index.max() + 1]))
+    tx.delete(tx.df['department_id'] == 1)
+    print(f"\nBefore ROLLBACK TO before_bonus: {len(tx.df)} rows, undo log {tx.log_size()} cells/rows")
+    tx.rollback_to('before_bonus')
+    tx.commit()
+    print(f"After ROLLBACK TO before_bonus + COMMIT ({len(tx.df)} rows, only the 5% raise kept):")
+    print(tx.df.loc[department_10, ['employee_id', 'salary']])
+
     # 3. Error handling in data processing
     # What: Handle errors in data transformation.
     # Why: Robust data pipelines.
@@ -0,0 +1,170 @@
+"""
+Memory-compact DataFrames for the HR tables, driven by hr_schema.sql
+- INT columns: smallest integer dtype that holds the data (nullable Int* when the column allows NULL)
+- DECIMAL(p, s) columns: float64, or exact int64 in units of 10**-s (cents for salary)
+- VARCHAR/CHAR columns: categorical when values repeat, Arrow-backed strings when mostly unique
+- Categoricals are shared across tables: a foreign key and the column it references
+  (locations.country_id -> countries.country_id), or columns with the same name
+  (employees.first_name / dependents.first_name), get one set of categories
+- DATE columns: datetime64[s] instead of Python date objects
+
+What: compact_tables({name: df}) returns the same tables using a fraction of the memory;
+      memory_report() shows bytes per column before and after.
+Why: read_sql gives object columns (Python str / Decimal / date per cell: ~50-100 bytes each).
+How: The schema says what each column can hold; the data says how small it can be stored.
+     Shared categories make codes comparable across tables, so joins/isin on them compare
+     small integers instead of strings.
+"""
+import os
+import re
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'hr_schema.sql'))
+
+_COLUMN = re.compile(r'^\s*(\w+)\s+(INT|DECIMAL|VARCHAR|CHAR|DATE)\b\s*(?:\(([\d\s,]+)\))?(.*)$', re.IGNORECASE)
+_FOREIGN_KEY = re.compile(r'FOREIGN KEY\s*\((\w+)\)\s*REFERENCES\s*(\w+)\s*\((\w+)\)', re.IGNORECASE)
+
+_INT_TYPES = [(np.int8, 'Int8'), (np.int16, 'Int16'), (np.int32, 'Int32'), (np.int64, 'Int64')]
+
+
+def parse_schema(schema_file=SCHEMA_FILE):
+    """
+    {table: {column: {'type', 'args', 'nullable', 'references'}}} from the CREATE TABLE statements.
+    references is (table, column) for foreign keys, else None.
+    """
+    with open(schema_file, 'r', encoding='utf-8') as file:
+        ddl = file.read()
+    schema = {}
+    for table, body in re.findall(r'CREATE TABLE\s+(\w+)\s*\((.*?)\);', ddl, re.DOTALL | re.IGNORECASE):
+        columns = {}
+        for line in body.splitlines():
+            match = _COLUMN.match(line)
+            if match:
+                name, sql_type, args, rest = match.groups()
+                columns[name] = {
+                    'type': sql_type.upper(),
+                    'args': [int(a) for a in args.split(',')] if args else [],
+                    'nullable': 'NOT NULL' not in rest.upper() and 'PRIMARY KEY' not in rest.upper(),
+                    'references': None,
+                }
+        for column, ref_table, ref_column in _FOREIGN_KEY.findall(body):
+            columns[column]['references'] = (ref_table, ref_column)
+        schema[table] = columns
+    return schema
+
+
+def _smallest_int(series, nullable):
+    values = series.dropna()
+    lo, hi = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+    for numpy_type, nullable_type in _INT_TYPES:
+        info = np.iinfo(numpy_type)
+        if info.min <= lo and hi <= info.max:
+            break
+    if nullable or series.isna().any():
+        return series.astype(nullable_type)
+    return series.astype(numpy_type)
+
+
+def _decimal(series, scale, decimal):
+    if decimal == 'float':
+        return pd.to_numeric(series, errors='coerce').astype(np.float64)
+    # Exact fixed point: round(value * 10**scale) as an integer (e.g. salary in cents)
+    scaled = pd.to_numeric(series, errors='coerce') * (10 ** scale)
+    return scaled.round().astype('Int64' if series.isna().any() else np.int64)
+
+
+def _domain(table, column, info, referenced):
+    # Columns sharing a domain share categories. An FK and the column it references are both
+    # keyed 'table.column' of the referenced column; other columns share by name.
+    if info['references']:
+        return '.'.join(info['references'])
+    if (table, column) in referenced:
+        return f"{table}.{column}"
+    return column
+
+
+def compact_tables(tables, schema=None, decimal='float', category_ratio=0.5):
+    """
+    Compact every DataFrame in tables ({name: df}) according to the schema.
+
+    decimal: 'float' (float64) or 'scaled' (int64 in units of 10**-scale, e.g. cents;
+             df.attrs['scale'][column] records the factor)
+    category_ratio: string columns whose distinct/rows ratio (in the column and across its
+                    domain) is at or below this become categorical, the rest Arrow strings
+    """
+    schema = schema or parse_schema()
+    referenced = {info['references'] for columns in schema.values() for info in columns.values()
+                  if info['references']}
+    # Pass 1: collect every string domain's values, to build shared categories
+    domain_values = {}
+    for table, df in tables.items():
+        for column, info in schema.get(table, {}).items():
+            if column in df.columns and info['type'] in ('VARCHAR', 'CHAR'):
+                domain_values.setdefault(_domain(table, column, info, referenced), []).append(df[column].dropna())
+    categories = {}
+    for domain, parts in domain_values.items():
+        values = pd.concat(parts, ignore_index=True)
+        uniques = pd.unique(values.astype(str))
+        if len(values) and len(uniques) / len(values) <= category_ratio:
+            categories[domain] = pd.Index(np.sort(uniques.astype(object)), dtype=object)
+
+    # Pass 2: convert column by column
+    compacted = {}
+    for table, df in tables.items():
+        out = {}
+        scales = {}
+        columns = schema.get(table, {})
+        for column in df.columns:
+            info = columns.get(column)
+            series = df[column]
+            if info is None:
+                out[column] = series
+            elif info['type'] == 'INT':
+                out[column] = _smallest_int(series, info['nullable'])
+            elif info['type'] == 'DECIMAL':
+                scale = info['args'][1] if len(info['args']) > 1 else 0
+                out[column] = _decimal(series, scale, decimal)
+                if decimal != 'float':
+                    scales[column] = 10 ** scale
+            elif info['type'] == 'DATE':
+                out[column] = pd.to_datetime(series).astype('datetime64[s]')
+            else:
+                domain = _domain(table, column, info, referenced)
+                # The column must repeat too: categories cost memory of their own
+                repeats = len(series) and series.nunique() / len(series) <= category_ratio
+                if domain in categories and repeats:
+                    out[column] = pd.Series(pd.Categorical(series, categories=categories[domain]),
+                                            index=series.index)
+                else:
+                    out[column] = series.astype('string[pyarrow]')
+        result = pd.DataFrame(out, index=df.index)
+        if scales:
+            result.attrs['scale'] = scales
+        compacted[table] = result
+    return compacted
+
+
+def memory_report(before, after):
+    """
+    Bytes per column before and after compaction (deep: includes Python objects).
+    before/after: {table: df} as passed to / returned by compact_tables().
+    """
+    rows = []
+    for table, df in before.items():
+        usage_before = df.memory_usage(deep=True, index=False)
+        usage_after = after[table].memory_usage(deep=True, index=False)
+        for column in df.columns:
+            rows.append((table, column, str(df[column].dtype), int(usage_before[column]),
+                         str(after[table][column].dtype), int(usage_after[column])))
+    report = pd.DataFrame(rows, columns=['table', 'column', 'dtype_before', 'bytes_before',
+                                         'dtype_after', 'bytes_after'])
+    report['ratio'] = (report['bytes_before'] / report['bytes_after'].clip(lower=1)).round(1)
+    return report
+
+
+def memory_summary(report):
+    """Per-table totals of a memory_report()."""
+    totals = report.groupby('table', sort=False)[['bytes_before', 'bytes_after']].sum()
+    totals['ratio'] = (totals['bytes_before'] / totals['bytes_after'].clip(lower=1)).round(1)
+    return totals
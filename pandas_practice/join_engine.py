@@ -0,0 +1,204 @@
+"""
+Pre-indexed join engine for pandas
+- Build a hash index per (table, key) once and reuse it for every join
+- Cache the join indexers (row positions) so INNER/LEFT/RIGHT/multi-way joins share them
+- Project only the columns you need: a star join becomes a chain of array gathers
+
+What: A small join layer on top of pandas DataFrames.
+Why: Every pd.merge call re-hashes both frames on the key and copies every column,
+     even when the same tables are joined again and again on the same key.
+How: Keys are factorized into integer codes (a categorical encoding) once per (table, key).
+     Joining two tables only matches their *unique* keys, then maps rows to positions with
+     integer gathers. The resulting (left_pos, right_pos) arrays are cached per join.
+
+Note: like SQL (and unlike pd.merge), NULL/NaN keys never match anything.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+
+class KeyIndex:
+    """
+    Hash index over one key column of one table.
+    - codes: integer code per row (-1 for NULL keys)
+    - uniques: the distinct key values (code -> value)
+    - sorter/offsets/counts: rows grouped by code (CSR layout), so the rows of
+      code c are sorter[offsets[c]:offsets[c] + counts[c]]
+    """
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values)
+        self.codes = codes
+        self.uniques = pd.Index(uniques)
+        self.counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        # cumsum - counts (not [0] + cumsum[:-1]) stays empty when there are no non-NULL keys
+        self.offsets = (np.cumsum(self.counts) - self.counts).astype(np.intp)
+        num_nulls = int((codes < 0).sum())
+        # Stable sort keeps rows of the same key in table order (like pd.merge)
+        self.sorter = np.argsort(codes, kind='stable')[num_nulls:]
+        self.is_unique = bool((self.counts <= 1).all())
+
+    def __len__(self):
+        return len(self.codes)
+
+    def first_positions(self):
+        """Row position per code (only meaningful for unique keys)."""
+        return self.sorter[self.offsets]
+
+
+def _match_codes(left_index, right_index):
+    """Map every left row to the code of its key in the right index (-1 if absent)."""
+    # Only the distinct keys are hashed; the per-row mapping is a gather.
+    unique_map = right_index.uniques.get_indexer(left_index.uniques)
+    unique_map = np.append(unique_map, -1)  # slot for NULL keys (code -1)
+    return unique_map[left_index.codes]
+
+
+def _expand(right_codes, right_index, keep_unmatched):
+    """
+    Turn per-row right codes into (left_pos, right_pos) arrays.
+    Each left row is repeated once per matching right row; unmatched rows get
+    right_pos -1 when keep_unmatched is set (LEFT JOIN) and are dropped otherwise.
+    """
+    matched = right_codes >= 0
+    if right_index.is_unique:
+        lookup = np.append(right_index.first_positions(), -1)
+        right_pos = lookup[right_codes]
+        if keep_unmatched:
+            return np.arange(len(right_codes)), right_pos
+        left_pos = np.flatnonzero(matched)
+        return left_pos, right_pos[left_pos]
+
+    counts = np.where(matched, right_index.counts[np.where(matched, right_codes, 0)], 0)
+    if keep_unmatched:
+        counts = np.maximum(counts, 1)
+    left_pos = np.repeat(np.arange(len(right_codes)), counts)
+    # Position of each output row inside its key group: 0, 1, ..., count-1
+    group_start = np.repeat(np.cumsum(counts) - counts, counts)
+    within = np.arange(len(left_pos)) - group_start
+    row_codes = right_codes[left_pos]
+    has_match = row_codes >= 0
+    right_pos = np.full(len(left_pos), -1, dtype=np.intp)
+    slots = right_index.offsets[row_codes[has_match]] + within[has_match]
+    right_pos[has_match] = right_index.sorter[slots]
+    return left_pos, right_pos
+
+
+def gather(df, positions, columns=None):
+    """
+    Build a new DataFrame from the rows at `positions` (-1 -> NULL).
+    What: Column-wise gather of only the requested columns.
+    Why: Avoid materializing columns nobody reads downstream.
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    return pd.DataFrame({col: take(df[col].array, positions, allow_fill=True) for col in columns})
+
+
+class JoinCatalog:
+    """
+    A set of named DataFrames with cached key indexes and join indexers.
+
+    Example:
+        catalog = JoinCatalog({'employees': employees, 'departments': departments})
+        catalog.join('employees', 'departments', on='department_id', how='inner')
+    """
+
+    def __init__(self, tables=None):
+        self.tables = {}
+        self._indexes = {}
+        self._indexers = {}
+        for name, df in (tables or {}).items():
+            self.register(name, df)
+
+    def register(self, name, df):
+        """Add or replace a table; cached indexes/indexers of that table are dropped."""
+        self.tables[name] = df
+        self._indexes = {k: v for k, v in self._indexes.items() if k[0] != name}
+        self._indexers = {k: v for k, v in self._indexers.items() if name not in (k[0], k[2])}
+
+    def index(self, table, key):
+        """Return the (cached) KeyIndex of table.key."""
+        cache_key = (table, key)
+        if cache_key not in self._indexes:
+            self._indexes[cache_key] = KeyIndex(self.tables[table][key])
+        return self._indexes[cache_key]
+
+    def indexer(self, left, right, left_on, right_on, how='inner'):
+        """
+        Return cached (left_pos, right_pos) row positions for a join.
+        Positions of -1 mean "no matching row" (NULLs in outer joins).
+        """
+        if how not in ('inner', 'left', 'right'):
+            raise ValueError(f"Unsupported join type: {how}")
+        cache_key = (left, left_on, right, right_on, how)
+        if cache_key not in self._indexers:
+            if how == 'right':
+                # RIGHT JOIN is a LEFT JOIN with the sides swapped
+                right_pos, left_pos = self.indexer(right, left, right_on, left_on, how='left')
+            else:
+                left_index = self.index(left, left_on)
+                right_index = self.index(right, right_on)
+                right_codes = _match_codes(left_index, right_index)
+                left_pos, right_pos = _expand(right_codes, right_index, keep_unmatched=(how == 'left'))
+            self._indexers[cache_key] = (left_pos, right_pos)
+        return self._indexers[cache_key]
+
+    def join(self, left, right, on=None, left_on=None, right_on=None, how='inner',
+             columns=None, suffixes=('_x', '_y')):
+        """
+        Join two registered tables, like pd.merge(left, right, on=..., how=...).
+        - columns: optional {table_name: [columns]} projection; default is every column
+        - the join key appears once, taken from the preserved side
+        """
+        left_on = left_on or on
+        right_on = right_on or on
+        left_pos, right_pos = self.indexer(left, right, left_on, right_on, how)
+        left_df, right_df = self.tables[left], self.tables[right]
+        columns = columns or {}
+        left_cols = list(columns.get(left, left_df.columns))
+        right_cols = list(columns.get(right, right_df.columns))
+        if left_on == right_on:
+            if how == 'right':
+                left_cols = [c for c in left_cols if c != left_on]
+            else:
+                right_cols = [c for c in right_cols if c != right_on]
+
+        left_part = gather(left_df, left_pos, left_cols)
+        right_part = gather(right_df, right_pos, right_cols)
+        overlap = set(left_part.columns) & set(right_part.columns)
+        if overlap:
+            left_part = left_part.rename(columns={c: c + suffixes[0] for c in overlap})
+            right_part = right_part.rename(columns={c: c + suffixes[1] for c in overlap})
+        return pd.concat([left_part, right_part], axis=1)
+
+    def star_join(self, base, steps, columns, how='left'):
+        """
+        Multi-way join following many-to-one keys, e.g. employees -> departments -> locations.
+        - steps: list of (from_table, from_key, to_table, to_key); from_table is the base
+          or a table reached by an earlier step, and to_key must be unique (a primary key)
+        - columns: {table_name: [columns]} to project from each table
+        - how: 'left' keeps every base row, 'inner' drops rows with any missing link
+
+        Each step is a cached lookup array in dimension space, so reaching a table is
+        one gather of the previous positions: the join is a chain of array lookups.
+        """
+        if how not in ('inner', 'left'):
+            raise ValueError(f"Unsupported join type for star_join: {how}")
+        positions = {base: np.arange(len(self.tables[base]))}
+        for from_table, from_key, to_table, to_key in steps:
+            if from_table not in positions:
+                raise ValueError(f"{from_table} is not reachable from {base}")
+            if not self.index(to_table, to_key).is_unique:
+                raise ValueError(f"{to_table}.{to_key} is not unique; use join() instead")
+            _, lookup = self.indexer(from_table, to_table, from_key, to_key, how='left')
+            prev = positions[from_table]
+            # Trailing -1 slot: a missing link (-1) stays missing, even if from_table is empty
+            positions[to_table] = np.append(lookup, -1)[prev]
+
+        if how == 'inner':
+            keep = np.logical_and.reduce([pos >= 0 for pos in positions.values()])
+            positions = {name: pos[keep] for name, pos in positions.items()}
+
+        parts = [gather(self.tables[name], positions[name], cols) for name, cols in columns.items()]
+        return pd.concat(parts, axis=1)
@@ -0,0 +1,71 @@
+"""
+Vectorized semi-joins and group-aggregate comparisons for pandas
+- pandas counterparts of the decorrelated rewrites in mysql_practice/decorrelate.py
+- EXISTS -> semi_join, NOT EXISTS -> anti_join
+- "value > AVG(value) of its group" -> compare_to_group_aggregate
+
+What: Filter rows against another table or against a per-group aggregate.
+Why: Looping over rows (df.apply with a filter per row) is O(n x group size).
+How: Aggregate each group once, then map the result back to rows with one hash lookup.
+
+Note: as in SQL, NULL keys never match.
+"""
+import operator
+import numpy as np
+import pandas as pd
+
+COMPARISONS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '=': operator.eq,
+    '<>': operator.ne,
+}
+
+
+def _as_list(columns):
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+def _key_index(df, columns):
+    # One hashable key per row: the column itself, or a MultiIndex for composite keys
+    if len(columns) == 1:
+        return pd.Index(df[columns[0]])
+    return pd.MultiIndex.from_frame(df[columns])
+
+
+def _matches(left, right, left_on, right_on):
+    left_on, right_on = _as_list(left_on), _as_list(right_on)
+    right_keys = right[right_on].dropna()
+    found = _key_index(left, left_on).isin(_key_index(right_keys, right_on).unique())
+    return found & left[left_on].notna().all(axis=1).to_numpy()
+
+
+def semi_join(left, right, on=None, left_on=None, right_on=None):
+    """Rows of left with at least one matching row in right (WHERE EXISTS)."""
+    return left[_matches(left, right, left_on or on, right_on or on)]
+
+
+def anti_join(left, right, on=None, left_on=None, right_on=None):
+    """Rows of left with no matching row in right (WHERE NOT EXISTS)."""
+    return left[~_matches(left, right, left_on or on, right_on or on)]
+
+
+def compare_to_group_aggregate(df, value_col, by, agg='mean', op='>'):
+    """
+    Rows whose value_col compares (op) true against agg(value_col) of their group.
+    Equivalent of the derived-table rewrite:
+        JOIN (SELECT by, agg(value) FROM t GROUP BY by) g ON ... WHERE value op g.value
+    """
+    if op not in COMPARISONS:
+        raise ValueError(f"Unsupported operator: {op!r}")
+    by = _as_list(by)
+    grouped = df.groupby(by, dropna=True)[value_col].agg(agg)
+    positions = grouped.index.get_indexer(_key_index(df, by))
+    group_values = np.append(grouped.to_numpy(dtype=float), np.nan)[positions]
+    values = df[value_col].to_numpy(dtype=float)
+    # NULL groups get NaN (position -1 -> the appended slot). As in SQL, a NULL on either side
+    # never compares true, not even for '<>' (where NaN != x would be True)
+    keep = COMPARISONS[op](values, group_values) & ~np.isnan(group_values) & ~np.isnan(values)
+    return df[keep]
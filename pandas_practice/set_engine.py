@@ -0,0 +1,114 @@
+"""
+Hash-based set operators for pandas
+- UNION, UNION ALL, INTERSECT [ALL], EXCEPT [ALL] with SQL semantics
+- Both inputs are encoded into one shared dictionary of integer codes
+
+What: Set operations over DataFrames whose columns line up by position (like SQL).
+Why: concat().drop_duplicates() and merge() hash raw object strings over and over;
+     merge() also returns duplicates for INTERSECT.
+How: Every column of both inputs is factorized against a shared dictionary, rows are
+     combined into one dense integer code per distinct row, and the operators become
+     counts over those codes (np.bincount) instead of string hashing.
+
+Note: like SQL set operators, NULLs compare equal to each other here.
+"""
+import numpy as np
+import pandas as pd
+
+
+class SharedDictionary:
+    """
+    Encodes two DataFrames into dense row codes 0..K-1.
+    Codes are numbered in order of first appearance over left rows then right rows,
+    so code order is also the SQL result order of a UNION.
+    """
+
+    def __init__(self, left, right):
+        if left.shape[1] != right.shape[1]:
+            raise ValueError("Set operators need the same number of columns on both sides")
+        self.columns = list(left.columns)
+        self.left_size = len(left)
+        self.uniques = []
+        column_codes = []
+        for i in range(left.shape[1]):
+            values = pd.concat([left.iloc[:, i], right.iloc[:, i]], ignore_index=True)
+            codes, uniques = pd.factorize(values, use_na_sentinel=False)
+            self.uniques.append(uniques)
+            column_codes.append(codes.astype(np.int64))
+
+        row_codes = column_codes[0]
+        for codes, uniques in zip(column_codes[1:], self.uniques[1:]):
+            # Mixed-radix combine, then re-densify so codes never overflow
+            row_codes, _ = pd.factorize(row_codes * len(uniques) + codes)
+        self.num_codes = int(row_codes.max()) + 1 if len(row_codes) else 0
+        # First row holding each code; codes are first-appearance ordered so this is sorted
+        self._first_row = np.unique(row_codes, return_index=True)[1]
+        self._column_codes = column_codes
+        self.left_codes = row_codes[:self.left_size]
+        self.right_codes = row_codes[self.left_size:]
+
+    def counts(self):
+        """Occurrences of every code on the left and on the right."""
+        return (np.bincount(self.left_codes, minlength=self.num_codes),
+                np.bincount(self.right_codes, minlength=self.num_codes))
+
+    def decode(self, codes):
+        """Turn row codes back into a DataFrame (gathering from the dictionary)."""
+        rows = self._first_row[codes]
+        return pd.DataFrame({
+            column: uniques.take(col_codes[rows])
+            for column, uniques, col_codes in zip(self.columns, self.uniques, self._column_codes)
+        })
+
+
+def _rename_like(left, right):
+    # SQL takes result column names from the first query; align the right side by position.
+    return right.set_axis(list(left.columns), axis=1)
+
+
+def union(left, right, all=False):
+    """UNION (distinct) or UNION ALL of two DataFrames."""
+    right = _rename_like(left, right)
+    if all:
+        return pd.concat([left, right], ignore_index=True)
+    encoded = SharedDictionary(left, right)
+    # Every code appears in left or right, in first-appearance order: the union is the dictionary
+    return encoded.decode(np.arange(encoded.num_codes))
+
+
+def intersect(left, right, all=False):
+    """INTERSECT (distinct rows in both) or INTERSECT ALL (min of the multiplicities)."""
+    encoded = SharedDictionary(left, _rename_like(left, right))
+    left_counts, right_counts = encoded.counts()
+    if all:
+        codes = np.repeat(np.arange(encoded.num_codes), np.minimum(left_counts, right_counts))
+    else:
+        codes = np.flatnonzero((left_counts > 0) & (right_counts > 0))
+    return encoded.decode(codes)
+
+
+def except_(left, right, all=False):
+    """EXCEPT (distinct left rows not in right) or EXCEPT ALL (multiplicity difference)."""
+    encoded = SharedDictionary(left, _rename_like(left, right))
+    left_counts, right_counts = encoded.counts()
+    if all:
+        codes = np.repeat(np.arange(encoded.num_codes), np.maximum(left_counts - right_counts, 0))
+    else:
+        codes = np.flatnonzero((left_counts > 0) & (right_counts == 0))
+    return encoded.decode(codes)
+
+
+SET_OPERATIONS = {
+    'UNION': union,
+    'INTERSECT': intersect,
+    'EXCEPT': except_,
+}
+
+
+def set_operation(left, right, op, all=False):
+    """Dispatch by SQL operator name: 'UNION', 'INTERSECT' or 'EXCEPT'."""
+    try:
+        func = SET_OPERATIONS[op.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown set operator: {op}") from None
+    return func(left, right, all=all)
@@ -0,0 +1,178 @@
+"""
+Transactional DataFrame with savepoints (copy-on-write undo log)
+- begin / savepoint / rollback_to / rollback / commit, like START TRANSACTION / SAVEPOINT /
+  ROLLBACK TO SAVEPOINT / ROLLBACK / COMMIT in 11_error_handling_transactions.py
+- Changes go through update() / insert() / delete(), which log what they overwrite
+
+What: Undo in-memory changes without keeping a full copy of the frame.
+Why: employees.copy() before a "transaction" (and again to roll back) costs O(table) memory
+     and time even when three salaries change.
+How: An undo log, like InnoDB's: every change records only what it replaces
+     - update: the old values of the touched cells (and the column dtype)
+     - insert: the row count before the append (rollback truncates)
+     - delete: the deleted rows and the previous row order
+     Rolling back replays the log backwards; a savepoint is a position in the log.
+     Cost is proportional to the change, not to the frame.
+
+Note: the frame needs a unique index (labels identify rows in the log).
+"""
+import numpy as np
+import pandas as pd
+
+
+class TransactionalFrame:
+    """
+    Example:
+        tx = TransactionalFrame(employees)
+        tx.begin()
+        tx.update(tx.df['department_id'] == 10, 'salary', lambda s: s * 1.05)
+        tx.savepoint('before_bonus')
+        tx.update(tx.df['department_id'] == 10, 'salary', lambda s: s + 1000)
+        tx.rollback_to('before_bonus')   # only the 5% raise is left
+        tx.commit()
+    """
+
+    def __init__(self, df):
+        if not df.index.is_unique:
+            raise ValueError("TransactionalFrame needs a unique index")
+        self.df = df
+        self._log = None  # None = no open transaction (autocommit)
+        self._savepoints = {}
+
+    # --- transaction control ------------------------------------------------
+
+    @property
+    def in_transaction(self):
+        return self._log is not None
+
+    def begin(self):
+        if self.in_transaction:
+            raise RuntimeError("Transaction already open")
+        self._log = []
+        self._savepoints = {}
+
+    def savepoint(self, name):
+        self._require_transaction()
+        self._savepoints[name] = len(self._log)
+
+    def rollback_to(self, name):
+        """Undo everything after the savepoint; the savepoint itself stays (later ones are released)."""
+        self._require_transaction()
+        if name not in self._savepoints:
+            raise KeyError(f"SAVEPOINT {name} does not exist")
+        position = self._savepoints[name]
+        self._undo_to(position)
+        self._savepoints = {n: p for n, p in self._savepoints.items() if p <= position}
+
+    def release_savepoint(self, name):
+        self._require_transaction()
+        del self._savepoints[name]
+
+    def rollback(self):
+        self._require_transaction()
+        self._undo_to(0)
+        self._log = None
+
+    def commit(self):
+        self._require_transaction()
+        self._log = None
+        self._savepoints = {}
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        # Commit on success, roll back on any exception (which then propagates)
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def _require_transaction(self):
+        if not self.in_transaction:
+            raise RuntimeError("No open transaction (call begin())")
+
+    def log_size(self):
+        """Number of logged cells/rows: what a rollback would have to restore."""
+        return sum(entry[-1] for entry in self._log or [])
+
+    # --- changes ----------------------------------------------------------
+
+    def _record(self, entry):
+        if self._log is not None:
+            self._log.append(entry)
+
+    def _positions(self, rows):
+        if isinstance(rows, pd.Series) and rows.dtype == bool:
+            return np.flatnonzero(rows.reindex(self.df.index, fill_value=False).to_numpy())
+        if isinstance(rows, np.ndarray) and rows.dtype == bool:
+            return np.flatnonzero(rows)
+        positions = self.df.index.get_indexer(pd.Index(rows))
+        if (positions < 0).any():
+            raise KeyError("Unknown row labels")
+        return positions
+
+    def update(self, rows, column, value):
+        """
+        UPDATE: set column for the selected rows (boolean mask or index labels).
+        value: scalar, array of the selected rows' new values, or a function of the old values.
+        """
+        positions = self._positions(rows)
+        column_position = self.df.columns.get_loc(column)
+        old_dtype = self.df[column].dtype
+        old_values = self.df[column].to_numpy()[positions].copy()
+        new_values = value(pd.Series(old_values, index=self.df.index[positions])) if callable(value) else value
+        try:
+            self.df.iloc[positions, column_position] = new_values
+        except TypeError:
+            # pandas refuses to upcast on assignment (int salary * 1.1): widen the column first;
+            # rollback writes the old values back and casts to old_dtype again
+            new_dtype = pd.Series(np.atleast_1d(new_values)).dtype
+            try:
+                wider = np.result_type(old_dtype, new_dtype)
+            except TypeError:
+                wider = object  # extension dtypes (strings, nullable ints) with mismatched values
+            self.df[column] = self.df[column].astype(wider)
+            self.df.iloc[positions, column_position] = new_values
+        self._record(('update', column, positions, old_values, old_dtype, len(positions)))
+        return len(positions)
+
+    def insert(self, rows):
+        """INSERT: append rows (DataFrame or list of dicts)."""
+        rows = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        before = len(self.df)
+        self.df = pd.concat([self.df, rows])
+        if not self.df.index.is_unique:
+            self.df = self.df.iloc[:before]
+            raise ValueError("Inserted rows duplicate existing index labels")
+        self._record(('insert', before, len(rows)))
+        return len(rows)
+
+    def delete(self, rows):
+        """DELETE: remove the selected rows (boolean mask or index labels)."""
+        positions = self._positions(rows)
+        removed = self.df.iloc[positions]
+        order = self.df.index
+        keep = np.ones(len(self.df), dtype=bool)
+        keep[positions] = False
+        self.df = self.df[keep]
+        self._record(('delete', removed, order, len(positions)))
+        return len(positions)
+
+    def _undo_to(self, position):
+        while len(self._log) > position:
+            entry = self._log.pop()
+            kind = entry[0]
+            if kind == 'update':
+                _, column, positions, old_values, old_dtype, _ = entry
+                self.df.iloc[positions, self.df.columns.get_loc(column)] = old_values
+                if self.df[column].dtype != old_dtype:
+                    self.df[column] = self.df[column].astype(old_dtype)
+            elif kind == 'insert':
+                _, before, _ = entry
+                self.df = self.df.iloc[:before]
+            else:
+                _, removed, order, _ = entry
+                self.df = pd.concat([self.df, removed]).reindex(order)
@@ -0,0 +1,217 @@
+"""
+Window functions for pandas, mirroring SQL OVER (PARTITION BY ... ORDER BY ... ROWS BETWEEN ...)
+- Running totals, moving averages, lag/lead, row_number/rank/dense_rank
+- Frames: ROWS BETWEEN <start> AND <end> given as rows=(start, end)
+    None = UNBOUNDED, negative = PRECEDING, 0 = CURRENT ROW, positive = FOLLOWING
+    e.g. rows=(None, 0) is a running total, rows=(-2, 0) a 3-row moving window
+
+What: One engine that evaluates many window expressions over a DataFrame.
+Why: groupby().transform() re-sorts/re-hashes the frame for every expression and has no frames.
+How: The frame is sorted once per (partition, order) key and that sort is shared by every
+     expression using the same OVER clause. Partitions are then contiguous, so:
+     - SUM/AVG/COUNT over any frame = difference of one global cumulative sum
+     - MIN/MAX over any frame = sparse-table range query (a sliding-window kernel)
+     - LAG/LEAD = shifted positions, masked at partition borders
+     Results are scattered back to the original row order.
+
+Notes:
+- Only ROWS frames are supported (the SQL default RANGE frame also includes tied peers).
+- NULLs are skipped by aggregates; NULL sort keys come first ascending, last descending (MySQL).
+- Partitions with NULL keys form one partition, like SQL.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+
+def _as_list(columns):
+    if columns is None:
+        return []
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+class SortedWindow:
+    """One OVER (PARTITION BY ... ORDER BY ...) clause, sorted once and reused."""
+
+    def __init__(self, df, partition_by, order_by, ascending):
+        self.index = df.index
+        n = len(df)
+        if partition_by:
+            part_codes = df.groupby(partition_by, sort=False, dropna=False).ngroup().to_numpy()
+        else:
+            part_codes = np.zeros(n, dtype=np.intp)
+        order_codes = []
+        for column, asc in zip(order_by, ascending):
+            # Rank codes keep the sort generic (numbers, dates, strings); NULL -> -1 sorts first
+            codes, _ = pd.factorize(df[column], sort=True)
+            order_codes.append(codes if asc else -codes)
+        # np.lexsort sorts by the last key first and is stable
+        self.order = np.lexsort(tuple(reversed(order_codes)) + (part_codes,)) if n else np.arange(0)
+        self.size = n
+
+        part_sorted = part_codes[self.order]
+        is_start = np.ones(n, dtype=bool)
+        is_start[1:] = part_sorted[1:] != part_sorted[:-1]
+        starts = np.flatnonzero(is_start)
+        ends = np.append(starts[1:], n)
+        group = np.cumsum(is_start) - 1
+        self.part_start = starts[group]
+        self.part_end = ends[group]  # exclusive
+
+        # Peer groups (same partition and same ORDER BY values) for RANK/DENSE_RANK
+        is_peer_start = is_start.copy()
+        for codes in order_codes:
+            sorted_codes = codes[self.order]
+            is_peer_start[1:] |= sorted_codes[1:] != sorted_codes[:-1]
+        self._is_peer_start = is_peer_start
+        self._df = df
+        self._values = {}
+
+    # --- helpers ---------------------------------------------------------
+
+    def _sorted(self, column):
+        """Column values in window order, gathered once per column."""
+        if column not in self._values:
+            self._values[column] = self._df[column].to_numpy()[self.order]
+        return self._values[column]
+
+    def _sorted_float(self, column):
+        key = (column, float)
+        if key not in self._values:
+            self._values[key] = pd.to_numeric(pd.Series(self._sorted(column)), errors='coerce').to_numpy(dtype=float)
+        return self._values[key]
+
+    def _scatter(self, sorted_result, name=None):
+        """Put results computed in window order back into the original row order."""
+        out = np.empty_like(sorted_result)
+        out[self.order] = sorted_result
+        return pd.Series(out, index=self.index, name=name)
+
+    def _frame_bounds(self, rows):
+        """Inclusive [lo, hi] positions of every row's frame, clipped to its partition."""
+        start, end = rows
+        position = np.arange(self.size)
+        lo = self.part_start if start is None else np.maximum(self.part_start, position + start)
+        hi = self.part_end - 1 if end is None else np.minimum(self.part_end - 1, position + end)
+        return lo, hi
+
+    # --- aggregates over frames -------------------------------------------
+
+    def _sum_count(self, column, rows):
+        values = self._sorted_float(column)
+        valid = ~np.isnan(values)
+        sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+        counts = np.concatenate(([0], np.cumsum(valid)))
+        lo, hi = self._frame_bounds(rows)
+        empty = lo > hi
+        lo, hi1 = np.where(empty, 0, lo), np.where(empty, 0, hi + 1)
+        return sums[hi1] - sums[lo], counts[hi1] - counts[lo]
+
+    def sum(self, column, rows=(None, 0)):
+        """SUM(column) OVER (... ROWS BETWEEN ...); NULL when the frame has no values."""
+        total, count = self._sum_count(column, rows)
+        return self._scatter(np.where(count > 0, total, np.nan), name=column)
+
+    def mean(self, column, rows=(None, 0)):
+        """AVG(column) OVER (... ROWS BETWEEN ...)."""
+        total, count = self._sum_count(column, rows)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._scatter(np.where(count > 0, total / np.maximum(count, 1), np.nan), name=column)
+
+    def count(self, column, rows=(None, 0)):
+        """COUNT(column) OVER (... ROWS BETWEEN ...)."""
+        _, count = self._sum_count(column, rows)
+        return self._scatter(count.astype(np.int64), name=column)
+
+    def _range_extreme(self, column, rows, reduce):
+        # Sparse table: level k holds reduce() over windows of length 2**k, so any frame
+        # [lo, hi] is covered by two overlapping power-of-two windows.
+        fill = np.inf if reduce is np.minimum else -np.inf
+        values = self._sorted_float(column)
+        values = np.where(np.isnan(values), fill, values)
+        lo, hi = self._frame_bounds(rows)
+        empty = lo > hi
+        length = np.where(empty, 1, hi - lo + 1)
+        # Only build the levels the widest frame needs (a 3-row window needs two)
+        max_length = int(length.max()) if self.size else 1
+        levels = [values]
+        width = 1
+        while 2 * width <= max_length:
+            prev = levels[-1]
+            levels.append(reduce(prev[:-width], prev[width:]))
+            width *= 2
+        k = np.floor(np.log2(length)).astype(np.intp)
+        result = np.full(self.size, np.nan)
+        for level in np.unique(k[~empty]):
+            rows_at = np.flatnonzero((k == level) & ~empty)
+            table = levels[level]
+            result[rows_at] = reduce(table[lo[rows_at]], table[hi[rows_at] - (1 << level) + 1])
+        result[np.isinf(result)] = np.nan
+        return self._scatter(result, name=column)
+
+    def min(self, column, rows=(None, 0)):
+        """MIN(column) OVER (... ROWS BETWEEN ...)."""
+        return self._range_extreme(column, rows, np.minimum)
+
+    def max(self, column, rows=(None, 0)):
+        """MAX(column) OVER (... ROWS BETWEEN ...)."""
+        return self._range_extreme(column, rows, np.maximum)
+
+    # --- navigation and ranking -------------------------------------------
+
+    def _shift(self, column, offset, default):
+        values = self._sorted(column)
+        source = np.arange(self.size) + offset
+        valid = (source >= self.part_start) & (source < self.part_end)
+        result = take(values, np.where(valid, source, -1), allow_fill=True, fill_value=default)
+        return self._scatter(result, name=column)
+
+    def lag(self, column, offset=1, default=None):
+        """LAG(column, offset, default): value `offset` rows earlier in the partition."""
+        return self._shift(column, -offset, default)
+
+    def lead(self, column, offset=1, default=None):
+        """LEAD(column, offset, default): value `offset` rows later in the partition."""
+        return self._shift(column, offset, default)
+
+    def row_number(self):
+        """ROW_NUMBER(): 1, 2, 3, ... within each partition."""
+        return self._scatter(np.arange(self.size) - self.part_start + 1, name='row_number')
+
+    def rank(self):
+        """RANK(): ties share a rank, gaps after ties."""
+        position = np.arange(self.size)
+        peer_start = np.maximum.accumulate(np.where(self._is_peer_start, position, 0))
+        return self._scatter(peer_start - self.part_start + 1, name='rank')
+
+    def dense_rank(self):
+        """DENSE_RANK(): ties share a rank, no gaps."""
+        peers = np.cumsum(self._is_peer_start)
+        return self._scatter(peers - peers[self.part_start] + 1, name='dense_rank')
+
+
+class WindowEngine:
+    """
+    Evaluates window expressions over one DataFrame, sharing sorts between them.
+
+    Example:
+        engine = WindowEngine(employees)
+        by_dept = engine.over(partition_by='department_id', order_by='hire_date')
+        employees['prev_salary'] = by_dept.lag('salary')
+        employees['next_salary'] = by_dept.lead('salary')   # same sort, no re-sort
+        employees['running_payroll'] = engine.over(order_by='hire_date').sum('salary')
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._windows = {}
+
+    def over(self, partition_by=None, order_by=None, ascending=True):
+        """Return the (cached) SortedWindow for an OVER clause."""
+        partition_by, order_by = _as_list(partition_by), _as_list(order_by)
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(order_by)
+        key = (tuple(partition_by), tuple(order_by), tuple(ascending))
+        if key not in self._windows:
+            self._windows[key] = SortedWindow(self.df, partition_by, order_by, ascending)
+        return self._windows[key]
@@ -0,0 +1,209 @@
+"""
+Write pandas changes back to MySQL: vectorized diff + batched DML
+- diff_frames(original, modified, key): the rows to INSERT, UPDATE and DELETE
+- write_back(connection, table, original, modified, key): applies them in one transaction
+
+What: Persist what 09_modifying_data_pandas.py changes in memory, writing only the changed rows.
+Why: Re-writing the whole frame (or a row-by-row loop) costs O(table); with 1% of a
+     million rows changed, only those 10,000 rows should travel to the server.
+How: - Keys are aligned with one hash lookup (Index.get_indexer), not a merge or a loop
+     - Each column is compared as a whole array (NULL == NULL counts as unchanged)
+     - Updated rows are grouped by the set of columns that changed, and each group becomes one
+       UPDATE t JOIN (SELECT ... UNION ALL SELECT ...) v USING (key) SET col = v.col of only those
+       columns. A real UPDATE: an INSERT ... ON DUPLICATE KEY UPDATE of a few columns fails in
+       strict mode on NOT NULL columns without a default (error 1364), and it would re-create
+       rows another session deleted in the meantime
+     - New rows go out as multi-row INSERT ... AS new ON DUPLICATE KEY UPDATE col = new.col
+       (a row alias; VALUES(col) is deprecated since MySQL 8.0.20)
+     - Deleted keys go out as DELETE ... WHERE key IN (...) batches
+     - Everything runs in one transaction: all changes or none. Inside a transaction the
+       caller already opened, it is a savepoint of that transaction instead
+
+Each block includes what, why, and how comments.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _as_list(columns):
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+def _key_index(df, key):
+    if len(key) == 1:
+        return pd.Index(df[key[0]])
+    return pd.MultiIndex.from_frame(df[key])
+
+
+def _unchanged(old, new):
+    # Element-wise equality where two NULLs are equal; dtypes may differ (int vs float after NaN)
+    old_na, new_na = pd.isna(old), pd.isna(new)
+    with np.errstate(invalid='ignore'):
+        try:
+            equal = np.asarray(old == new, dtype=bool)
+        except (TypeError, ValueError):
+            equal = np.array([a == b for a, b in zip(old, new)], dtype=bool)
+    return (equal & ~old_na & ~new_na) | (old_na & new_na)
+
+
+class Changes:
+    """Result of diff_frames(): inserts/updates are row subsets of modified, deletes of original."""
+
+    def __init__(self, key, inserts, updates, changed_mask, deletes):
+        self.key = key
+        self.inserts = inserts
+        self.updates = updates
+        self.changed_mask = changed_mask  # DataFrame of bools aligned with updates (value columns)
+        self.deletes = deletes
+
+    def summary(self):
+        return {'inserts': len(self.inserts), 'updates': len(self.updates), 'deletes': len(self.deletes),
+                'cells_changed': int(self.changed_mask.to_numpy().sum())}
+
+    def __repr__(self):
+        return f"Changes({self.summary()})"
+
+
+def diff_frames(original, modified, key):
+    """
+    Minimal insert/update/delete sets turning original into modified (rows matched by key).
+    Both frames must have the same columns; keys must be unique.
+    """
+    key = _as_list(key)
+    if set(original.columns) != set(modified.columns):
+        raise ValueError("original and modified must have the same columns")
+    original_keys, modified_keys = _key_index(original, key), _key_index(modified, key)
+    if not original_keys.is_unique or not modified_keys.is_unique:
+        raise ValueError(f"Key {key} is not unique")
+
+    # Where each modified row was in original (-1 = new row)
+    positions = original_keys.get_indexer(modified_keys)
+    matched = positions >= 0
+    deleted = ~original_keys.isin(modified_keys)
+
+    value_columns = [column for column in modified.columns if column not in key]
+    changed = {}
+    for column in value_columns:
+        old = original[column].to_numpy()[positions[matched]]
+        new = modified[column].to_numpy()[matched]
+        changed[column] = ~_unchanged(old, new)
+    changed = pd.DataFrame(changed, columns=value_columns)
+    row_changed = changed.to_numpy().any(axis=1) if value_columns else np.zeros(matched.sum(), dtype=bool)
+
+    updates = modified[matched][row_changed]
+    return Changes(key, modified[~matched], updates,
+                   changed[row_changed].set_axis(updates.index), original[deleted][key])
+
+
+def _python_values(df):
+    """Rows as lists of Python objects MySQL Connector accepts (NULL for NaN/NaT/NA)."""
+    columns = []
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = np.array(series.dt.to_pydatetime(), dtype=object)
+        else:
+            # numpy scalars -> Python int/float; copy=True: without it this can be a (read-only,
+            # under copy-on-write) view of the caller's object column, which the NULLs below would hit
+            values = series.to_numpy(dtype=object, copy=True)
+        values[pd.isna(series).to_numpy()] = None
+        columns.append(values)
+    return [list(row) for row in zip(*columns)] if columns else []
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def upsert_sql(table, columns, update_columns, rows):
+    """Multi-row INSERT ... ON DUPLICATE KEY UPDATE for `rows` rows (placeholders only)."""
+    row_sql = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row_sql] * rows)}"
+    if update_columns:
+        # Row alias (MySQL 8.0.19+) instead of the deprecated VALUES(column)
+        assignments = ', '.join(f"{column} = new.{column}" for column in update_columns)
+        sql += f" AS new ON DUPLICATE KEY UPDATE {assignments}"
+    return sql
+
+
+def update_sql(table, key, update_columns, rows):
+    """
+    Multi-row UPDATE of update_columns for `rows` rows: parameters are (key..., columns...) per row.
+    The new values are a UNION ALL derived table joined on the key; rows that no longer exist
+    are not updated (and not re-created).
+    """
+    columns = key + update_columns
+    first = 'SELECT ' + ', '.join(f"%s AS {column}" for column in columns)
+    rest = ' UNION ALL SELECT ' + ', '.join(['%s'] * len(columns))
+    join = ' AND '.join(f"t.{column} = v.{column}" for column in key)
+    assignments = ', '.join(f"t.{column} = v.{column}" for column in update_columns)
+    return f"UPDATE {table} t JOIN ({first}{rest * (rows - 1)}) v ON {join} SET {assignments}"
+
+
+def delete_sql(table, key, rows):
+    """DELETE ... WHERE key IN (...) for `rows` keys (composite keys use row constructors)."""
+    if len(key) == 1:
+        return f"DELETE FROM {table} WHERE {key[0]} IN ({', '.join(['%s'] * rows)})"
+    row_sql = '(' + ', '.join(['%s'] * len(key)) + ')'
+    return f"DELETE FROM {table} WHERE ({', '.join(key)}) IN ({', '.join([row_sql] * rows)})"
+
+
+def write_back(connection, table, original, modified, key, batch_size=1000, commit=True):
+    """
+    Apply diff_frames(original, modified, key) to `table` in one transaction.
+    Updated rows only write the columns that changed (rows are grouped by changed-column set).
+    commit=False leaves the transaction open (the caller commits or rolls back).
+    If the connection is already in a transaction, the changes join it under a savepoint:
+    a failure rolls back only this write_back, and nothing is committed here.
+    Returns the Changes summary.
+    """
+    changes = diff_frames(original, modified, key)
+    key = changes.key
+    joined = connection.in_transaction
+    cursor = connection.cursor()
+    try:
+        if joined:
+            cursor.execute("SAVEPOINT write_back")
+        else:
+            connection.start_transaction()
+
+        # 1. Deletes first: a key deleted and re-inserted under the same value stays consistent
+        for batch in _batches(_python_values(changes.deletes), batch_size):
+            cursor.execute(delete_sql(table, key, len(batch)), [value for row in batch for value in row])
+
+        # 2. Updates, grouped by which columns changed: each group is one statement shape
+        if len(changes.updates):
+            mask = changes.changed_mask.to_numpy()
+            patterns, group_of_row = np.unique(mask, axis=0, return_inverse=True)
+            value_columns = list(changes.changed_mask.columns)
+            for group, pattern in enumerate(patterns):
+                update_columns = [column for column, flag in zip(value_columns, pattern) if flag]
+                rows = changes.updates[group_of_row.ravel() == group][key + update_columns]
+                for batch in _batches(_python_values(rows), batch_size):
+                    cursor.execute(update_sql(table, key, update_columns, len(batch)),
+                                   [value for row in batch for value in row])
+
+        # 3. Inserts: full rows
+        if len(changes.inserts):
+            columns = list(changes.inserts.columns)
+            for batch in _batches(_python_values(changes.inserts), batch_size):
+                cursor.execute(upsert_sql(table, columns, [c for c in columns if c not in key], len(batch)),
+                               [value for row in batch for value in row])
+        if joined:
+            cursor.execute("RELEASE SAVEPOINT write_back")
+        elif commit:
+            connection.commit()
+    except Exception:
+        if joined:
+            try:
+                cursor.execute("ROLLBACK TO SAVEPOINT write_back")
+            except Exception:
+                # A deadlock already rolled back the whole transaction, savepoint included
+                connection.rollback()
+        else:
+            connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return changes
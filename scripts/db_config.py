@@ -10,3 +10,12 @@ HOST = os.environ.get('MYSQL_HOST', 'localhost')
 USER = os.environ.get('MYSQL_USER')
 PASSWORD = os.environ.get('MYSQL_PASSWORD')
 DATABASE = os.environ.get('MYSQL_DATABASE', 'hr_db')
+
+# Optional read replicas for scripts/db_router.py: comma-separated host[:port] entries
+# (e.g. MYSQL_REPLICAS=127.0.0.1:3307,127.0.0.1:3308); empty = everything goes to HOST
+PORT = int(os.environ.get('MYSQL_PORT', 3306))
+REPLICAS = [entry.strip() for entry in os.environ.get('MYSQL_REPLICAS', '').split(',') if entry.strip()]
+
+# Optional shards for mysql_practice/sharding.py: comma-separated host[:port] entries, each holding
+# hr_db with some departments' employees (e.g. MYSQL_SHARDS=127.0.0.1:3311,127.0.0.1:3312)
+SHARDS = [entry.strip() for entry in os.environ.get('MYSQL_SHARDS', '').split(',') if entry.strip()]
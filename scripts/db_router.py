@@ -0,0 +1,361 @@
+"""
+Read/Write-Splitting Connection Router
+- One primary (MYSQL_HOST) plus read replicas (MYSQL_REPLICAS in .env)
+- Read-only statements go to a replica (round-robin or least-outstanding-requests),
+  everything else to the primary
+- Replica lag is measured with a heartbeat table; lagging or unreachable replicas are skipped
+- A session that writes is pinned to the primary, so it reads its own writes
+
+What: routed_connection() is a drop-in for mysql.connector.connect() in the reporting
+      modules (05-08), which only read.
+Why: Reporting queries compete with the DML of 09/11 for the primary's CPU and buffer pool;
+     replicas hold the same data and are otherwise idle.
+How: - Each statement is classified by its first keyword: SELECT / WITH / SHOW / EXPLAIN /
+       DESCRIBE are reads unless they lock (FOR UPDATE / FOR SHARE), assign (INTO) or use
+       session state (@variables, LAST_INSERT_ID(), GET_LOCK(), ...)
+     - A background thread REPLACEs NOW(6) into the heartbeat table on the primary every
+       heartbeat_interval seconds; on each replica, lag = NOW(6) - the replicated timestamp
+       (resolution: heartbeat_interval; primary and replicas need synchronized clocks)
+     - Once a session writes (or starts a transaction) all its statements use the primary,
+       for pin_seconds or, by default, for the rest of the session
+
+Two local instances (Docker; any replication setup works):
+    docker run -d --name hr-primary -p 3306:3306 -e MYSQL_ROOT_PASSWORD=pw mysql:8.0 \\
+        --server-id=1 --log-bin --gtid-mode=ON --enforce-gtid-consistency=ON
+    docker run -d --name hr-replica -p 3307:3306 -e MYSQL_ROOT_PASSWORD=pw mysql:8.0 \\
+        --server-id=2 --gtid-mode=ON --enforce-gtid-consistency=ON --super-read-only=ON
+    # on the replica:
+    CHANGE REPLICATION SOURCE TO SOURCE_HOST='host.docker.internal', SOURCE_PORT=3306,
+        SOURCE_USER='root', SOURCE_PASSWORD='pw', SOURCE_AUTO_POSITION=1, GET_SOURCE_PUBLIC_KEY=1;
+    START REPLICA;
+    # then load hr_db on the primary (python scripts/setup_database.py) and run
+    MYSQL_REPLICAS=127.0.0.1:3307 python scripts/db_router.py
+"""
+import sys
+import os
+import re
+import time
+import threading
+import itertools
+from collections import Counter
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.db_config import HOST, PORT, USER, PASSWORD, DATABASE, REPLICAS
+import mysql.connector
+
+HEARTBEAT_TABLE = 'heartbeat'
+
+_READ = re.compile(r'^\s*(?:/\*.*?\*/\s*|\(\s*)*(SELECT|WITH|SHOW|EXPLAIN|DESCRIBE|DESC)\b', re.IGNORECASE | re.DOTALL)
+_NOT_REPLICA_SAFE = re.compile(
+    r'\bFOR\s+(?:UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bINTO\b|(?<!@)@(?!@)\w'
+    r'|\b(?:LAST_INSERT_ID|FOUND_ROWS|ROW_COUNT|GET_LOCK|RELEASE_LOCK|IS_USED_LOCK|SLEEP)\s*\(',
+    re.IGNORECASE)
+
+
+_WITH_STATEMENT = re.compile(r'\b(SELECT|TABLE|VALUES|UPDATE|DELETE|INSERT|REPLACE)\b', re.IGNORECASE)
+
+
+def _with_statement(sql):
+    """Keyword of the statement after a WITH ... AS (...) list: the first one outside parentheses."""
+    masked = re.sub(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`|/\*.*?\*/|--[^\n]*|#[^\n]*",
+                    ' ', sql, flags=re.DOTALL)
+    depth, depths = 0, []
+    for char in masked:
+        depths.append(depth)
+        depth += (char == '(') - (char == ')')
+    for match in _WITH_STATEMENT.finditer(masked):
+        if depths[match.start()] == 0:
+            return match.group(1).upper()
+    return 'SELECT'  # (SELECT ...) in parentheses: the only statement that can be parenthesized
+
+
+def is_read_only(sql):
+    """True when sql can run on any replica without changing the session's results."""
+    match = _READ.match(sql)
+    if not match or _NOT_REPLICA_SAFE.search(sql):
+        return False
+    # WITH c AS (...) UPDATE/DELETE ... is a write: classify by the statement after the CTEs
+    return match.group(1).upper() != 'WITH' or _with_statement(sql[match.end():]) in ('SELECT', 'TABLE', 'VALUES')
+
+
+def _endpoint(entry, default_port=3306):
+    host, _, port = entry.partition(':')
+    return {'host': host, 'port': int(port) if port else default_port}
+
+
+class Backend:
+    """One server: connection settings plus routing state (outstanding requests, lag)."""
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self.outstanding = 0
+        self.lag = None  # seconds behind the primary; None = unknown / unreachable
+
+    def connect(self, **options):
+        return mysql.connector.connect(**self.config, **options)
+
+    def __repr__(self):
+        return f"Backend({self.name}, outstanding={self.outstanding}, lag={self.lag})"
+
+
+class Router:
+    """
+    Example:
+        router = Router.from_config()          # MYSQL_HOST + MYSQL_REPLICAS
+        with router.connect() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT COUNT(*) AS n FROM employees")      # a replica
+            cursor.execute("UPDATE jobs SET max_salary = max_salary")   # primary, session pinned
+            cursor.execute("SELECT COUNT(*) AS n FROM employees")      # primary
+    """
+
+    def __init__(self, primary, replicas=(), policy='round_robin', max_lag=2.0, pin_seconds=None,
+                 heartbeat_interval=0.5, heartbeat_table=HEARTBEAT_TABLE):
+        if policy not in ('round_robin', 'least_outstanding'):
+            raise ValueError(f"Unknown policy {policy!r}")
+        self.primary = Backend('primary', primary)
+        self.replicas = [Backend(f"replica{i + 1}({config['host']}:{config['port']})", config)
+                         for i, config in enumerate(replicas)]
+        self.policy = policy
+        self.max_lag = max_lag
+        self.pin_seconds = pin_seconds
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_table = heartbeat_table
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+        self._heartbeat = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_config(cls, **options):
+        credentials = {'user': USER, 'password': PASSWORD, 'database': DATABASE}
+        primary = dict(credentials, host=HOST, port=PORT)
+        replicas = [dict(credentials, **_endpoint(entry)) for entry in REPLICAS]
+        return cls(primary, replicas, **options)
+
+    # --- replica selection --------------------------------------------------
+
+    def healthy_replicas(self):
+        return [replica for replica in self.replicas
+                if replica.lag is not None and replica.lag <= self.max_lag]
+
+    def choose_replica(self):
+        """A replica for the next read, or None (no healthy replica: use the primary)."""
+        with self._lock:
+            candidates = self.healthy_replicas()
+            if not candidates:
+                return None
+            turn = next(self._turn)
+            if self.policy == 'least_outstanding':
+                # Fewest in-flight requests; the rotating offset breaks ties fairly
+                rotated = candidates[turn % len(candidates):] + candidates[:turn % len(candidates)]
+                return min(rotated, key=lambda replica: replica.outstanding)
+            return candidates[turn % len(candidates)]
+
+    # --- heartbeat ------------------------------------------------------------
+
+    def _beat_loop(self):
+        primary, replicas = None, {}
+        while not self._stop.is_set():
+            try:
+                if primary is None:
+                    primary = self.primary.connect(autocommit=True)
+                    cursor = primary.cursor()
+                    cursor.execute(f"CREATE TABLE IF NOT EXISTS {self.heartbeat_table} "
+                                   f"(id TINYINT PRIMARY KEY, ts TIMESTAMP(6) NOT NULL)")
+                    cursor.close()
+                cursor = primary.cursor()
+                cursor.execute(f"REPLACE INTO {self.heartbeat_table} (id, ts) VALUES (1, NOW(6))")
+                cursor.close()
+            except mysql.connector.Error:
+                primary = None  # reconnect next round; replica lags keep growing meanwhile
+            for replica in self.replicas:
+                try:
+                    if replica.name not in replicas:
+                        replicas[replica.name] = replica.connect(autocommit=True)
+                    cursor = replicas[replica.name].cursor()
+                    cursor.execute(f"SELECT TIMESTAMPDIFF(MICROSECOND, ts, NOW(6)) / 1e6 "
+                                   f"FROM {self.heartbeat_table} WHERE id = 1")
+                    row = cursor.fetchone()
+                    cursor.close()
+                    replica.lag = float(row[0]) if row else None
+                except mysql.connector.Error:
+                    replica.lag = None
+                    replicas.pop(replica.name, None)
+            self._stop.wait(self.heartbeat_interval)
+        for connection in [primary] + list(replicas.values()):
+            if connection is not None:
+                connection.close()
+
+    def start_heartbeat(self, wait=True):
+        """Start the heartbeat thread (once); wait=True returns after the first lag measurement."""
+        if self._heartbeat is None and self.replicas:
+            self._heartbeat = threading.Thread(target=self._beat_loop, name='hr-heartbeat', daemon=True)
+            self._heartbeat.start()
+            if wait:
+                deadline = time.monotonic() + 5 * self.heartbeat_interval + 2
+                while time.monotonic() < deadline and all(r.lag is None for r in self.replicas):
+                    time.sleep(0.05)
+
+    def stop_heartbeat(self):
+        if self._heartbeat is not None:
+            self._stop.set()
+            self._heartbeat.join()
+            self._heartbeat = None
+            self._stop.clear()
+
+    def connect(self):
+        self.start_heartbeat()
+        return RoutedConnection(self)
+
+
+class RoutedCursor:
+    """Cursor facade: execute() picks the server; fetch*/description/rowcount come from its cursor."""
+
+    def __init__(self, session, options):
+        self._session = session
+        self._options = options
+        self._cursors = {}
+        self._cursor = None
+        self.backend = None  # where the last statement ran
+
+    def _real_cursor(self, backend):
+        if backend.name not in self._cursors:
+            options = dict(self._options)
+            if backend is not self._session.router.primary:
+                options.setdefault('buffered', True)  # the request is finished when execute() returns
+            self._cursors[backend.name] = self._session.connection_to(backend).cursor(**options)
+        return self._cursors[backend.name]
+
+    def execute(self, sql, params=None):
+        backend = self._session.route(sql)
+        cursor = self._real_cursor(backend)
+        with self._session.router._lock:
+            backend.outstanding += 1
+        try:
+            result = cursor.execute(sql, params)
+        finally:
+            with self._session.router._lock:
+                backend.outstanding -= 1
+                self._session.router.stats[backend.name] += 1
+        self._cursor, self.backend = cursor, backend
+        return result
+
+    def executemany(self, sql, seq_params):
+        self._session.pin()
+        self._cursor = self._real_cursor(self._session.router.primary)
+        self.backend = self._session.router.primary
+        return self._cursor.executemany(sql, seq_params)
+
+    def __getattr__(self, name):
+        if self._cursor is None:
+            raise AttributeError(name)
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def close(self):
+        for cursor in self._cursors.values():
+            cursor.close()
+        self._cursors = {}
+
+
+class RoutedConnection:
+    """A session: lazily opened connections to the primary and to the replicas it reads from."""
+
+    def __init__(self, router):
+        self.router = router
+        self._connections = {}
+        self._pinned_until = None  # None = not pinned; float('inf') = for the rest of the session
+
+    def connection_to(self, backend):
+        if backend.name not in self._connections:
+            # Replicas: autocommit, so every read sees the newest replicated data
+            options = {} if backend is self.router.primary else {'autocommit': True}
+            self._connections[backend.name] = backend.connect(**options)
+        return self._connections[backend.name]
+
+    @property
+    def pinned(self):
+        return self._pinned_until is not None and time.monotonic() < self._pinned_until
+
+    def pin(self):
+        seconds = self.router.pin_seconds
+        self._pinned_until = float('inf') if seconds is None else time.monotonic() + seconds
+
+    def route(self, sql):
+        if not is_read_only(sql):
+            self.pin()
+            return self.router.primary
+        if not self.router.replicas or self.pinned:
+            return self.router.primary
+        return self.router.choose_replica() or self.router.primary
+
+    # --- connection API used by the practice modules ---------------------------
+
+    def cursor(self, **options):
+        return RoutedCursor(self, options)
+
+    def start_transaction(self, **options):
+        self.pin()
+        self.connection_to(self.router.primary).start_transaction(**options)
+
+    @property
+    def in_transaction(self):
+        primary = self._connections.get(self.router.primary.name)
+        return bool(primary and primary.in_transaction)
+
+    def commit(self):
+        if self.router.primary.name in self._connections:
+            self._connections[self.router.primary.name].commit()
+
+    def rollback(self):
+        if self.router.primary.name in self._connections:
+            self._connections[self.router.primary.name].rollback()
+
+    def is_connected(self):
+        return all(connection.is_connected() for connection in self._connections.values())
+
+    def close(self):
+        for connection in self._connections.values():
+            connection.close()
+        self._connections = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+
+_default_router = None
+
+
+def routed_connection():
+    """RoutedConnection from scripts/db_config.py settings (one shared Router per process)."""
+    global _default_router
+    if _default_router is None:
+        _default_router = Router.from_config()
+    return _default_router.connect()
+
+
+if __name__ == "__main__":
+    # Demo: reads spread over the replicas until the session writes, then stay on the primary
+    router = Router.from_config()
+    with router.connect() as conn:
+        cursor = conn.cursor(dictionary=True)
+        print(f"Replica lag: {[(r.name, r.lag) for r in router.replicas] or 'no replicas configured'}")
+        for _ in range(4):
+            cursor.execute("SELECT COUNT(*) AS employees FROM employees")
+            print(f"{cursor.backend.name:<28} {cursor.fetchall()}")
+        cursor.execute("UPDATE jobs SET max_salary = max_salary WHERE job_id = 1")
+        conn.commit()
+        print(f"{cursor.backend.name:<28} UPDATE (session pinned to the primary)")
+        cursor.execute("SELECT COUNT(*) AS employees FROM employees")
+        print(f"{cursor.backend.name:<28} {cursor.fetchall()}")
+        cursor.close()
+    router.stop_heartbeat()
+    print(f"Statements per server: {dict(router.stats)}")
@@ -0,0 +1,376 @@
+"""
+Incremental MySQL -> Parquet snapshot exporter
+- Streams every HR table in primary-key order, chunk by chunk, into Parquet files
+- Partitioned tables are written Hive-style (employees/department_id=10/data.parquet)
+- Later runs fetch only new/changed rows and rewrite only the partitions they touch
+
+What: Keep data/parquet/ in line with hr_db without re-reading whole tables (load_hr_data.py style).
+Why: SELECT * of every table on every run loads the OLTP server and rewrites files that did not change.
+How: Each table is cut into primary-key ranges (pk DIV range_width; CRC32(pk) buckets for
+     non-integer keys). State in data/parquet/_state.json keeps, per table:
+     - strategy 'checksum': COUNT(*) and BIT_XOR(CRC32(row)) per range. Ranges whose checksum
+       changed are re-fetched whole; untouched ranges cost one aggregate row each.
+     - strategy 'updated_at' (table has an updated_at column, see add_updated_at_sql()): rows with
+       updated_at >= the stored high-water mark are fetched; a primary-key-only checksum per range
+       still catches deletes.
+     - the primary-key high-water mark (largest key exported) and, for 'updated_at', the
+       largest updated_at seen.
+     Stale integer-key ranges are re-fetched as pk >= lo AND pk < hi spans (adjacent ranges
+     merged), so MySQL seeks the primary key instead of computing pk DIV range_width for every
+     row; ranges past the previous high-water mark hold only appended rows and are one pk > mark.
+     A partition file is rewritten (to a temp file, then renamed) only if it held a replaced
+     row or receives a new one. A table's entry in _state.json is saved only after its files,
+     so a failed run is simply redone from the previous state.
+
+Run `python scripts/export_parquet.py` (first run = full export).
+"""
+import sys
+import os
+import json
+import shutil
+import time
+import zlib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+EXPORT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'parquet'))
+STATE_FILE = '_state.json'
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+# Primary key of every HR table, and the column each table is partitioned by (None = one file)
+TABLES = {
+    'regions': ('region_id', None),
+    'countries': ('country_id', None),
+    'locations': ('location_id', None),
+    'jobs': ('job_id', None),
+    'departments': ('department_id', None),
+    'employees': ('employee_id', 'department_id'),
+    'dependents': ('dependent_id', None),
+}
+
+HASH_BUCKETS = 64
+
+_ARROW_TYPES = {
+    'tinyint': pa.int8(), 'smallint': pa.int16(), 'mediumint': pa.int32(), 'int': pa.int32(),
+    'bigint': pa.int64(), 'float': pa.float32(), 'double': pa.float64(),
+    'date': pa.date32(), 'datetime': pa.timestamp('us'), 'timestamp': pa.timestamp('us'),
+}
+
+
+def add_updated_at_sql(table):
+    """DDL that adds an indexed updated_at column maintained by MySQL (enables the 'updated_at' strategy)."""
+    return (f"ALTER TABLE {table} "
+            f"ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP, "
+            f"ADD INDEX idx_{table}_updated_at (updated_at)")
+
+
+def arrow_schema(cursor, table):
+    """Arrow schema of a MySQL table, from information_schema (so every chunk gets the same types)."""
+    cursor.execute('''SELECT COLUMN_NAME, DATA_TYPE, NUMERIC_PRECISION, NUMERIC_SCALE
+                      FROM information_schema.columns
+                      WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                      ORDER BY ORDINAL_POSITION''', (table,))
+    fields = []
+    for name, data_type, precision, scale in cursor.fetchall():
+        data_type = data_type.lower()
+        if data_type == 'decimal':
+            arrow_type = pa.decimal128(int(precision), int(scale))
+        else:
+            arrow_type = _ARROW_TYPES.get(data_type, pa.string())
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+class _Ranges:
+    """Primary-key ranges of one table, computed the same way in SQL and in NumPy."""
+
+    def __init__(self, pk, pk_type, range_width):
+        self.pk = pk
+        self.numeric = pa.types.is_integer(pk_type)
+        self.range_width = range_width
+
+    def sql(self):
+        if self.numeric:
+            return f"{self.pk} DIV {self.range_width}"
+        return f"CRC32({self.pk}) % {HASH_BUCKETS}"
+
+    def where(self, stale, max_pk=None):
+        """
+        (condition, params) selecting every row of the stale ranges.
+        Integer keys get pk >= lo AND pk < hi spans, adjacent ranges merged, which the primary
+        key index can seek; stale ranges past max_pk (the previous high-water mark) only hold
+        appended rows and become one pk > max_pk.
+        """
+        stale = sorted(int(r) for r in stale)
+        if not self.numeric:
+            return f"{self.sql()} IN ({', '.join(['%s'] * len(stale))})", stale
+        appended = max_pk is not None and stale and stale[-1] > max_pk // self.range_width
+        if appended:
+            stale = [r for r in stale if r <= max_pk // self.range_width]
+        spans = []
+        for r in stale:
+            if spans and spans[-1][1] == r:
+                spans[-1][1] = r + 1
+            else:
+                spans.append([r, r + 1])
+        conditions = [f"({self.pk} >= %s AND {self.pk} < %s)"] * len(spans)
+        params = [bound * self.range_width for span in spans for bound in span]
+        if appended:
+            conditions.append(f"{self.pk} > %s")
+            params.append(int(max_pk))
+        return ' OR '.join(conditions), params
+
+    def of(self, keys):
+        keys = np.asarray(keys)
+        if self.numeric:
+            return keys.astype(np.int64) // self.range_width
+        return np.array([zlib.crc32(str(key).encode('utf-8')) % HASH_BUCKETS for key in keys], dtype=np.int64)
+
+
+def _range_checksums(cursor, table, ranges, columns):
+    # One (count, xor of row CRCs) per range; XOR makes it independent of row order
+    row_text = ', '.join(f"COALESCE({column}, '\\\\N')" for column in columns)
+    cursor.execute(f'''SELECT {ranges.sql()} AS pk_range, COUNT(*), BIT_XOR(CRC32(CONCAT_WS('|', {row_text})))
+                       FROM {table} GROUP BY pk_range''')
+    return {str(int(pk_range)): [int(count), int(crc)] for pk_range, count, crc in cursor.fetchall()}
+
+
+def _stream(cursor, sql, params, schema, chunk_size):
+    """Yield Arrow tables of at most chunk_size rows from a MySQL query."""
+    cursor.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        columns = list(zip(*rows))
+        yield pa.Table.from_arrays([pa.array(values, type=field.type)
+                                    for values, field in zip(columns, schema)], schema=schema)
+
+
+def _partition_dir(base, partition_col, value):
+    if partition_col is None:
+        return base
+    return os.path.join(base, f"{partition_col}={NULL_PARTITION if value is None else value}")
+
+
+def _split(chunk, partition_col):
+    """(partition value, rows without the partition column) pairs of one chunk."""
+    if partition_col is None:
+        yield None, chunk
+        return
+    body = chunk.drop_columns([partition_col])
+    positions = {}
+    for position, value in enumerate(chunk.column(partition_col).to_pylist()):
+        positions.setdefault(value, []).append(position)
+    for value, rows in positions.items():
+        yield value, body.take(rows)
+
+
+def _partition_files(base):
+    for root, _, files in os.walk(base):
+        if 'data.parquet' in files:
+            yield os.path.join(root, 'data.parquet')
+
+
+def _write_atomic(path, table):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+
+
+def _full_export(cursor, table, pk, partition_col, schema, base, chunk_size):
+    # PK-ordered stream, one ParquetWriter per partition: memory stays at one chunk
+    writers = {}
+    rows = 0
+    try:
+        for chunk in _stream(cursor, f"SELECT {', '.join(schema.names)} FROM {table} ORDER BY {pk}", (), schema, chunk_size):
+            rows += chunk.num_rows
+            for value, part in _split(chunk, partition_col):
+                if value not in writers:
+                    path = os.path.join(_partition_dir(base, partition_col, value), 'data.parquet.tmp')
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    writers[value] = pq.ParquetWriter(path, part.schema)
+                writers[value].write_table(part)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    for value in writers:
+        path = os.path.join(_partition_dir(base, partition_col, value), 'data.parquet')
+        os.replace(path + '.tmp', path)
+    return rows, len(writers)
+
+
+def _incremental_export(cursor, table, pk, partition_col, schema, base, ranges,
+                        stale_ranges, max_pk, extra_sql, extra_params, chunk_size):
+    """
+    Replace every row in stale_ranges plus the rows matched by extra_sql (the updated_at
+    filter), rewriting only the partitions that lose or gain a row.
+    """
+    conditions, params = [], []
+    if stale_ranges:
+        stale_sql, stale_params = ranges.where(stale_ranges, max_pk)
+        conditions.append(f"({stale_sql})")
+        params.extend(stale_params)
+    if extra_sql:
+        conditions.append(extra_sql)
+        params.extend(extra_params)
+    if not conditions:
+        return 0, 0
+
+    incoming = {}
+    fetched_keys = []
+    for chunk in _stream(cursor, f"SELECT {', '.join(schema.names)} FROM {table} "
+                         f"WHERE {' OR '.join(conditions)} ORDER BY {pk}",
+                         tuple(params), schema, chunk_size):
+        fetched_keys.append(chunk.column(pk).to_numpy(zero_copy_only=False))
+        for value, part in _split(chunk, partition_col):
+            incoming.setdefault(value, []).append(part)
+    fetched_keys = np.concatenate(fetched_keys) if fetched_keys else np.array([])
+    stale = np.array(sorted(int(r) for r in stale_ranges), dtype=np.int64)
+
+    def replaced(keys):
+        # Rows dropped from the snapshot: in a re-fetched range, or re-fetched themselves
+        return np.isin(ranges.of(keys), stale) | np.isin(keys, fetched_keys)
+
+    rewritten = 0
+    seen = set()
+    for path in list(_partition_files(base)):
+        directory = os.path.dirname(path)
+        value = None
+        if partition_col is not None:
+            raw = os.path.basename(directory).split('=', 1)[1]
+            if raw != NULL_PARTITION:
+                value = int(raw) if pa.types.is_integer(schema.field(partition_col).type) else raw
+        seen.add(value)
+        keys = pq.read_table(path, columns=[pk]).column(pk).to_numpy(zero_copy_only=False)
+        drop = replaced(keys) if len(keys) else np.zeros(0, dtype=bool)
+        if not drop.any() and value not in incoming:
+            continue
+        kept = pq.read_table(path).filter(pa.array(~drop))
+        _rewrite_partition(path, kept, incoming.get(value, []), pk)
+        rewritten += 1
+    for value, parts in incoming.items():
+        if value not in seen:
+            path = os.path.join(_partition_dir(base, partition_col, value), 'data.parquet')
+            _rewrite_partition(path, None, parts, pk)
+            rewritten += 1
+    return len(fetched_keys), rewritten
+
+
+def _rewrite_partition(path, kept, parts, pk):
+    pieces = ([kept] if kept is not None else []) + parts
+    merged = pa.concat_tables(pieces, promote_options='default') if pieces else None
+    if merged is None or merged.num_rows == 0:
+        if os.path.exists(path):
+            os.remove(path)
+            if not os.listdir(os.path.dirname(path)):
+                os.rmdir(os.path.dirname(path))
+        return
+    _write_atomic(path, merged.sort_by(pk))
+
+
+def export_table(cursor, table, state, export_dir=EXPORT_DIR, range_width=1000, chunk_size=10_000):
+    """
+    Export one table (full on the first run, incremental afterwards) and return its new state
+    plus a report dict (rows transferred, partitions written).
+    """
+    pk, partition_col = TABLES[table]
+    schema = arrow_schema(cursor, table)
+    columns = schema.names
+    strategy = 'updated_at' if 'updated_at' in columns else 'checksum'
+    ranges = _Ranges(pk, schema.field(pk).type, range_width)
+    base = os.path.join(export_dir, table)
+    # Deletes are always found by range checksums; with updated_at only the key needs hashing
+    checksums = _range_checksums(cursor, table, ranges, columns if strategy == 'checksum' else [pk])
+    # Marks are read before the rows: anything changed meanwhile is fetched again next run
+    cursor.execute(f"SELECT MAX({pk}){', MAX(updated_at)' if strategy == 'updated_at' else ''} FROM {table}")
+    marks = cursor.fetchone()
+
+    previous = state.get(table)
+    full = (previous is None or previous.get('strategy') != strategy
+            or previous.get('range_width') != range_width or not os.path.isdir(base))
+    if full:
+        shutil.rmtree(base, ignore_errors=True)
+        os.makedirs(base)
+        rows, partitions = _full_export(cursor, table, pk, partition_col, schema, base, chunk_size)
+    else:
+        old = previous['ranges']
+        stale = {r for r in set(old) | set(checksums) if old.get(r) != checksums.get(r)}
+        extra_sql, extra_params = None, ()
+        if strategy == 'updated_at' and previous.get('updated_at'):
+            # >= because rows committed within the same second as the mark may not have been seen
+            extra_sql, extra_params = "updated_at >= %s", (previous['updated_at'],)
+        rows, partitions = _incremental_export(cursor, table, pk, partition_col, schema, base, ranges,
+                                               stale, previous.get('max_pk'), extra_sql, extra_params,
+                                               chunk_size)
+
+    new_state = {
+        'strategy': strategy,
+        'range_width': range_width,
+        'ranges': checksums,
+        'max_pk': marks[0],
+        'updated_at': str(marks[1]) if strategy == 'updated_at' and marks[1] is not None else None,
+        'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    return new_state, {'table': table, 'mode': 'full' if full else 'incremental',
+                       'rows_transferred': rows, 'partitions_written': partitions}
+
+
+def load_state(export_dir=EXPORT_DIR):
+    path = os.path.join(export_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_state(state, export_dir=EXPORT_DIR):
+    os.makedirs(export_dir, exist_ok=True)
+    path = os.path.join(export_dir, STATE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump(state, file, indent=2, default=str)
+    os.replace(path + '.tmp', path)
+
+
+def export_all(connection=None, tables=None, export_dir=EXPORT_DIR, range_width=1000, chunk_size=10_000):
+    """Export (or refresh) the Parquet snapshot of the HR tables; returns a report DataFrame."""
+    own_connection = connection is None
+    if own_connection:
+        from scripts.db_config import HOST, USER, PASSWORD, DATABASE
+        import mysql.connector
+        connection = mysql.connector.connect(host=HOST, user=USER, password=PASSWORD, database=DATABASE)
+    state = load_state(export_dir)
+    report = []
+    try:
+        cursor = connection.cursor()
+        for table in tables or TABLES:
+            start = time.perf_counter()
+            state[table], row = export_table(cursor, table, state, export_dir, range_width, chunk_size)
+            row['seconds'] = round(time.perf_counter() - start, 3)
+            report.append(row)
+            # Saved per table: a failure later on does not force these tables to be redone
+            save_state(state, export_dir)
+        cursor.close()
+    finally:
+        if own_connection:
+            connection.close()
+    return pd.DataFrame(report)
+
+
+def read_snapshot(table, export_dir=EXPORT_DIR):
+    """Read a table back from the snapshot (the partition column is restored from the directory names)."""
+    pk, _ = TABLES[table]
+    # No dictionary-encoded partition column: it could not hold the NULL (default) partition
+    partitioning = ds.HivePartitioning.discover(infer_dictionary=False, null_fallback=NULL_PARTITION)
+    dataset = ds.dataset(os.path.join(export_dir, table), format='parquet', partitioning=partitioning)
+    return dataset.to_table().to_pandas().sort_values(pk, ignore_index=True)
+
+
+if __name__ == "__main__":
+    print(f"Exporting hr_db to {EXPORT_DIR} ...")
+    print(export_all().to_string(index=False))
@@ -0,0 +1,147 @@
+"""
+Partitioned employees layouts for hr_db
+- 'range': PARTITION BY RANGE (YEAR(hire_date)), one partition per hire year
+- 'hash':  PARTITION BY HASH (department_id)
+
+What: DDL for a partitioned employees table; setup_database.py --partition range|hash uses it.
+Why: Reports bounded by hire_date and per-department queries read the whole table when it has
+     one partition. With partitions, MySQL only opens the ones the WHERE clause can match
+     (partition pruning).
+How: MySQL puts two restrictions on partitioned InnoDB tables, and this module works around both:
+     - Every unique key must contain the partitioning column. So the primary key becomes
+       (employee_id, hire_date) or (employee_id, department_id), and in the hash layout
+       department_id is NOT NULL. That key alone would accept the same employee_id twice
+       with another hire_date/department_id, so the insert and update triggers refuse an
+       employee_id that is already taken.
+     - Foreign keys are not supported in either direction. employees cannot reference jobs,
+       departments or itself, and dependents cannot reference employees. Triggers do the
+       foreign keys' work instead: they check the referenced rows exist, restrict deleting a
+       manager who still has reports, and cascade deletes/updates from departments and jobs to
+       employees and from employees to dependents.
+
+Note: triggers do not fire for rows changed by a foreign key cascade. A location deleted with
+      ON DELETE CASCADE removes its departments, but not their employees.
+      The employee_id check is a read, not a unique index: two sessions inserting the same
+      explicit employee_id at the same time can both pass it. AUTO_INCREMENT ids never collide.
+
+Each block includes what, why, and how comments.
+"""
+
+SCHEMES = ('range', 'hash')
+HIRE_YEARS = range(1987, 2001)  # one RANGE partition per year of hr_data.sql, then pmax
+HASH_PARTITIONS = 4
+
+_COLUMNS = """
+    employee_id INT (11) AUTO_INCREMENT,
+    first_name VARCHAR (20) DEFAULT NULL,
+    last_name VARCHAR (25) NOT NULL,
+    email VARCHAR (100) NOT NULL,
+    phone_number VARCHAR (20) DEFAULT NULL,
+    hire_date DATE NOT NULL,
+    job_id INT (11) NOT NULL,
+    salary DECIMAL (8, 2) NOT NULL,
+    manager_id INT (11) DEFAULT NULL,
+    department_id INT (11) {department_null},
+    PRIMARY KEY (employee_id, {key_column}),
+    KEY idx_job_id (job_id),
+    KEY idx_manager_id (manager_id),
+    KEY idx_department_id (department_id),
+    KEY idx_hire_date (hire_date)"""
+
+
+def employees_ddl(scheme, table='employees', years=HIRE_YEARS, partitions=HASH_PARTITIONS):
+    """CREATE TABLE statement for employees partitioned by scheme ('range' or 'hash')."""
+    if scheme == 'range':
+        columns = _COLUMNS.format(department_null='DEFAULT NULL', key_column='hire_date')
+        ranges = [f"PARTITION p{year} VALUES LESS THAN ({year + 1})" for year in years]
+        ranges.insert(0, f"PARTITION p_before VALUES LESS THAN ({years[0]})")
+        ranges.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+        partitioning = "PARTITION BY RANGE (YEAR(hire_date)) (\n    " + ",\n    ".join(ranges) + "\n)"
+    elif scheme == 'hash':
+        columns = _COLUMNS.format(department_null='NOT NULL', key_column='department_id')
+        partitioning = f"PARTITION BY HASH (department_id) PARTITIONS {partitions}"
+    else:
+        raise ValueError(f"Unknown partitioning scheme {scheme!r}; use one of {SCHEMES}")
+    return f"CREATE TABLE {table} ({columns}\n)\n{partitioning}"
+
+
+DEPENDENTS_DDL = """CREATE TABLE dependents (
+    dependent_id INT (11) AUTO_INCREMENT PRIMARY KEY,
+    first_name VARCHAR (50) NOT NULL,
+    last_name VARCHAR (50) NOT NULL,
+    relationship VARCHAR (25) NOT NULL,
+    employee_id INT (11) NOT NULL,
+    KEY idx_employee_id (employee_id)
+)"""
+
+
+def _require(condition, message):
+    return f"IF {condition} THEN SIGNAL SQLSTATE '23000' SET MESSAGE_TEXT = '{message}'; END IF;"
+
+
+def integrity_triggers():
+    """CREATE TRIGGER statements that stand in for the foreign keys of hr_schema.sql."""
+    employee_checks = ' '.join([
+        _require("NOT EXISTS (SELECT 1 FROM jobs WHERE job_id = NEW.job_id)",
+                 'employees.job_id: no such job'),
+        _require("NEW.department_id IS NOT NULL AND "
+                 "NOT EXISTS (SELECT 1 FROM departments WHERE department_id = NEW.department_id)",
+                 'employees.department_id: no such department'),
+        _require("NEW.manager_id IS NOT NULL AND NEW.manager_id <> NEW.employee_id AND "
+                 "NOT EXISTS (SELECT 1 FROM employees WHERE employee_id = NEW.manager_id)",
+                 'employees.manager_id: no such employee'),
+    ])
+    # (employee_id, hire_date|department_id) is the primary key: employee_id uniqueness is checked here.
+    # An AUTO_INCREMENT id is still 0 in a BEFORE INSERT trigger, and no row has employee_id 0.
+    unique_on_insert = _require("EXISTS (SELECT 1 FROM employees WHERE employee_id = NEW.employee_id)",
+                                'employees.employee_id: duplicate employee_id')
+    unique_on_update = _require("NEW.employee_id <> OLD.employee_id AND "
+                                "EXISTS (SELECT 1 FROM employees WHERE employee_id = NEW.employee_id)",
+                                'employees.employee_id: duplicate employee_id')
+    dependent_check = _require("NOT EXISTS (SELECT 1 FROM employees WHERE employee_id = NEW.employee_id)",
+                               'dependents.employee_id: no such employee')
+    return [
+        # employees -> jobs, departments, employees (manager); employee_id stays unique
+        "CREATE TRIGGER employees_fk_insert BEFORE INSERT ON employees FOR EACH ROW "
+        f"BEGIN {unique_on_insert} {employee_checks} END",
+        "CREATE TRIGGER employees_fk_update BEFORE UPDATE ON employees FOR EACH ROW "
+        f"BEGIN {unique_on_update} {employee_checks} END",
+        # manager_id has no ON DELETE action: deleting a manager with reports is refused;
+        # dependents are ON DELETE / ON UPDATE CASCADE
+        "CREATE TRIGGER employees_fk_delete BEFORE DELETE ON employees FOR EACH ROW BEGIN "
+        + _require("EXISTS (SELECT 1 FROM employees WHERE manager_id = OLD.employee_id)",
+                   'employees.manager_id: employee still manages others')
+        + " DELETE FROM dependents WHERE employee_id = OLD.employee_id; END",
+        "CREATE TRIGGER employees_fk_cascade AFTER UPDATE ON employees FOR EACH ROW BEGIN "
+        "IF NEW.employee_id <> OLD.employee_id THEN "
+        "UPDATE dependents SET employee_id = NEW.employee_id WHERE employee_id = OLD.employee_id; END IF; END",
+        # dependents -> employees
+        f"CREATE TRIGGER dependents_fk_insert BEFORE INSERT ON dependents FOR EACH ROW BEGIN {dependent_check} END",
+        f"CREATE TRIGGER dependents_fk_update BEFORE UPDATE ON dependents FOR EACH ROW BEGIN {dependent_check} END",
+        # departments / jobs -> employees: ON DELETE CASCADE ON UPDATE CASCADE
+        "CREATE TRIGGER departments_fk_delete AFTER DELETE ON departments FOR EACH ROW "
+        "DELETE FROM employees WHERE department_id = OLD.department_id",
+        "CREATE TRIGGER departments_fk_update AFTER UPDATE ON departments FOR EACH ROW "
+        "UPDATE employees SET department_id = NEW.department_id WHERE department_id = OLD.department_id",
+        "CREATE TRIGGER jobs_fk_delete AFTER DELETE ON jobs FOR EACH ROW "
+        "DELETE FROM employees WHERE job_id = OLD.job_id",
+        "CREATE TRIGGER jobs_fk_update AFTER UPDATE ON jobs FOR EACH ROW "
+        "UPDATE employees SET job_id = NEW.job_id WHERE job_id = OLD.job_id",
+    ]
+
+
+TRIGGERS = ['employees_fk_insert', 'employees_fk_update', 'employees_fk_delete', 'employees_fk_cascade',
+            'dependents_fk_insert', 'dependents_fk_update', 'departments_fk_delete', 'departments_fk_update',
+            'jobs_fk_delete', 'jobs_fk_update']
+
+
+def apply(cursor, scheme):
+    """Replace the (empty) employees and dependents tables of hr_schema.sql with the partitioned layout."""
+    for table in ('dependents', 'employees'):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    for trigger in TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute(employees_ddl(scheme))
+    cursor.execute(DEPENDENTS_DDL)
+    for statement in integrity_triggers():
+        cursor.execute(statement)
@@ -1,7 +1,17 @@
+import argparse
 import mysql.connector
-import pandas as pd
-import matplotlib.pyplot as plt
 from db_config import HOST, USER, PASSWORD, DATABASE
+from salary_histogram import server_histogram, plot_histogram, render_histograms
+
+# Usage:
+#   python scripts/plot_salary_distribution.py                      # one histogram, on screen
+#   python scripts/plot_salary_distribution.py --by department_id --out plots/
+#       one PNG per department, rendered in parallel without a display
+parser = argparse.ArgumentParser(description='Plot the salary distribution (bins computed by MySQL).')
+parser.add_argument('--bins', type=int, default=20)
+parser.add_argument('--by', choices=['department_id', 'job_id'], help='one histogram per group')
+parser.add_argument('--out', help='headless mode: write PNG files to this directory')
+args = parser.parse_args()
 
 conn = mysql.connector.connect(
     host=HOST,
@@ -10,13 +20,19 @@ conn = mysql.connector.connect(
     database=DATABASE
 )
 
-# Load salary data
-df = pd.read_sql('SELECT salary FROM employees', conn)
-
-plt.hist(df['salary'], bins=20, color='skyblue', edgecolor='black')
-plt.title('Salary Distribution')
-plt.xlabel('Salary')
-plt.ylabel('Frequency')
-plt.show()
-
+# Bin edges and counts come from the database: O(bins) rows instead of every salary
+cursor = conn.cursor()
+result = server_histogram(cursor, 'employees', 'salary', bins=args.bins, group_by=args.by)
+cursor.close()
 conn.close()
+
+histograms = result if args.by else {None: result}
+if args.out:
+    for path in render_histograms(histograms, args.out, group_by=args.by):
+        print(path)
+else:
+    import matplotlib.pyplot as plt  # only needed for a window (--out renders with the Figure API)
+    for group, histogram in histograms.items():
+        fig, ax = plt.subplots()
+        plot_histogram(ax, histogram, 'Salary Distribution' if group is None else f'Salary Distribution ({args.by} = {group})')
+    plt.show()
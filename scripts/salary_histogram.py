@@ -0,0 +1,183 @@
+"""
+Histograms computed where the data lives
+- server_histogram(): bin edges and counts computed by MySQL, optionally per department/job
+- stream_histogram(): the same fixed-bin histogram built chunk by chunk on the client
+- render_histograms(): headless rendering of many histograms to image files, in parallel
+
+What: A histogram API for plot_salary_distribution.py (and any numeric column).
+Why: Pulling every salary into pandas to call plt.hist costs O(rows) transfer and memory;
+     a histogram only needs O(bins) numbers per group.
+How: - MIN/MAX come first (one index lookup each when the column is indexed, see
+       add_index_sql()), which fixes the edges: lo + i * (hi - lo) / bins
+     - MySQL assigns bins with FLOOR((value - lo) * bins / (hi - lo)) and GROUP BY returns
+       (group, bin, count) rows only
+     - Histogram objects with the same edges merge by adding counts, so chunks, partitions
+       or servers can be combined in any order
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+
+def add_index_sql(table='employees', column='salary'):
+    """Index that lets MySQL answer MIN()/MAX() without scanning the table."""
+    return f"CREATE INDEX idx_{table}_{column} ON {table} ({column})"
+
+
+class Histogram:
+    """Fixed-bin histogram; instances with equal edges are mergeable."""
+
+    def __init__(self, edges, counts=None):
+        self.edges = np.asarray(edges, dtype=float)
+        bins = len(self.edges) - 1
+        self.counts = np.zeros(bins, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def uniform(cls, lo, hi, bins):
+        lo, hi = float(lo), float(hi)
+        if hi <= lo:
+            hi = lo + 1.0  # every value equal: one populated bin
+        return cls(np.linspace(lo, hi, bins + 1))
+
+    @property
+    def bins(self):
+        return len(self.counts)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def bin_of(self, values):
+        """Bin index of each value; the maximum goes into the last bin, as in SQL."""
+        lo, hi = self.edges[0], self.edges[-1]
+        index = np.floor((values - lo) * self.bins / (hi - lo)).astype(np.int64)
+        return np.clip(index, 0, self.bins - 1)
+
+    def add(self, values):
+        """Count a chunk of values (NULL/NaN ignored)."""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.counts += np.bincount(self.bin_of(values), minlength=self.bins)
+        return self
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Histograms with different edges cannot be merged")
+        return Histogram(self.edges, self.counts + other.counts)
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def __repr__(self):
+        return f"Histogram(bins={self.bins}, range=[{self.edges[0]:g}, {self.edges[-1]:g}], total={self.total})"
+
+
+def _group_expr(group_by):
+    return group_by if group_by else "NULL"
+
+
+def value_bounds(cursor, table='employees', column='salary', group_by=None):
+    """{group: (min, max)} of a column; a single None group when group_by is None."""
+    cursor.execute(f'''SELECT {_group_expr(group_by)} AS grp, MIN({column}), MAX({column})
+                       FROM {table} WHERE {column} IS NOT NULL
+                       GROUP BY grp''')
+    return {grp: (lo, hi) for grp, lo, hi in cursor.fetchall()}
+
+
+def _empty_histograms(bounds, bins, shared_edges):
+    if not bounds:
+        return {}
+    if shared_edges:
+        lo = min(lo for lo, _ in bounds.values())
+        hi = max(hi for _, hi in bounds.values())
+        return {grp: Histogram.uniform(lo, hi, bins) for grp in bounds}
+    return {grp: Histogram.uniform(lo, hi, bins) for grp, (lo, hi) in bounds.items()}
+
+
+def server_histogram(cursor, table='employees', column='salary', bins=20, group_by=None, shared_edges=True):
+    """
+    Histogram(s) computed by MySQL: only (group, bin, count) rows are transferred.
+    group_by: None, or a column such as 'department_id' / 'job_id' -> {group: Histogram}
+    shared_edges: same edges for every group (comparable plots) or per-group min/max.
+    Returns a Histogram when group_by is None.
+    """
+    histograms = _empty_histograms(value_bounds(cursor, table, column, group_by), bins, shared_edges)
+    if histograms:
+        # Edges go in as a derived table so shared and per-group edges use the same query
+        edge_rows = ' UNION ALL '.join(['SELECT %s AS grp, %s AS lo, %s AS hi'] * len(histograms))
+        params = []
+        for grp, histogram in histograms.items():
+            params.extend([grp, float(histogram.edges[0]), float(histogram.edges[-1])])
+        cursor.execute(f'''SELECT b.grp, LEAST(GREATEST(FLOOR((t.{column} - b.lo) * %s / (b.hi - b.lo)), 0), %s - 1) AS bin,
+                                  COUNT(*) AS n
+                           FROM {table} t
+                           JOIN ({edge_rows}) b ON {_group_expr(group_by and 't.' + group_by)} <=> b.grp
+                           WHERE t.{column} IS NOT NULL
+                           GROUP BY b.grp, bin''', [bins, bins] + params)
+        for grp, bin_index, count in cursor.fetchall():
+            histograms[grp].counts[int(bin_index)] += int(count)
+    if group_by is None:
+        return histograms.get(None, Histogram.uniform(0, 1, bins))
+    return histograms
+
+
+def stream_histogram(cursor, table='employees', column='salary', bins=20, group_by=None,
+                     shared_edges=True, chunk_size=10_000):
+    """
+    Same result as server_histogram(), built on the client from fetchmany() chunks:
+    memory is O(chunk_size + bins), for servers/queries where GROUP BY on bins is not an option.
+    """
+    histograms = _empty_histograms(value_bounds(cursor, table, column, group_by), bins, shared_edges)
+    cursor.execute(f"SELECT {_group_expr(group_by)}, {column} FROM {table} WHERE {column} IS NOT NULL")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        groups, values = zip(*rows)
+        values = np.asarray(values, dtype=float)
+        if group_by is None:
+            histograms[None].add(values)
+            continue
+        groups = np.asarray(groups, dtype=object)
+        for grp in set(groups):
+            histograms[grp].add(values[groups == grp])
+    if group_by is None:
+        return histograms.get(None, Histogram.uniform(0, 1, bins))
+    return histograms
+
+
+def plot_histogram(ax, histogram, title='Salary Distribution', xlabel='Salary'):
+    """Draw a precomputed histogram (what plt.hist would draw, without the raw values)."""
+    ax.bar(histogram.edges[:-1], histogram.counts, width=np.diff(histogram.edges), align='edge',
+           color='skyblue', edgecolor='black')
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Frequency')
+
+
+def _render(job):
+    # Figure + Agg canvas directly: no pyplot state, no display needed, safe in worker processes
+    from matplotlib.figure import Figure
+    path, histogram, title, xlabel = job
+    fig = Figure(figsize=(6, 4))
+    plot_histogram(fig.add_subplot(), histogram, title, xlabel)
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+
+def render_histograms(histograms, out_dir, group_by=None, xlabel='Salary', workers=None):
+    """
+    Render {group: Histogram} to out_dir/<xlabel>_<group_by>_<group>.png in parallel (headless).
+    Returns the written paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = []
+    for grp, histogram in histograms.items():
+        name = f"{xlabel.lower()}_{group_by}_{grp}" if group_by else xlabel.lower()
+        title = f"{xlabel} Distribution ({group_by} = {grp})" if group_by else f"{xlabel} Distribution"
+        jobs.append((os.path.join(out_dir, f"{name}.png"), histogram, title, xlabel))
+    if workers == 1 or len(jobs) <= 1:
+        return [_render(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render, jobs))
@@ -1,4 +1,6 @@
 import os
+import sys
+import argparse
 import mysql.connector
 from mysql.connector import Error
 from dotenv import load_dotenv
@@ -6,6 +8,8 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 load_dotenv(dotenv_path)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts import partitioning
 
 HOST = os.environ.get('MYSQL_HOST', 'localhost')
 USER = os.environ.get('MYSQL_USER')
@@ -28,7 +32,7 @@ def execute_sql_file(cursor, file_path):
                     print(f"\n[SQL ERROR]\nCommand: {command}\nError: {e}\n")
 
 
-def main():
+def main(partition=None):
     connection = None
     cursor = None
     try:
@@ -62,6 +66,12 @@ def main():
         print("Executing schema file...")
         execute_sql_file(cursor, SCHEMA_FILE)
         print("Schema created.")
+        if partition:
+            # What: Swap in a partitioned employees table (see scripts/partitioning.py).
+            # Why: Date-bounded and per-department queries then read only matching partitions.
+            # How: Recreate employees/dependents before loading data; triggers replace the FKs.
+            partitioning.apply(cursor, partition)
+            print(f"employees partitioned by {partition} (foreign keys enforced by triggers).")
 
         print("Executing data file...")
         execute_sql_file(cursor, DATA_FILE)
@@ -77,4 +87,7 @@ def main():
             connection.close()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Create hr_db and load hr_schema.sql / hr_data.sql.')
+    parser.add_argument('--partition', choices=partitioning.SCHEMES,
+                        help='partition employees by hire year (range) or department_id (hash)')
+    main(parser.parse_args().partition)